@@ -1,18 +1,38 @@
-from src.datazen.layouts import *
-from src.datazen.data_manager import cache
-from src.datazen.callbacks import *
+from datazen.layouts import *
+from datazen.storage import store
+from datazen.uploads import uploads
+from datazen.jobs import jobs
+from datazen.watch import watch_folder
+from datazen.callbacks import *
 from dash import Dash, html
 
 app = Dash(external_stylesheets=external_stylesheets, suppress_callback_exceptions=True)
 
-cache.init_app(
+store.init_app(
     app.server,
     config={
-        "CACHE_TYPE": "filesystem",
-        "CACHE_DIR": "flask_cache",
-        "CACHE_DEFAULT_TIMEOUT": 0,
+        "BACKEND": "filesystem",
+        "REDIS_URL": "redis://localhost:6379/0",
+        "STORE_DIR": "flask_cache",
+        "FORMAT": "arrow",
+        "COMPRESSION": "none",
+        "COMPRESSION_LEVEL": None,
+        "MEMORY_CACHE_BYTES": 512 * 1024**2,
+        "MAX_BYTES": 20 * 1024**3,
+        "SESSION_QUOTA_BYTES": 2 * 1024**3,
+        "SESSION_TTL": 24 * 3600,
+        "SWEEP_INTERVAL": 600,
+        "UPLOAD_HASH": "auto",
+        "UPLOAD_MAX_BYTES": 20 * 1024**3,
+        "IMPORT_WORKERS": 2,
+        "WATCH_DIR": None,
+        "WATCH_INTERVAL": 60,
+        "WATCH_WORKERS": 2,
     },
 )
+uploads.init_app(app.server, store)
+jobs.init_app(app.server, store)
+watch_folder.init_app(app.server, store)
 
 app.layout = html.Div(
     [
@@ -0,0 +1,113 @@
+// Envoi direct des gros fichiers vers la route /datazen/upload (voir uploads.py).
+// Le fichier est découpé en morceaux envoyés bruts, sans base64 : en cas de
+// coupure, l'envoi reprend à la dernière position reçue par le serveur.
+(function () {
+    var CHUNK_BYTES = 8 * 1024 * 1024;
+    var RETRIES = 5;
+
+    function uploadKey(file) {
+        return "datazen-upload:" + file.name + "|" + file.size + "|" + file.lastModified;
+    }
+
+    async function start(file) {
+        // Même fichier (nom, taille, date) => même envoi, dont l'identifiant
+        // tiré par le serveur est gardé dans le navigateur : l'envoi reprend là
+        // où il s'était arrêté, même après un rechargement de la page.
+        var key = uploadKey(file);
+        var id = window.localStorage.getItem(key);
+        if (id) {
+            var response = await fetch("/datazen/upload/" + id);
+            if (response.ok) {
+                return {id: id, state: await response.json()};
+            }
+            window.localStorage.removeItem(key);
+        }
+        var created = await fetch("/datazen/upload", {
+            method: "POST",
+            headers: {"Content-Type": "application/json"},
+            body: JSON.stringify({filename: file.name, total: file.size}),
+        });
+        var state = await created.json();
+        if (!created.ok) {
+            throw new Error(state.error);
+        }
+        window.localStorage.setItem(key, state.id);
+        return {id: state.id, state: state};
+    }
+
+    function showProgress(text) {
+        window.dash_clientside.set_props("import-progress", {children: text});
+    }
+
+    function sleep(ms) {
+        return new Promise(function (resolve) { setTimeout(resolve, ms); });
+    }
+
+    async function send(file) {
+        var upload = await start(file);
+        var id = upload.id;
+        var url = "/datazen/upload/" + id;
+        var state = upload.state;
+        var offset = state.offset;
+        var failures = 0;
+        while (!state.complete) {
+            var end = Math.min(offset + CHUNK_BYTES, file.size);
+            var query = "?offset=" + offset;
+            try {
+                var response = await fetch(url + query, {
+                    method: "PUT",
+                    body: file.slice(offset, end),
+                });
+                state = await response.json();
+                if (response.status === 409) {
+                    offset = state.offset;
+                    state.complete = false;
+                    continue;
+                }
+                if (!response.ok) {
+                    throw new Error(state.error);
+                }
+                offset = state.offset;
+                failures = 0;
+            } catch (error) {
+                if (++failures > RETRIES) {
+                    throw error;
+                }
+                await sleep(1000 * failures);
+                state = await (await fetch(url)).json();
+                offset = state.offset;
+                continue;
+            }
+            var percent = file.size ? Math.round(100 * offset / file.size) : 100;
+            showProgress("Envoi : " + percent + " %");
+        }
+        showProgress("");
+        window.dash_clientside.set_props("server-upload", {
+            data: {id: id, filename: file.name},
+        });
+        // Même déroulé qu'un fichier choisi avec dcc.Upload, sans son contenu.
+        window.dash_clientside.set_props("import-data", {
+            contents: null,
+            filename: file.name,
+        });
+    }
+
+    var input = document.createElement("input");
+    input.type = "file";
+    input.accept = ".csv,.gz,.zst,.bz2,.zip,.xlsx,.xls,.parquet,.feather,.arrow,.ipc,.jsonl,.ndjson";
+    input.addEventListener("change", function () {
+        var file = input.files[0];
+        input.value = "";
+        if (file) {
+            send(file).catch(function (error) {
+                showProgress("Échec de l'envoi : " + error.message);
+            });
+        }
+    });
+
+    document.addEventListener("click", function (event) {
+        if (event.target.closest("#direct-upload-button")) {
+            input.click();
+        }
+    });
+})();
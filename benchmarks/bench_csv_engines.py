@@ -0,0 +1,97 @@
+"""
+Compare les moteurs de lecture CSV de l'import (pandas C et PyArrow multithread).
+
+Pour chaque fichier (data/*.csv et un CSV synthétique de --rows lignes), mesure le
+temps de l'import complet par morceaux dans le stockage (import_csv_stream), avec
+chaque moteur, ainsi que l'accélération de PyArrow par rapport au moteur C.
+
+Utilisation :
+    PYTHONPATH=src python benchmarks/bench_csv_engines.py --rows 5000000
+"""
+
+import argparse
+import base64
+import glob
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+import datazen.data_manager as data_manager
+from datazen.storage import DatasetStore
+
+
+def synthetic_csv(rows: int) -> bytes:
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "id": np.arange(rows),
+            "categorie": rng.choice(["nord", "sud", "est", "ouest"], rows),
+            "texte": [f"client_{i % 50000}" for i in range(rows)],
+            "montant": np.round(rng.exponential(100, rows), 2),
+            "mesure": rng.normal(size=rows),
+        }
+    )
+    return df.to_csv(index=False).encode("utf-8")
+
+
+def bundled_csvs(data_dir: str) -> dict:
+    files = {}
+    for path in sorted(glob.glob(os.path.join(data_dir, "*.csv"))):
+        with open(path, "rb") as f:
+            files[os.path.basename(path)] = f.read()
+    return files
+
+
+def sniff_sep(data: bytes) -> str:
+    first_line = data.split(b"\n", 1)[0]
+    return ";" if first_line.count(b";") > first_line.count(b",") else ","
+
+
+def bench(files: dict, repeat: int) -> pd.DataFrame:
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        data_manager.store = DatasetStore(
+            config={"STORE_DIR": tmp, "MAX_BYTES": None, "SESSION_QUOTA_BYTES": None}
+        )
+        for name, data in files.items():
+            contents = "data:text/csv;base64," + base64.b64encode(data).decode()
+            sep = sniff_sep(data)
+            times = {}
+            for engine in ("c", "pyarrow"):
+                durations = []
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    result = data_manager.import_csv_stream(
+                        contents, "bench.csv", "bench", sep, ".", 0, engine=engine
+                    )
+                    durations.append(time.perf_counter() - start)
+                    data_manager.store.delete("bench")
+                    data_manager.store.collect_chunks(grace=0)
+                times[engine] = min(durations)
+                rows.append(
+                    {
+                        "fichier": name,
+                        "taille_mo": len(data) / 1024**2,
+                        "moteur": result.get("engine", result.get("error")),
+                        "lignes": result.get("nrows"),
+                        "import_ms": times[engine] * 1000,
+                        "acceleration": times["c"] / times[engine],
+                    }
+                )
+    return pd.DataFrame(rows).round(2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--data-dir", default="data")
+    args = parser.parse_args()
+
+    files = bundled_csvs(args.data_dir)
+    files[f"synthetique_{args.rows}.csv"] = synthetic_csv(args.rows)
+    results = bench(files, args.repeat)
+    print(results.to_string(index=False))
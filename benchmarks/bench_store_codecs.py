@@ -0,0 +1,152 @@
+"""
+Compare les codecs de compression du stockage des jeux de données.
+
+Pour chaque jeu (fichiers data/*.csv et DataFrames synthétiques), chaque format et
+chaque codec, mesure le temps d'écriture, le temps de lecture (cache mémoire du
+stockage vidé) et le taux de compression par rapport au fichier non compressé.
+Chaque mesure écrit dans un stockage neuf : les chunks d'une écriture précédente,
+identiques, seraient sinon réutilisés sans écriture sur le disque.
+La lecture est « chaude » : les fichiers venant d'être écrits sont encore dans le
+cache de pages du système. Avec --drop-caches (Linux, root), ce cache est vidé
+avant chaque lecture, qui est alors mesurée à froid.
+
+Utilisation :
+    PYTHONPATH=src python benchmarks/bench_store_codecs.py --rows 1000000
+    sudo PYTHONPATH=src python benchmarks/bench_store_codecs.py --drop-caches
+"""
+
+import argparse
+import glob
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from datazen.storage import DatasetStore
+
+CODECS = [
+    ("none", None),
+    ("lz4", None),
+    ("zstd", 1),
+    ("zstd", 3),
+    ("zstd", 9),
+    ("zstd", 19),
+]
+
+
+def synthetic_frames(rows: int) -> dict:
+    rng = np.random.default_rng(0)
+    return {
+        f"synthetique_numerique_{rows}": pd.DataFrame(
+            {
+                "entier": rng.integers(0, 1000, rows),
+                "reel": rng.normal(size=rows),
+                "mesure": np.round(rng.uniform(0, 100, rows), 2),
+            }
+        ),
+        f"synthetique_mixte_{rows}": pd.DataFrame(
+            {
+                "id": np.arange(rows),
+                "categorie": rng.choice(["nord", "sud", "est", "ouest"], rows),
+                "texte": [f"client_{i % 50000}" for i in range(rows)],
+                "montant": rng.exponential(100, rows),
+            }
+        ),
+    }
+
+
+def bundled_frames(data_dir: str) -> dict:
+    frames = {}
+    for path in sorted(glob.glob(os.path.join(data_dir, "*.csv"))):
+        try:
+            frames[os.path.basename(path)] = pd.read_csv(path)
+        except Exception:
+            frames[os.path.basename(path)] = pd.read_csv(path, sep=";")
+    return frames
+
+
+def drop_page_cache() -> bool:
+    # Vide le cache de pages du système (Linux, root) : la lecture suivante va
+    # jusqu'au disque.
+    os.sync()
+    try:
+        with open("/proc/sys/vm/drop_caches", "w") as f:
+            f.write("3\n")
+    except OSError:
+        return False
+    return True
+
+
+def bench(frames: dict, repeat: int, drop_caches: bool = False) -> pd.DataFrame:
+    read_column = "lecture_froide_ms" if drop_caches else "lecture_chaude_ms"
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in ("arrow", "parquet"):
+            for codec, level in CODECS:
+                for name, df in frames.items():
+                    file_id = "bench"
+                    write_times, read_times = [], []
+                    for i in range(repeat):
+                        directory = os.path.join(tmp, f"{fmt}_{codec}_{level}_{i}")
+                        store = DatasetStore(
+                            config={
+                                "STORE_DIR": directory,
+                                "FORMAT": fmt,
+                                "COMPRESSION": codec,
+                                "COMPRESSION_LEVEL": level,
+                                "MAX_BYTES": None,
+                            }
+                        )
+                        start = time.perf_counter()
+                        store.write(file_id, df)
+                        write_times.append(time.perf_counter() - start)
+                        store.frames.clear()
+                        if drop_caches:
+                            drop_page_cache()
+                        start = time.perf_counter()
+                        store.read(file_id)
+                        read_times.append(time.perf_counter() - start)
+                        size = store.usage()
+                        shutil.rmtree(directory)
+                    rows.append(
+                        {
+                            "jeu": name,
+                            "format": fmt,
+                            "codec": codec if level is None else f"{codec}-{level}",
+                            "ecriture_ms": min(write_times) * 1000,
+                            read_column: min(read_times) * 1000,
+                            "taille_ko": size / 1024,
+                        }
+                    )
+
+    results = pd.DataFrame(rows)
+    reference = results[results["codec"] == "none"].set_index(["jeu", "format"])[
+        "taille_ko"
+    ]
+    results["taux"] = [
+        reference[(r.jeu, r.format)] / r.taille_ko for r in results.itertuples()
+    ]
+    return results.round(2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument(
+        "--drop-caches",
+        action="store_true",
+        help="vide le cache de pages avant chaque lecture (Linux, root)",
+    )
+    args = parser.parse_args()
+    if args.drop_caches and not drop_page_cache():
+        parser.error("--drop-caches demande Linux et les droits root.")
+
+    frames = bundled_frames(args.data_dir)
+    frames.update(synthetic_frames(args.rows))
+    results = bench(frames, args.repeat, args.drop_caches)
+    print(results.to_string(index=False))
@@ -1,3 +1,3 @@
-__all__ = ["callbacks", "layouts", "data_manager"]
+__all__ = ["callbacks", "layouts", "data_manager", "storage", "uploads", "jobs", "watch"]
 
 
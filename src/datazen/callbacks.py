@@ -1,11 +1,15 @@
 from dash import *
 from datazen.data_manager import *
+from datazen.storage import store
+from datazen.uploads import uploads
+from datazen.jobs import jobs
+from datazen.watch import watch_folder
 import dash
 import uuid
+import pyarrow as pa
 import json
 import pandas as pd
 import plotly.express as px
-import pickle
 
 
 @callback(
@@ -30,19 +34,13 @@ def toggle_sidebar(n_clicks, active_class):
     Output("importpopup", "className"),
     Output("import-feedback-csv", "children"),
     Output("import-feedback-excel", "children"),
+    Output("import-feedback-columnar", "children"),
     Input("importbutton", "n_clicks"),
     Input("importpopup_close_button", "n_clicks"),
     Input("import-validate-button-csv", "n_clicks"),
     Input("import-validate-button-excel", "n_clicks"),
+    Input("import-validate-button-columnar", "n_clicks"),
     State("importpopup", "className"),
-    State("import-data", "contents"),
-    State("import-data", "filename"),
-    State("import-separator", "value"),
-    State("import-decimal", "value"),
-    State("import-header", "value"),
-    State("import-sheetname", "value"),
-    State("import-decimal-excel", "value"),
-    State("import-header-excel", "value"),
     prevent_initial_call=True,
 )
 def toggle_import_popup(
@@ -50,48 +48,31 @@ def toggle_import_popup(
     closeclick,
     importvalidation_csv,
     importvalidation_excel,
+    importvalidation_columnar,
     active_class,
-    contents,
-    filename,
-    sep,
-    decimal_csv,
-    header_csv,
-    sheet_name,
-    decimal_excel,
-    header_excel,
 ):
     current_class = active_class or ""
 
     if ctx.triggered_id == "importbutton":
         if "open" not in current_class:
             new_class = (current_class + " open").strip()
-            return new_class, "", ""
-        return current_class, "", ""
+            return new_class, "", "", ""
+        return current_class, "", "", ""
 
     elif ctx.triggered_id == "importpopup_close_button":
         new_class = current_class.replace("open", "").strip()
-        return new_class, "", ""
-
-    elif ctx.triggered_id == "import-validate-button-csv":
-        result = import_csv(contents, filename, sep, decimal_csv, header_csv)
-        error = result.get("error")
-        if error is None:
-            new_class = current_class.replace("open", "").strip()
-            return new_class, "", ""
-        return current_class, error or "Une erreur inconnue est survenue.", ""
+        return new_class, "", "", ""
 
-    elif ctx.triggered_id == "import-validate-button-excel":
-        result = import_excel(
-            contents, filename, sheet_name, header=header_excel, decimal=decimal_excel
-        )
-        error = result.get("error")
-        data = result.get("data")
-        if error is None and data is not None:
-            new_class = current_class.replace("open", "").strip()
-            return new_class, "", ""
-        return current_class, "", error
+    elif ctx.triggered_id in (
+        "import-validate-button-csv",
+        "import-validate-button-excel",
+        "import-validate-button-columnar",
+    ):
+        # Le popup reste ouvert pendant l'import, qui affiche son avancement :
+        # store_imported_data le ferme ou affiche l'erreur de lecture.
+        return current_class, "", "", ""
 
-    return no_update, no_update, no_update
+    return no_update, no_update, no_update, no_update
 
 
 @callback(
@@ -103,11 +84,17 @@ def toggle_import_popup(
     Input("importpopup_close_button", "n_clicks"),
     Input("import-validate-button-csv", "n_clicks"),
     Input("import-validate-button-excel", "n_clicks"),
+    Input("import-validate-button-columnar", "n_clicks"),
     State("importbutton_popup", "className"),
     prevent_initial_call=True,
 )
 def toggle_button_and_type_error_import(
-    filename, closeclick, importvalidation, importexcelvalidation, active_class
+    filename,
+    closeclick,
+    importvalidation,
+    importexcelvalidation,
+    importcolumnarvalidation,
+    active_class,
 ):
     if not ctx.triggered:
         return no_update, "", no_update, True
@@ -119,13 +106,20 @@ def toggle_button_and_type_error_import(
 
     try:
         if not (
-            filename.endswith(".csv")
+            is_csv_file(filename)
             or filename.endswith(".xlsx")
             or filename.endswith(".xls")
+            or columnar_format(filename)
         ):
             if "closed" not in active_class:
                 new_class = (active_class + " closed").strip()
-            return new_class, "Veuillez importer un fichier CSV ou Excel.", None, False
+            return (
+                new_class,
+                "Veuillez importer un fichier CSV, Excel, Parquet, Feather "
+                "ou JSON Lines.",
+                None,
+                False,
+            )
     except Exception:
         return no_update, "", no_update, True
 
@@ -145,6 +139,12 @@ def toggle_button_and_type_error_import(
             new_class = (active_class + " closed").strip()
         return new_class, "", no_update, True
 
+    if triggered_id == "import-validate-button-columnar":
+        new_class = active_class
+        if "closed" not in active_class:
+            new_class = (active_class + " closed").strip()
+        return new_class, "", no_update, True
+
     if triggered_id == "import-data" and filename is not None:
         new_class = active_class
         if "closed" not in active_class:
@@ -193,11 +193,7 @@ def update_import_content_class_csv(filename, closeclick, current_class):
 
         return "importpopup_content_csv"
 
-    if (
-        triggered_id == "import-data"
-        and filename is not None
-        and filename.endswith(".csv")
-    ):
+    if triggered_id == "import-data" and is_csv_file(filename):
 
         return "importpopup_content_csv open"
 
@@ -231,25 +227,12 @@ def update_import_title_excel(filename, closeclick):
 @callback(
     Output("importpopup_content_excel", "className"),
     Input("import-data", "filename"),
-    Input("import-data", "contents"),
     Input("importpopup_close_button", "n_clicks"),
-    Input("import-validate-button-excel", "n_clicks"),
+    Input("stored-data", "data"),
     State("importpopup_content_excel", "className"),
-    State("import-sheetname", "value"),
-    State("import-decimal-excel", "value"),
-    State("import-header-excel", "value"),
     prevent_initial_call=True,
 )
-def update_import_content_class_excel(
-    filename,
-    content,
-    closeclick,
-    validateclick,
-    current_class,
-    sheet_name,
-    decimal,
-    header,
-):
+def update_import_content_class_excel(filename, closeclick, stored_data, current_class):
     if not ctx.triggered:
         return no_update
 
@@ -266,23 +249,99 @@ def update_import_content_class_excel(
     ):
         return "importpopup_content_excel open"
 
-    if triggered_id == "import-validate-button-excel":
-        try:
-            result = import_excel(
-                content,
-                filename,
-                sheet_name,
-                header,
-                decimal,
-            )
-            if result.get("error") is None:
-                return current_class.replace("open", "").strip()
-        except Exception:
-            pass
+    # Import réussi : le classeur n'est pas relu pour le vérifier.
+    if triggered_id == "stored-data":
+        return current_class.replace("open", "").strip()
 
     return current_class
 
 
+@callback(
+    Output("import-sheetname", "options"),
+    Output("import-sheetname", "value", allow_duplicate=True),
+    Input("import-data", "contents"),
+    State("import-data", "filename"),
+    State("server-upload", "data"),
+    prevent_initial_call=True,
+)
+def list_excel_sheets(contents, filename, server_upload):
+    # Feuilles lues dans les métadonnées du classeur, sans lire les cellules :
+    # la première est présélectionnée.
+    if not filename or not filename.lower().endswith((".xls", ".xlsx")):
+        raise dash.exceptions.PreventUpdate
+    upload_id = None
+    if not contents:
+        upload_id = uploads.resolve(server_upload, filename)
+        if upload_id is None:
+            raise dash.exceptions.PreventUpdate
+    try:
+        if upload_id is None:
+            sheets = excel_sheet_names(contents, filename)
+        else:
+            with uploads.open(upload_id) as f:
+                sheets = excel_sheet_names(f, filename)
+    except Exception:
+        return [], []
+    return [{"label": s, "value": s} for s in sheets], sheets[:1]
+
+
+@callback(
+    Output("importpopup_content_columnar", "className"),
+    Input("import-data", "filename"),
+    Input("importpopup_close_button", "n_clicks"),
+    Input("stored-data", "data"),
+    State("importpopup_content_columnar", "className"),
+    prevent_initial_call=True,
+)
+def update_import_content_class_columnar(
+    filename, closeclick, stored_data, current_class
+):
+    triggered_id = ctx.triggered_id
+    current_class = current_class or "importpopup_content_columnar"
+
+    if triggered_id == "importpopup_close_button":
+        return "importpopup_content_columnar"
+
+    if triggered_id == "import-data" and columnar_format(filename):
+        return "importpopup_content_columnar open"
+
+    if triggered_id == "stored-data":
+        return current_class.replace("open", "").strip()
+
+    return current_class
+
+
+@callback(
+    Output("import-columns", "options"),
+    Output("import-columns", "value"),
+    Output("title_importpopup-columnar", "children"),
+    Input("import-data", "contents"),
+    State("import-data", "filename"),
+    State("server-upload", "data"),
+    prevent_initial_call=True,
+)
+def list_columnar_columns(contents, filename, server_upload):
+    # Colonnes lues dans le schéma du fichier, sans lire les données : par
+    # défaut, toutes les colonnes sont importées.
+    if not columnar_format(filename):
+        raise dash.exceptions.PreventUpdate
+    upload_id = None
+    if not contents:
+        upload_id = uploads.resolve(server_upload, filename)
+        if upload_id is None:
+            raise dash.exceptions.PreventUpdate
+    title = filename[:20] + "..." if len(filename) > 20 else filename
+    try:
+        if upload_id is None:
+            columns = columnar_columns(contents, filename)
+        else:
+            with uploads.open(upload_id) as f:
+                columns = columnar_columns(f, filename)
+    except Exception:
+        return [], [], title
+    return [{"label": c, "value": c} for c in columns], [], title
+
+
 @callback(
     Output("title_importpopup", "children"),
     Input("import-data", "filename"),
@@ -308,99 +367,499 @@ def update_import_title(filename, closeclick):
 
 
 @callback(
-    Output("stored-data", "data"),
-    Output("import-separator", "value"),
-    Output("import-decimal", "value"),
-    Output("import-header", "value"),
-    Output("import-decimal-excel", "value"),
-    Output("import-header-excel", "value"),
-    Output("import-sheetname", "value"),
+    Output("import-separator", "value", allow_duplicate=True),
+    Output("import-decimal", "value", allow_duplicate=True),
+    Output("import-header", "value", allow_duplicate=True),
+    Output("import-encoding", "value"),
+    Output("import-row-start", "value"),
+    Output("import-row-stop", "value"),
+    Output("import-row-step", "value"),
+    Input("import-data", "contents"),
+    State("import-data", "filename"),
+    State("server-upload", "data"),
+    prevent_initial_call=True,
+)
+def sniff_import_options(contents, filename, server_upload):
+    # Options de lecture devinées sur les premiers Ko du fichier, pour que
+    # l'import réussisse du premier coup sans réglage manuel.
+    if not is_csv_file(filename):
+        raise dash.exceptions.PreventUpdate
+    upload_id = None if contents else uploads.resolve(server_upload, filename)
+    try:
+        if contents:
+            sample = read_sample(contents, filename=filename)
+        elif upload_id is not None:
+            with uploads.open(upload_id) as f:
+                sample = read_sample(f, filename=filename)
+        else:
+            raise dash.exceptions.PreventUpdate
+    except (FileNotFoundError, ValueError, pa.ArrowException):
+        raise dash.exceptions.PreventUpdate
+    options = sniff_csv(sample)
+    return (
+        options["sep"],
+        options["decimal"],
+        options["header"],
+        options["encoding"],
+        None,
+        None,
+        1,
+    )
+
+
+@callback(
+    Output("import-preview", "children"),
+    Input("import-separator", "value"),
+    Input("import-decimal", "value"),
+    Input("import-header", "value"),
+    Input("import-encoding", "value"),
+    Input("import-data", "contents"),
+    State("import-data", "filename"),
+    State("server-upload", "data"),
+    prevent_initial_call=True,
+)
+def preview_import(sep, decimal, header, encoding, contents, filename, server_upload):
+    # Aperçu des premières lignes avec les options choisies : seul le début du
+    # fichier est lu, l'import complet attend le bouton « Importer ».
+    if not is_csv_file(filename):
+        return []
+    upload_id = None if contents else uploads.resolve(server_upload, filename)
+    try:
+        if contents:
+            result = preview_csv(contents, filename, sep, decimal, header, encoding)
+        elif upload_id is not None:
+            with uploads.open(upload_id) as f:
+                result = preview_csv(f, filename, sep, decimal, header, encoding)
+        else:
+            return []
+    except (FileNotFoundError, ValueError):
+        return []
+    if result.get("error") is not None:
+        return html.Span(f"Aperçu impossible : {result['error']}")
+    df = result["panda_data"]
+    df.columns = [str(col) for col in df.columns]
+    return [
+        html.Span(f"Aperçu des {len(df)} premières lignes ({df.shape[1]} colonnes)"),
+        dash_table.DataTable(
+            data=df.astype(str).to_dict("records"),
+            columns=[{"name": col, "id": col} for col in df.columns],
+            style_table={"overflowX": "auto", "maxHeight": "25vh"},
+            style_header={"backgroundColor": "#1f2937", "color": "white"},
+            style_cell={
+                "backgroundColor": "#111827",
+                "color": "white",
+                "fontSize": "12px",
+                "padding": "4px",
+            },
+        ),
+    ]
+
+
+@callback(
+    Output("import-job", "data"),
+    Output("import-progress-interval", "disabled"),
+    Output("import-progress", "children"),
     Input("import-validate-button-csv", "n_clicks"),
     Input("import-validate-button-excel", "n_clicks"),
+    Input("import-validate-button-columnar", "n_clicks"),
+    prevent_initial_call=True,
+)
+def start_import(n_clicks_csv, n_clicks_excel, n_clicks_columnar):
+    # Chaque import reçoit un identifiant : il est mis en file d'attente sous ce nom
+    # (voir jobs.py), et son état est relu par l'intervalle ci-dessous.
+    return {"id": uuid.uuid4().hex}, False, "Import en file d'attente..."
+
+
+@callback(
+    Output("import-progress", "children", allow_duplicate=True),
+    Input("import-cancel-button", "n_clicks"),
+    State("import-job", "data"),
+    prevent_initial_call=True,
+)
+def cancel_import(n_clicks, job):
+    if not job:
+        raise dash.exceptions.PreventUpdate
+    # L'import s'arrête au prochain morceau lu, quel que soit le worker qui le traite.
+    jobs.cancel(job["id"])
+    return "Annulation en cours..."
+
+
+@callback(
+    Output("import-error-feedback", "children", allow_duplicate=True),
+    Output("import-error-interval", "disabled", allow_duplicate=True),
+    Output("import-progress-interval", "disabled", allow_duplicate=True),
+    Output("import-progress", "children", allow_duplicate=True),
+    Input("import-job", "data"),
     State("import-separator", "value"),
     State("import-decimal", "value"),
     State("import-header", "value"),
     State("import-decimal-excel", "value"),
     State("import-header-excel", "value"),
     State("import-sheetname", "value"),
+    State("import-optimize", "value"),
+    State("import-optimize-excel", "value"),
     State("import-data", "contents"),
     State("import-data", "filename"),
     State("stored-data", "data"),
+    State("server-upload", "data"),
+    State("import-engine", "value"),
+    State("import-encoding", "value"),
+    State("import-columns", "value"),
+    State("import-optimize-columnar", "value"),
+    State("import-row-start", "value"),
+    State("import-row-stop", "value"),
+    State("import-row-step", "value"),
     prevent_initial_call=True,
 )
-def store_imported_data(
-    n_clicks_csv,
-    n_clicks_excel,
+def submit_import(
+    job,
     sep,
     decimal_csv,
     header_csv,
     decimal_excel,
     header_excel,
     sheetname,
+    optimize_csv,
+    optimize_excel,
     contents,
     filename,
     stored_data,
+    server_upload,
+    engine,
+    encoding,
+    columns,
+    optimize_columnar,
+    row_start,
+    row_stop,
+    row_step,
 ):
-    if not contents or not filename:
-        return (
-            no_update,
-            no_update,
-            no_update,
-            no_update,
-            no_update,
-            no_update,
-            no_update,
-        )
+    # Fichier envoyé par la route d'envoi direct (assets/direct_upload.js) : il est
+    # lu sur le disque du serveur au lieu de la data URL base64 de dcc.Upload.
+    # Seul le navigateur qui a envoyé le fichier peut l'importer (voir
+    # uploads.resolve).
+    upload_id = None if contents else uploads.resolve(server_upload, filename)
+    kind = import_kind(filename)
+    if not job or kind is None or (not contents and upload_id is None):
+        return no_update, no_update, True, ""
+
+    session_id = (stored_data or {}).get("session") or str(uuid.uuid4())
+    short_name = filename[:20] + "..." if len(filename) > 20 else filename
+    # Séparateur décimal choisi à l'import, repris par la normalisation du texte.
+    decimal = {"csv": decimal_csv, "excel": decimal_excel}.get(kind, ".")
+
+    def run(progress):
+        # Exécuté en arrière-plan par la file d'imports (voir jobs.py) : le
+        # hachage, la lecture et l'écriture du fichier ne bloquent pas la requête.
+        report = []
+
+        def optimize_frame(df):
+            if "normalize" in optimize:
+                df = normalize_columns(df, decimal)
+            if "category" in optimize:
+                df = encode_categoricals(df)
+            if "arrow_strings" in optimize:
+                df = to_arrow_strings(df)
+            if "compact" in optimize:
+                df, saved = downcast_numeric(df)
+                report.extend(saved)
+            return df
+
+        source = contents if upload_id is None else uploads.open(upload_id)
+        archive = None
+        try:
+            if kind == "csv":
+                optimize = sorted(optimize_csv or [])
+                # Lignes X à Y (numérotées à partir de 1, Y incluse), une sur k.
+                rows = (
+                    max((row_start or 1) - 1, 0),
+                    row_stop or None,
+                    max(row_step or 1, 1),
+                )
+                options = (
+                    sep,
+                    decimal_csv,
+                    header_csv,
+                    optimize,
+                    engine or "auto",
+                    encoding or "utf-8",
+                    rows,
+                )
+                file_id = content_id(source, "csv", *options)
+                datasets = [(file_id, short_name)]
+                if filename.lower().endswith(".zip"):
+                    # Archive : un jeu de données par CSV, décompressé en flux.
+                    archive = open_archive(source)
+                    members = zip_csv_members(archive)
+                    if not members:
+                        raise ValueError("Aucun fichier CSV dans l'archive.")
+                    datasets = [
+                        (
+                            id_hash(f"{file_id}:{m}"),
+                            f"{short_name} [{m.rpartition('/')[2]}]",
+                        )
+                        for m in members
+                    ]
+
+                def read_csv(stream, name, file_id):
+                    # Lecture par morceaux écrits au fur et à mesure dans le
+                    # stockage : le fichier n'est jamais chargé en entier, et
+                    # chaque optimisation est appliquée colonne par colonne.
+                    return import_csv_stream(
+                        stream,
+                        name,
+                        file_id,
+                        sep=sep,
+                        decimal=decimal_csv,
+                        header=header_csv,
+                        session_id=session_id,
+                        transform=optimize_frame,
+                        progress=progress,
+                        engine=options[4],
+                        encoding=options[5],
+                        row_start=rows[0],
+                        row_stop=rows[1],
+                        row_step=rows[2],
+                    )
+
+                def ingest():
+                    if archive is None:
+                        return read_csv(source, filename, file_id)
+                    for (member_id, _), member in zip(datasets, members):
+                        with archive.open(member) as f:
+                            result = read_csv(f, member, member_id)
+                        if result.get("error") is not None:
+                            return result
+                    return result
+
+            elif kind == "excel":
+                try:
+                    header = int(header_excel)
+                except Exception:
+                    header = 0
+                sheets = sheetname or [0]
+                optimize = sorted(optimize_excel or [])
+                workbook_id = content_id(source, "excel", header, decimal_excel, optimize)
+                # Un jeu de données par feuille, lues en une seule ouverture du
+                # classeur.
+                datasets = [
+                    (
+                        id_hash(f"{workbook_id}:{sheet}"),
+                        short_name if len(sheets) == 1 else f"{short_name} [{sheet}]",
+                    )
+                    for sheet in sheets
+                ]
+
+                def ingest():
+                    result = import_excel(
+                        source,
+                        filename,
+                        sheet_name=sheets,
+                        header=header,
+                        decimal=decimal_excel,
+                    )
+                    if result.get("error") is None:
+                        frames = result.pop("panda_data").values()
+                        for (file_id, _), df in zip(datasets, frames):
+                            set_df_to_cache(file_id, optimize_frame(df), session_id)
+                    return result
+
+            else:
+                optimize = sorted(optimize_columnar or [])
+                file_id = content_id(source, "columnar", columns or [], optimize)
+                datasets = [(file_id, short_name)]
+
+                def ingest():
+                    # Seules les colonnes choisies sont lues, par lots, avec leurs
+                    # types.
+                    return import_columnar_stream(
+                        source,
+                        filename,
+                        file_id,
+                        columns=columns or None,
+                        session_id=session_id,
+                        transform=optimize_frame,
+                        progress=progress,
+                    )
+
+            # Fichier déjà importé avec les mêmes options (par n'importe quelle
+            # session) : on réutilise les jeux stockés sans relire le fichier.
+            reused = all(store.attach(file_id, session_id) for file_id, _ in datasets)
+            result = None if reused else ingest()
+        finally:
+            if archive is not None:
+                archive.close()
+            if upload_id is not None:
+                source.close()
+
+        error = result.get("error") if result else None
+        if error is None and upload_id is not None:
+            uploads.delete(upload_id)
+        return {
+            "session": session_id,
+            "datasets": datasets,
+            "report": report,
+            "error": error,
+        }
 
-    result = None
+    jobs.submit(job["id"], run)
+    return no_update, no_update, False, "Import en file d'attente..."
 
-    if filename.lower().endswith(".csv"):
-        result = import_csv(
-            contents, filename, sep=sep, decimal=decimal_csv, header=header_csv
-        )
-    elif filename.lower().endswith((".xls", ".xlsx")):
-        try:
-            header_excel = int(header_excel)
-        except Exception:
-            header_excel = 0
-        result = import_excel(
-            contents,
-            filename,
-            sheet_name=sheetname if sheetname else 0,
-            header=header_excel,
-            decimal=decimal_excel,
-        )
-    else:
+
+@callback(
+    Output("stored-data", "data"),
+    Output("import-separator", "value"),
+    Output("import-decimal", "value"),
+    Output("import-header", "value"),
+    Output("import-decimal-excel", "value"),
+    Output("import-header-excel", "value"),
+    Output("import-sheetname", "value"),
+    Output("import-error-feedback", "children", allow_duplicate=True),
+    Output("import-error-interval", "disabled", allow_duplicate=True),
+    Output("import-report", "children"),
+    Output("importpopup", "className", allow_duplicate=True),
+    Output("import-feedback-csv", "children", allow_duplicate=True),
+    Output("import-feedback-excel", "children", allow_duplicate=True),
+    Output("import-feedback-columnar", "children", allow_duplicate=True),
+    Output("import-progress-interval", "disabled", allow_duplicate=True),
+    Output("import-progress", "children", allow_duplicate=True),
+    Input("import-progress-interval", "n_intervals"),
+    State("import-job", "data"),
+    State("import-data", "filename"),
+    State("stored-data", "data"),
+    State("importpopup", "className"),
+    prevent_initial_call=True,
+)
+def store_imported_data(n_intervals, job, filename, stored_data, popup_class):
+    if not job:
+        raise dash.exceptions.PreventUpdate
+    status = jobs.status(job["id"])
+    if status is None:
+        return (no_update,) * 14 + (True, no_update)
+    if status["state"] == "queued":
+        return (no_update,) * 15 + ("Import en file d'attente...",)
+    if status["state"] == "running":
+        rows = f"{status.get('rows', 0):,}".replace(",", " ")
+        return (no_update,) * 15 + (f"Import en cours : {rows} lignes lues",)
+
+    jobs.forget(job["id"])
+    if status["state"] == "cancelled":
         return (
-            no_update,
-            no_update,
-            no_update,
-            no_update,
-            no_update,
-            no_update,
-            no_update,
+            (no_update,) * 7
+            + ("Import annulé.", False)
+            + (no_update,) * 5
+            + (True, "")
         )
 
-    if result and result.get("error") is None:
-        df = result.get("panda_data")
-        file_id = id_hash(contents)
-
-        if stored_data is None:
-            stored_data = {"files": []}
+    result = status.get("result") or {}
+    error = status.get("error") or result.get("error")
+    if error is not None:
+        kind = import_kind(filename)
+        return (no_update,) * 11 + (
+            error if kind == "csv" else no_update,
+            error if kind == "excel" else no_update,
+            error if kind == "columnar" else no_update,
+            True,
+            "",
+        )
 
+    if stored_data is None:
+        stored_data = {"files": []}
+    stored_data.setdefault("session", result["session"])
+    for file_id, name in result["datasets"]:
         if not any(f["id"] == file_id for f in stored_data["files"]):
-            stored_data["files"].append(
-                {
-                    "name": filename[:20] + "..." if len(filename) > 20 else filename,
-                    "id": file_id,
-                }
-            )
+            stored_data["files"].append({"name": name, "id": file_id})
+
+    # Mémoire gagnée colonne par colonne par le mode « Numérique compact ».
+    report = result["report"]
+    report_items = []
+    if report:
+        saved = sum(r["saved"] for r in report)
+        report_items = [
+            html.Span(f"{filename} : {saved / 1024:.1f} Ko économisés"),
+            html.Ul(
+                [
+                    html.Li(
+                        f"{r['column']} : {r['before']} → {r['after']} "
+                        f"(-{r['saved'] / 1024:.1f} Ko)"
+                    )
+                    for r in report
+                ]
+            ),
+        ]
 
-        set_df_to_cache(file_id, df)
+    return (
+        stored_data,
+        ",",
+        ".",
+        0,
+        ".",
+        0,
+        [],
+        no_update,
+        no_update,
+        report_items,
+        (popup_class or "").replace("open", "").strip(),
+        "",
+        "",
+        "",
+        True,
+        "",
+    )
+
+
+@callback(
+    Output("session-heartbeat", "disabled"),
+    Input("session-heartbeat", "n_intervals"),
+    State("stored-data", "data"),
+    prevent_initial_call=True,
+)
+def renew_session(n_intervals, stored_data):
+    # Tant que l'onglet est ouvert, sa session est prolongée même sans
+    # modification des données : le nettoyage du stockage ne supprime que les
+    # sessions des onglets fermés depuis plus de SESSION_TTL.
+    session_id = (stored_data or {}).get("session")
+    if session_id:
+        store.touch_session(session_id)
+    return no_update
 
-        return stored_data, ",", ".", 0, ".", 0, "0"
 
-    return no_update, no_update, no_update, no_update, no_update, no_update, no_update
+@callback(
+    Output("stored-data", "data", allow_duplicate=True),
+    Output("watch-interval", "disabled"),
+    Input("watch-interval", "n_intervals"),
+    State("stored-data", "data"),
+    prevent_initial_call="initial_duplicate",
+)
+def sync_watched_files(n_intervals, stored_data):
+    # Fichiers importés côté serveur depuis WATCH_DIR (voir watch.py) : chaque jeu
+    # de données est proposé une fois ; la nouvelle version d'un fichier modifié
+    # remplace l'ancienne dans la liste. Sans WATCH_DIR, l'intervalle reste
+    # désactivé après le premier appel et les clients n'interrogent pas le serveur.
+    if not watch_folder.directory:
+        return no_update, True
+    catalog = watch_folder.catalog()
+    if not catalog:
+        return no_update, False
+    if stored_data is None:
+        stored_data = {"files": []}
+    watched = stored_data.setdefault("watched", [])
+    changed = False
+    for entry in catalog:
+        for file_id, name in entry["datasets"]:
+            if file_id in watched:
+                continue
+            watched.append(file_id)
+            changed = True
+            previous = next(
+                (f for f in stored_data["files"] if f.get("watch") == name), None
+            )
+            if previous is not None:
+                previous["id"] = file_id
+            else:
+                stored_data["files"].append({"name": name, "id": file_id, "watch": name})
+    if not changed:
+        return no_update, False
+    return stored_data, False
 
 
 @callback(
@@ -420,9 +879,11 @@ def store_imported_data(
 )
 def manage_files(remove_clicks, stored_data, stored_data_state, active_table_id):
     if not stored_data or "files" not in stored_data or not stored_data["files"]:
+        # Les fichiers du répertoire surveillé déjà retirés ne sont pas reproposés.
+        watched = (stored_data or {}).get("watched", [])
         return (
             [],
-            {"files": []},
+            {"files": [], "watched": watched} if watched else {"files": []},
             "importpopup_content_csv",
             "importbutton_popup",
             None,
@@ -446,6 +907,16 @@ def manage_files(remove_clicks, stored_data, stored_data_state, active_table_id)
     else:
         filtered_files = stored_data["files"]
 
+    session_id = stored_data.get("session")
+    if session_id:
+        # Les fichiers du répertoire surveillé sont gardés par la session "watch"
+        # (voir watch.py) et ne comptent pas dans le quota de l'utilisateur.
+        store.track_session(
+            session_id, [f["id"] for f in filtered_files if "watch" not in f]
+        )
+    if file_id_to_remove:
+        store.release(file_id_to_remove)
+
     buttons = []
     for f in filtered_files:
         file_block = html.Div(
@@ -478,7 +949,7 @@ def manage_files(remove_clicks, stored_data, stored_data_state, active_table_id)
 
     return (
         html.Div(buttons),
-        {"files": filtered_files},
+        {**stored_data, "files": filtered_files},
         "importpopup_content_csv",
         "importbutton_popup",
         None,
@@ -534,14 +1005,9 @@ def display_table(n_clicks, stored_data, active_table):
     if not n_clicks or n_clicks[index_in_all] is None or n_clicks[index_in_all] == 0:
         return no_update, no_update
 
-    pickled_df = cache.get(file_id)
-    if pickled_df is None:
+    if not store.exists(file_id):
         return "Cache expiré, recharge le fichier.", no_update
 
-    df = pickle.loads(pickled_df)
-    if df is None:
-        return "Erreur: df vide après chargement du cache.", no_update
-
     table = dash_table.DataTable()
     return table, {"id": file_id, "filters": {}, "sort": []}
 
@@ -585,6 +1051,7 @@ def update_visualization_visibility(table_class):
     Output("savebutton", "children"),
     Output("df_fusion_button", "className"),
     Output("exportbutton", "className"),
+    Output("undobutton", "className"),
     Output("reset-interval", "disabled"),
     Output("reset-interval", "n_intervals"),
     Input("savebutton", "n_clicks"),
@@ -606,6 +1073,7 @@ def toggle_btns(
         "tri_button",
         "df_fusion_button",
         "exportbutton",
+        "undobutton",
     )
     open_cls = [c + " open" if table else c for c in base_cls]
 
@@ -620,6 +1088,7 @@ def toggle_btns(
             html.I(className="fa-solid fa-floppy-disk"),
             open_cls[3],
             open_cls[4],
+            open_cls[5],
             True,
             0,
         )
@@ -632,6 +1101,7 @@ def toggle_btns(
             html.I(className="fa-solid fa-check animated-icon"),
             open_cls[3],
             open_cls[4],
+            open_cls[5],
             False,
             0,
         )
@@ -643,26 +1113,39 @@ def toggle_btns(
         html.I(className="fa-solid fa-floppy-disk"),
         open_cls[3],
         open_cls[4],
+        open_cls[5],
         True,
         0,
     )
 
 
+def is_shared(file_id: str, session_id: str | None) -> bool:
+    # Jeu de données utilisé par d'autres sessions : copié à la première
+    # sauvegarde (copy-on-write), jamais modifié ni annulé en place.
+    return watch_folder.is_shared(file_id) or store.shared(file_id, session_id)
+
+
 @callback(
     Output("stored-data", "data", allow_duplicate=True),
+    Output("active_table", "data", allow_duplicate=True),
     Input("savebutton", "n_clicks"),
     State({"type": "data_viewer", "index": ALL}, "data"),
     State({"type": "data_viewer", "index": ALL}, "id"),
     State("stored-data", "data"),
+    State("active_table", "data"),
     prevent_initial_call=True,
 )
-def save_table_data(n_clicks, data_list, id_list, stored_data):
+def save_table_data(n_clicks, data_list, id_list, stored_data, active_table):
     """
     Sauvegarde les données modifiées dans le cache à partir des tableaux éditables.
+    Un jeu de données partagé (fichier du répertoire surveillé, ou fichier identique
+    importé par une autre session) n'est pas modifié : la sauvegarde crée une copie
+    propre à la session, qui le remplace dans la liste des données.
     """
     if not stored_data or "files" not in stored_data:
-        return dash.no_update
+        return dash.no_update, dash.no_update
 
+    new_active = dash.no_update
     for row_list, df_id in zip(data_list, id_list):
         if not row_list:
             continue
@@ -670,20 +1153,62 @@ def save_table_data(n_clicks, data_list, id_list, stored_data):
         file_id = df_id["index"]
 
         try:
-            old_df_pickled = cache.get(file_id)
-            if old_df_pickled is None:
+            meta = store.metadata(file_id)
+            if meta is None:
                 continue
-            old_df = pickle.loads(old_df_pickled)
 
-            new_df = pd.DataFrame(row_list, columns=old_df.columns)
+            # Les lignes JSON du tableau perdent les types stockés (catégories,
+            # Int8, chaînes Arrow, dates) : ils sont rétablis avant l'écriture.
+            new_df = apply_schema(
+                pd.DataFrame(row_list, columns=[c["name"] for c in meta["columns"]]),
+                meta["columns"],
+            )
+
+            if is_shared(file_id, stored_data.get("session")):
+                session_id = stored_data.setdefault("session", str(uuid.uuid4()))
+                copy_id = id_hash(f"{file_id}:{session_id}")
+                set_df_to_cache(copy_id, new_df, session_id)
+                for f in stored_data["files"]:
+                    if f["id"] == file_id:
+                        f["id"] = copy_id
+                        f.pop("watch", None)
+                if active_table and active_table.get("id") == file_id:
+                    new_active = {**active_table, "id": copy_id}
+                continue
 
-            set_df_to_cache(file_id, new_df)
+            set_df_to_cache(file_id, new_df, stored_data.get("session"))
 
         except Exception as e:
             print(f"Erreur lors de la sauvegarde du fichier {file_id} : {e}")
             continue
 
-    return stored_data
+    return stored_data, new_active
+
+
+@callback(
+    Output("active_table", "data", allow_duplicate=True),
+    Input("undobutton", "n_clicks"),
+    State("active_table", "data"),
+    State("stored-data", "data"),
+    prevent_initial_call=True,
+)
+def undo_table_save(n_clicks, active_table, stored_data):
+    """
+    Annule la dernière sauvegarde (ou fusion) du tableau actif en revenant à sa
+    version précédente dans le stockage, puis réaffiche le tableau. Les jeux de
+    données partagés avec d'autres sessions (répertoire surveillé, fichier identique
+    importé ailleurs) ne sont pas concernés.
+    """
+    if not n_clicks or not active_table or not active_table.get("id"):
+        return no_update
+
+    if is_shared(active_table["id"], (stored_data or {}).get("session")):
+        return no_update
+
+    if not store.undo(active_table["id"]):
+        return no_update
+
+    return {**active_table}
 
 
 @callback(
@@ -703,14 +1228,10 @@ def update_table_with_filters_and_sort(active_table):
     if file_id is None:
         return no_update, no_update
 
-    pickled_df = cache.get(file_id)
-    if pickled_df is None:
+    df_filtered = get_filtered_df_from_cache(file_id, filters)
+    if df_filtered is None:
         return "fichier introuvable, recharge le fichier.", no_update
 
-    df = pickle.loads(pickled_df)
-
-    df_filtered = apply_filters(df, filters)
-
     df_sorted = apply_sort(df_filtered, sort_info)
 
     sorted_data = df_sorted.to_dict("records")
@@ -979,13 +1500,9 @@ def update_dropdown_columns_text(active_table_data):
         return []
 
     file_id = active_table_data["id"]
-    pickled_df = cache.get(file_id)
-
-    if pickled_df is None:
+    cols = get_columns_from_cache(file_id)
+    if cols is None:
         return []
-
-    df = pickle.loads(pickled_df)
-    cols = df.columns.tolist()
     return [{"label": c, "value": c} for c in cols]
 
 
@@ -1067,13 +1584,9 @@ def update_dropdown_columns_in_text(active_table_data):
         return []
 
     file_id = active_table_data["id"]
-    pickled_df = cache.get(file_id)
-
-    if pickled_df is None:
+    cols = get_columns_from_cache(file_id)
+    if cols is None:
         return []
-
-    df = pickle.loads(pickled_df)
-    cols = df.columns.tolist()
     return [{"label": c, "value": c} for c in cols]
 
 
@@ -1159,11 +1672,9 @@ def update_dropdown_columns_comparaison_filter(active_table_data):
     if not active_table_data or "id" not in active_table_data:
         return []
     file_id = active_table_data["id"]
-    pickled_df = cache.get(file_id)
-    if pickled_df is None:
+    numeric_cols = get_columns_from_cache(file_id, kinds=("numeric",))
+    if numeric_cols is None:
         return []
-    df = pickle.loads(pickled_df)
-    numeric_cols = df.select_dtypes(include="number").columns.tolist()
     return [{"label": c, "value": c} for c in numeric_cols]
 
 
@@ -1291,11 +1802,9 @@ def update_keep_columns_dropdown(active_table_data):
     if not active_table_data or "id" not in active_table_data:
         return []
     file_id = active_table_data["id"]
-    pickled_df = cache.get(file_id)
-    if pickled_df is None:
+    cols = get_columns_from_cache(file_id)
+    if cols is None:
         return []
-    df = pickle.loads(pickled_df)
-    cols = df.columns.tolist()
     return [{"label": c, "value": c} for c in cols]
 
 
@@ -1357,11 +1866,9 @@ def update_na_column_dropdown(active_table_data):
     if not active_table_data or "id" not in active_table_data:
         return []
     file_id = active_table_data["id"]
-    pickled_df = cache.get(file_id)
-    if pickled_df is None:
+    cols = get_columns_from_cache(file_id)
+    if cols is None:
         return []
-    df = pickle.loads(pickled_df)
-    cols = df.columns.tolist()
     return [{"label": c, "value": c} for c in cols]
 
 
@@ -1432,13 +1939,10 @@ def update_outlier_column_dropdown(active_table_data):
         return []
 
     file_id = active_table_data["id"]
-    pickled_df = cache.get(file_id)
-    if pickled_df is None:
+    quali_cols = get_columns_from_cache(file_id, kinds=("numeric",))
+    if quali_cols is None:
         return []
 
-    df = pickle.loads(pickled_df)
-    quali_cols = df.select_dtypes(include=["number"]).columns.tolist()
-
     return [{"label": c, "value": c} for c in quali_cols]
 
 
@@ -1516,12 +2020,9 @@ def update_sort_abc_column_dropdown(active_table_data):
         return []
 
     file_id = active_table_data["id"]
-    pickled_df = cache.get(file_id)
-    if pickled_df is None:
+    text_cols = get_columns_from_cache(file_id, kinds=("text", "category"))
+    if text_cols is None:
         return []
-
-    df = pickle.loads(pickled_df)
-    text_cols = df.select_dtypes(include=["object", "string"]).columns.tolist()
     return [{"label": c, "value": c} for c in text_cols]
 
 
@@ -1596,21 +2097,10 @@ def update_sort_123_column_dropdown(active_table_data):
         return []
 
     file_id = active_table_data["id"]
-    pickled_df = cache.get(file_id)
-    if pickled_df is None:
-        return []
-
-    try:
-        df = pickle.loads(pickled_df)
-        num_bool_cols = [
-            col
-            for col in df.columns
-            if pd.api.types.is_numeric_dtype(df[col])
-            or pd.api.types.is_bool_dtype(df[col])
-        ]
-        return [{"label": c, "value": c} for c in num_bool_cols]
-    except Exception:
+    num_bool_cols = get_columns_from_cache(file_id, kinds=("numeric", "bool"))
+    if num_bool_cols is None:
         return []
+    return [{"label": c, "value": c} for c in num_bool_cols]
 
 
 @callback(
@@ -1724,17 +2214,16 @@ def concat_add_file(
 
     try:
         id_main = active_table["id"]
-        df_main = pickle.loads(cache.get(id_main))
-        df_other = pickle.loads(cache.get(selected_id))
+        df_main, df_other = get_dfs_from_cache([id_main, selected_id])
 
         df_concat = concat_dataframes(df_main, df_other, axis)
 
         new_id = str(uuid.uuid4())
         new_name = f"concat_{id_main[:4]}_{selected_id[:4]}"
-        cache.set(new_id, pickle.dumps(df_concat))
+        set_df_to_cache(new_id, df_concat, stored_data.get("session"))
 
         new_file = {"id": new_id, "name": new_name}
-        new_stored_data = {"files": stored_data["files"] + [new_file]}
+        new_stored_data = {**stored_data, "files": stored_data["files"] + [new_file]}
 
         file_buttons = [
             html.Div(
@@ -1840,8 +2329,10 @@ def update_merge_column_left(selected_file_id, validate_clicks, active_table):
         return [], None
 
     active_id = active_table["id"]
-    df = pickle.loads(cache.get(active_id))
-    cols = [{"label": col, "value": col} for col in df.columns]
+    cols = [
+        {"label": col, "value": col}
+        for col in get_columns_from_cache(active_id) or []
+    ]
 
     triggered_id = ctx.triggered_id
     if triggered_id == "import-validate-button-merge":
@@ -1860,8 +2351,10 @@ def update_merge_column_right(selected_file_id, validate_clicks):
     if not selected_file_id:
         return [], None
 
-    df = pickle.loads(cache.get(selected_file_id))
-    cols = [{"label": col, "value": col} for col in df.columns]
+    cols = [
+        {"label": col, "value": col}
+        for col in get_columns_from_cache(selected_file_id) or []
+    ]
 
     triggered_id = ctx.triggered_id
     if triggered_id == "import-validate-button-merge":
@@ -1913,8 +2406,7 @@ def merge_add_file(
     try:
         active_id = active_table["id"]
 
-        df_main = pickle.loads(cache.get(active_id))
-        df_other = pickle.loads(cache.get(selected_file_id))
+        df_main, df_other = get_dfs_from_cache([active_id, selected_file_id])
 
         df_merged = merge_dataframes(df_main, df_other, left_key, right_key, how)
 
@@ -1922,9 +2414,10 @@ def merge_add_file(
         new_name = f"merged_{active_id[:4]}_{selected_file_id[:4]}"
         new_file = {"id": new_id, "name": new_name}
 
-        cache.set(new_id, pickle.dumps(df_merged))
+        set_df_to_cache(new_id, df_merged, stored_data.get("session"))
 
         new_stored_data = {
+            **stored_data,
             "files": stored_data["files"] + [new_file],
         }
 
@@ -1997,7 +2490,7 @@ def export_file(n, store_data, file_format):
         return dash.no_update
 
     data_id = store_data["id"]
-    df = pickle.loads(cache.get(data_id))
+    df = get_df_from_cache(data_id)
     filename = f"export_{data_id}"
 
     if file_format == "csv":
@@ -2018,17 +2511,13 @@ def update_valuebox_quantitative_count(active_table):
         return "0"
     file_id = active_table["id"]
 
-    pickled_df = cache.get(file_id)
-    if not pickled_df:
-        return "0"
-
-    df = pickle.loads(pickled_df)
-
     filters = active_table.get("filters", {})
+    view = get_filtered_view_from_cache(file_id, filters)
+    if view is None:
+        return "0"
 
-    df_filtered = apply_filters(df, filters)
-
-    count = count_quantitative(df_filtered)
+    # Une seule ligne suffit : elle garde les types et le fait que la vue soit vide.
+    count = count_quantitative(view.head(1))
 
     return str(count)
 
@@ -2043,16 +2532,12 @@ def update_valuebox_qualitative_count(active_table):
         return "0"
     file_id = active_table["id"]
 
-    pickled_df = cache.get(file_id)
-    if not pickled_df:
-        return "0"
-
-    df = pickle.loads(pickled_df)
-
     filters = active_table.get("filters", {})
-    df_filtered = apply_filters(df, filters)
+    view = get_filtered_view_from_cache(file_id, filters)
+    if view is None:
+        return "0"
 
-    count = count_qualitative(df_filtered)
+    count = count_qualitative(view.head(1))
     return str(count)
 
 
@@ -2066,16 +2551,12 @@ def update_nrow(active_table):
         return "0"
     file_id = active_table["id"]
 
-    pickled_df = cache.get(file_id)
-    if not pickled_df:
-        return "0"
-
-    df = pickle.loads(pickled_df)
-
     filters = active_table.get("filters", {})
-    df_filtered = apply_filters(df, filters)
+    view = get_filtered_view_from_cache(file_id, filters)
+    if view is None:
+        return "0"
 
-    return str(len(df_filtered))
+    return str(len(view))
 
 
 @callback(
@@ -2088,14 +2569,10 @@ def update_missing_count(active_table):
         return "0"
     file_id = active_table["id"]
 
-    pickled_df = cache.get(file_id)
-    if not pickled_df:
-        return "0"
-
-    df = pickle.loads(pickled_df)
-
     filters = active_table.get("filters", {})
-    df_filtered = apply_filters(df, filters)
+    df_filtered = get_filtered_df_from_cache(file_id, filters)
+    if df_filtered is None:
+        return "0"
 
     return str(nas(df_filtered))
 
@@ -2111,19 +2588,15 @@ def update_dropdowns(active_table):
         return [], []
 
     file_id = active_table["id"]
-    pickled_df = cache.get(file_id)
-    if not pickled_df:
-        return [], []
-
-    df = pickle.loads(pickled_df)
-
     filters = active_table.get("filters", {})
-
-    df_filtered = apply_filters(df, filters)
+    view = get_filtered_view_from_cache(file_id, filters)
+    if view is None:
+        return [], []
+    df_filtered = view.head(0)
 
     quanti_columns = df_filtered.select_dtypes(include=["number"]).columns.tolist()
     quali_columns = df_filtered.select_dtypes(
-        include=["object", "category", "bool"]
+        include=["object", "string", "category", "bool", "datetime"]
     ).columns.tolist()
 
     quanti_options = [{"label": col, "value": col} for col in quanti_columns]
@@ -2144,14 +2617,10 @@ def update_quantitative_tables(n_clicks, active_table, selected_col):
         return html.Div()
 
     file_id = active_table["id"]
-    pickled_df = cache.get(file_id)
-    if pickled_df is None:
-        return html.Div("fichier introuvable.")
-
-    df = pickle.loads(pickled_df)
-
     filters = active_table.get("filters", {})
-    df_filtered = apply_filters(df, filters)
+    df_filtered = get_filtered_df_from_cache(file_id, filters)
+    if df_filtered is None:
+        return html.Div("fichier introuvable.")
 
     if selected_col not in df_filtered.columns:
         return html.Div(
@@ -2300,22 +2769,24 @@ def update_qualitative_tables(n_clicks, active_table, selected_col):
         return html.Div()
 
     file_id = active_table["id"]
-    pickled_df = cache.get(file_id)
-    if not pickled_df:
-        return html.Div("fichier introuvable.", style={"color": "red"})
-
-    df = pickle.loads(pickled_df)
-
     filters = active_table.get("filters", {})
-    df_filtered = apply_filters(df, filters)
+    df_filtered = get_filtered_df_from_cache(
+        file_id, filters, columns_needed(filters, selected_col)
+    )
+    if df_filtered is None:
+        return html.Div("fichier introuvable.", style={"color": "red"})
 
     if selected_col not in df_filtered.columns:
         return html.Div(f"Colonne {selected_col} non trouvée", style={"color": "red"})
 
-    series = df_filtered[selected_col].fillna("NA").replace("", "NA")
+    counts = df_filtered[selected_col].value_counts(dropna=False)
+    counts = counts[counts > 0]
+    labels = pd.Series(counts.index.astype(object)).fillna("NA").replace("", "NA")
 
     freq_table = (
-        series.value_counts(dropna=False)
+        counts.groupby(labels.to_numpy(), sort=False)
+        .sum()
+        .sort_values(ascending=False)
         .rename_axis("Modalité")
         .reset_index(name="Nombre")
     )
@@ -2428,13 +2899,12 @@ def update_quanti_graph(graph_type, selected_col, active_table):
         return html.Div("Aucune table active", style={"color": "red"})
 
     file_id = active_table["id"]
-    pickled_df = cache.get(file_id)
-    if not pickled_df:
-        return html.Div("fichier introuvable.", style={"color": "red"})
-
-    df = pickle.loads(pickled_df)
     filters = active_table.get("filters", {})
-    df_filtered = apply_filters(df, filters)
+    df_filtered = get_filtered_df_from_cache(
+        file_id, filters, columns_needed(filters, selected_col)
+    )
+    if df_filtered is None:
+        return html.Div("fichier introuvable.", style={"color": "red"})
 
     if selected_col not in df_filtered.columns:
         return html.Div(f"Colonne '{selected_col}' non trouvée", style={"color": "red"})
@@ -2506,13 +2976,12 @@ def update_quali_graph(graph_type, selected_col, active_table):
         return html.Div("Aucune table active", style={"color": "red"})
 
     file_id = active_table["id"]
-    pickled_df = cache.get(file_id)
-    if not pickled_df:
-        return html.Div("fichier introuvable.", style={"color": "red"})
-
-    df = pickle.loads(pickled_df)
     filters = active_table.get("filters", {})
-    df_filtered = apply_filters(df, filters)
+    df_filtered = get_filtered_df_from_cache(
+        file_id, filters, columns_needed(filters, selected_col)
+    )
+    if df_filtered is None:
+        return html.Div("fichier introuvable.", style={"color": "red"})
 
     if selected_col not in df_filtered.columns:
         return html.Div(f"Colonne '{selected_col}' non trouvée", style={"color": "red"})
@@ -2560,13 +3029,10 @@ def update_graph_dropdowns(active_table):
         return [], []
 
     file_id = active_table["id"]
-    pickled_df = cache.get(file_id)
-    if not pickled_df:
-        return [], []
-
-    df = pickle.loads(pickled_df)
     filters = active_table.get("filters", {})
-    df_filtered = apply_filters(df, filters)
+    df_filtered = get_filtered_df_from_cache(file_id, filters)
+    if df_filtered is None:
+        return [], []
 
     col_options = [
         {"label": col, "value": col} for col in df_filtered.columns if col != "index"
@@ -2597,13 +3063,12 @@ def update_advanced_graph(col_x, col_y, graph_type, active_table):
         )
 
     file_id = active_table["id"]
-    pickled_df = cache.get(file_id)
-    if not pickled_df:
-        return html.Div("fichier introuvable.", style={"color": "red"})
-
-    df = pickle.loads(pickled_df)
     filters = active_table.get("filters", {})
-    df_filtered = apply_filters(df, filters)
+    df_filtered = get_filtered_df_from_cache(
+        file_id, filters, columns_needed(filters, col_x, col_y)
+    )
+    if df_filtered is None:
+        return html.Div("fichier introuvable.", style={"color": "red"})
 
     if col_x not in df_filtered.columns or col_y not in df_filtered.columns:
         return html.Div(
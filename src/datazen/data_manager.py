@@ -7,44 +7,202 @@ import plotly.express as px
 import statsmodels.api as sm
 from dash import ctx
 import json
-from flask_caching import Cache
-import pickle
 import hashlib
-
-cache = Cache()
-
-
-def set_df_to_cache(file_id: str, df: pd.DataFrame):
-    """
-    Sérialise un DataFrame et le stocke dans le cache avec un identifiant de fichier.
+import functools
+import importlib.util
+import zipfile
+from xml.etree import ElementTree
+import codecs
+import collections
+import csv
+import re
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.json as pa_json
+import pyarrow.parquet as pq
+from datazen.storage import QuotaError, store
+
+
+def set_df_to_cache(file_id: str, df: pd.DataFrame, session_id: str | None = None):
+    """
+    Stocke un DataFrame dans le stockage colonnaire avec un identifiant de fichier.
     Parameters:
     - file_id (str): L'identifiant du fichier pour le cache.
     - df (pd.DataFrame): Le DataFrame à stocker dans le cache.
+    - session_id (str | None): La session à laquelle rattacher le fichier (quota et nettoyage).
     Returns:
     - None
+    Raises:
+    - ValueError: Si le quota de stockage de la session est dépassé.
     Exemple d'utilisation:
     >>> df = pd.DataFrame({'A': [1, 2], 'B': [3, 4]})
-    >>> set_df_to_cache('file_123', df)
+    >>> set_df_to_cache('file_123', df, session_id='session_1')
     """
-    data_pickle = pickle.dumps(df)
-    cache.set(file_id, data_pickle, timeout=0)
+    store.write(file_id, df, session_id)
 
 
-def get_df_from_cache(file_id: str) -> pd.DataFrame | None:
+def get_df_from_cache(file_id: str, columns: list | None = None) -> pd.DataFrame | None:
     """
     Récupère un DataFrame du cache à l'aide de l'identifiant de fichier.
+    Seules les colonnes demandées sont lues sur le disque.
     Parameters:
     - file_id (str): L'identifiant du fichier pour le cache.
+    - columns (list | None): Les colonnes à lire (toutes si None).
     Returns:
     - pd.DataFrame | None: Le DataFrame récupéré du cache, ou None si l'identifiant n'existe pas.
     Exemple d'utilisation:
-    >>> df = get_df_from_cache('file_123')
+    >>> df = get_df_from_cache('file_123', columns=['A'])
     >>> if df is not None:
     """
-    pickled_df = cache.get(file_id)
-    if pickled_df is None:
+    return store.read(file_id, columns)
+
+
+def get_dfs_from_cache(file_ids: list, columns: list | None = None) -> list:
+    """
+    Récupère plusieurs DataFrames du cache en une seule lecture groupée
+    (un aller-retour réseau avec le backend Redis).
+    Parameters:
+    - file_ids (list): Les identifiants des fichiers.
+    - columns (list | None): Les colonnes à lire dans chaque fichier (toutes si None).
+    Returns:
+    - list: Les DataFrames récupérés, None pour les identifiants inexistants.
+    Exemple d'utilisation:
+    >>> df_left, df_right = get_dfs_from_cache(['file_123', 'file_456'])
+    """
+    return store.read_many(file_ids, columns)
+
+
+def get_columns_from_cache(file_id: str, kinds: tuple | None = None) -> list | None:
+    """
+    Liste les colonnes d'un fichier du cache à partir de ses métadonnées, sans lire
+    les données.
+    Parameters:
+    - file_id (str): L'identifiant du fichier pour le cache.
+    - kinds (tuple | None): Les familles de colonnes à garder ("numeric", "bool",
+      "text", "category", "datetime", "other"), toutes si None.
+    Returns:
+    - list | None: Les noms des colonnes, ou None si l'identifiant n'existe pas.
+    Exemple d'utilisation:
+    >>> get_columns_from_cache('file_123', kinds=("numeric",))
+    ['A', 'B']
+    """
+    meta = store.metadata(file_id)
+    if meta is None:
+        return None
+    return [c["name"] for c in meta["columns"] if kinds is None or c["kind"] in kinds]
+
+
+def columns_needed(filters: dict, *cols) -> list:
+    """
+    Liste les colonnes à lire pour appliquer des filtres puis utiliser certaines colonnes.
+    Parameters:
+    - filters (dict): Dictionnaire des filtres à appliquer.
+    - *cols (str): Les colonnes utilisées après filtrage.
+    Returns:
+    - list: Les colonnes nécessaires, sans doublon.
+    Exemple d'utilisation:
+    >>> filters = {'f1': {'type': 'text', 'col': 'A', 'value': 'banana'}}
+    >>> columns_needed(filters, 'B')
+    ['B', 'A']
+    """
+    needed = [c for c in cols if c is not None]
+    for f in filters.values():
+        if f.get("col") is not None:
+            needed.append(f["col"])
+        if f.get("type") == "keep_columns":
+            needed.extend(f.get("columns") or [])
+    return list(dict.fromkeys(needed))
+
+
+def filter_prefix_keys(filters: dict) -> list:
+    """
+    Calcule une empreinte pour chaque préfixe d'une chaîne de filtres. L'empreinte du
+    préfixe k ne dépend que du contenu des k premiers filtres, pas de leurs identifiants.
+    Parameters:
+    - filters (dict): Dictionnaire des filtres, dans leur ordre d'application.
+    Returns:
+    - list: Les empreintes des préfixes de longueur 1 à len(filters).
+    Exemple d'utilisation:
+    >>> filter_prefix_keys({'f1': {'type': 'na', 'col': 'A', 'action': 'drop'}})
+    ['5f0c...']
+    """
+    h = hashlib.blake2b(digest_size=16)
+    keys = []
+    for f in filters.values():
+        h.update(json.dumps(f, sort_keys=True, default=str).encode("utf-8"))
+        h.update(b"\x00")
+        keys.append(h.hexdigest())
+    return keys
+
+
+def get_filtered_view_from_cache(
+    file_id: str, filters: dict, columns: list | None = None
+) -> "FilteredView | None":
+    """
+    Récupère la vue filtrée d'un DataFrame du cache (voir FilteredView), en
+    réutilisant les résultats déjà calculés : les clés sont (fichier, version,
+    colonnes, empreinte du préfixe de filtres). Ajouter un filtre ne rejoue que ce
+    dernier, et retirer le dernier filtre renvoie directement la vue mémorisée.
+    Parameters:
+    - file_id (str): L'identifiant du fichier pour le cache.
+    - filters (dict): Dictionnaire des filtres à appliquer.
+    - columns (list | None): Les colonnes à lire (toutes si None).
+    Returns:
+    - FilteredView | None: La vue filtrée, ou None si l'identifiant n'existe pas.
+    Exemple d'utilisation:
+    >>> filters = {'f1': {'type': 'text', 'col': 'A', 'value': 'banana'}}
+    >>> len(get_filtered_view_from_cache('file_123', filters))
+    1
+    """
+    version = store.version(file_id)
+    if version is None:
+        return None
+    filters = filters or {}
+    chain = list(filters.items())
+    cols_key = None if columns is None else tuple(columns)
+    keys = [(file_id, version, cols_key, k) for k in filter_prefix_keys(filters)]
+
+    start, view = 0, None
+    for k in range(len(keys), 0, -1):
+        entry = store.filters.get(keys[k - 1])
+        if entry is not None:
+            start, view = k, entry[0]
+            break
+    # Le cache des filtres ne garde que les positions et les colonnes modifiées
+    # (FilteredView.detach) : la table de base est reprise ici de store.frames ou
+    # du stockage, et FILTER_CACHE_BYTES borne réellement la mémoire des vues.
+    df = get_df_from_cache(file_id, columns)
+    if df is None:
+        return None
+    view = FilteredView(df) if view is None else view.attach(df)
+
+    for k in range(start, len(chain)):
+        view = apply_filters(view, dict([chain[k]]))
+        store.filters.put(keys[k], view.detach(), nbytes=view.nbytes)
+    return view
+
+
+def get_filtered_df_from_cache(
+    file_id: str, filters: dict, columns: list | None = None
+) -> pd.DataFrame | None:
+    """
+    Récupère un DataFrame du cache après application des filtres. Les filtres sont
+    mémorisés sous forme de vues (voir get_filtered_view_from_cache) : seules les
+    lignes et colonnes gardées sont copiées, une seule fois.
+    Parameters:
+    - file_id (str): L'identifiant du fichier pour le cache.
+    - filters (dict): Dictionnaire des filtres à appliquer.
+    - columns (list | None): Les colonnes à lire (toutes si None).
+    Returns:
+    - pd.DataFrame | None: Le DataFrame filtré, ou None si l'identifiant n'existe pas.
+    Exemple d'utilisation:
+    >>> filters = {'f1': {'type': 'text', 'col': 'A', 'value': 'banana'}}
+    >>> df_filtered = get_filtered_df_from_cache('file_123', filters)
+    """
+    view = get_filtered_view_from_cache(file_id, filters, columns)
+    if view is None:
         return None
-    return pickle.loads(pickled_df)
+    return view.materialize()
 
 
 def id_hash(contents: str) -> str:
@@ -64,8 +222,304 @@ def id_hash(contents: str) -> str:
     return h.hexdigest()
 
 
+def _content_hasher(algorithm: str):
+    if algorithm in ("auto", "xxh3"):
+        try:
+            import xxhash
+
+            return xxhash.xxh3_128()
+        except ImportError as e:
+            if algorithm == "xxh3":
+                raise ImportError(
+                    "Le hash xxh3 nécessite le paquet xxhash : pip install xxhash"
+                ) from e
+        return hashlib.blake2b(digest_size=16)
+    if algorithm == "blake2b":
+        return hashlib.blake2b(digest_size=16)
+    if algorithm == "sha256":
+        return hashlib.sha256()
+    raise ValueError(f"Algorithme de hash inconnu : {algorithm!r}")
+
+
+def content_id(
+    contents: str, *options, algorithm: str | None = None, block: int = 4 * 1024**2
+) -> str:
+    """
+    Calcule l'identifiant d'un fichier importé à partir de ses octets décodés et des
+    options de lecture, avant tout parsing. Le base64 est décodé et haché par blocs,
+    sans construire le fichier complet en mémoire. Le même fichier importé avec les
+    mêmes options donne le même identifiant, quelle que soit la session.
+    Parameters:
+    - contents (str | BinaryIO): Le contenu du fichier encodé en base64 (data URL de
+      dcc.Upload), ou le fichier reçu par la route d'envoi direct, ouvert en binaire.
+    - *options: Les options de lecture (séparateur, feuille, en-tête...).
+    - algorithm (str | None): "auto" (xxh3 si le paquet xxhash est installé, sinon
+      blake2b), "xxh3", "blake2b" ou "sha256". Par défaut, l'option UPLOAD_HASH du stockage.
+    - block (int): La taille des blocs de base64 décodés à la fois.
+    Returns:
+    - str: L'identifiant hexadécimal.
+    Exemple d'utilisation:
+    >>> content_id("data:text/csv;base64,SGVsbG8sV29ybGQKMSwyLDMKNCw1LDY=", "csv", ",", ".", 0)
+    'a3c5...'
+    """
+    h = _content_hasher(algorithm or store.config["UPLOAD_HASH"])
+    if isinstance(contents, str):
+        _, content_string = contents.split(",", 1)
+        block -= block % 4
+        for i in range(0, len(content_string), block):
+            h.update(base64.b64decode(content_string[i : i + block]))
+    else:
+        # Fichier reçu directement (voir uploads.py) : haché par blocs puis rembobiné.
+        for data in iter(lambda: contents.read(block), b""):
+            h.update(data)
+        contents.seek(0)
+    h.update(json.dumps(options, default=str).encode("utf-8"))
+    return h.hexdigest()
+
+
+CSV_ENGINES = ("auto", "pyarrow", "c")
+CSV_SEPARATORS = (",", ";", "\t", "|")
+CSV_ENCODINGS = ("utf-8", "utf-8-sig", "utf-16", "cp1252", "latin-1")
+
+
+CSV_COMPRESSIONS = {".gz": "gzip", ".zst": "zstd", ".bz2": "bz2"}
+
+
+def csv_compression(filename: str) -> tuple[str, str | None]:
+    """
+    Sépare l'extension de compression du nom d'un fichier importé.
+    Parameters:
+    - filename (str): Le nom du fichier (ex : "ventes.csv.gz").
+    Returns:
+    - tuple: Le nom sans l'extension de compression et le codec ("gzip", "zstd",
+      "bz2"), ou le nom inchangé et None pour un fichier non compressé.
+    Exemple d'utilisation:
+    >>> csv_compression("ventes.csv.zst")
+    ('ventes.csv', 'zstd')
+    """
+    for ext, codec in CSV_COMPRESSIONS.items():
+        if filename.lower().endswith(ext):
+            return filename[: -len(ext)], codec
+    return filename, None
+
+
+def is_csv_file(filename: str | None) -> bool:
+    """
+    Indique si un fichier est importé avec les options CSV : CSV brut, CSV compressé
+    (.csv.gz, .csv.zst, .csv.bz2) ou archive .zip de CSV.
+    Parameters:
+    - filename (str | None): Le nom du fichier.
+    Returns:
+    - bool: True pour un fichier lu par le lecteur CSV.
+    """
+    if not filename:
+        return False
+    name = csv_compression(filename)[0].lower()
+    return name.endswith(".csv") or name.endswith(".zip")
+
+
+def open_archive(contents) -> zipfile.ZipFile:
+    """
+    Ouvre une archive .zip importée. Ses membres sont ensuite décompressés en flux
+    par archive.open(), sans copie décompressée en mémoire.
+    Parameters:
+    - contents (str | BinaryIO): Le contenu de l'archive encodé en base64, ou le
+      fichier reçu par la route d'envoi direct, ouvert en binaire.
+    Returns:
+    - zipfile.ZipFile: L'archive ouverte en lecture.
+    Raises:
+    - ValueError: Si le fichier n'est pas une archive .zip valide.
+    """
+    if isinstance(contents, str):
+        _, content_string = contents.split(",", 1)
+        contents = io.BytesIO(base64.b64decode(content_string))
+    contents.seek(0)
+    try:
+        return zipfile.ZipFile(contents)
+    except zipfile.BadZipFile as e:
+        raise ValueError(f"Archive .zip invalide : {e}") from e
+
+
+def zip_csv_members(archive: zipfile.ZipFile) -> list:
+    """
+    Liste les fichiers CSV d'une archive .zip (hors dossiers et métadonnées macOS).
+    Parameters:
+    - archive (zipfile.ZipFile): L'archive ouverte (voir open_archive).
+    Returns:
+    - list: Les noms des membres CSV, dans l'ordre de l'archive.
+    """
+    return [
+        info.filename
+        for info in archive.infolist()
+        if not info.is_dir()
+        and info.filename.lower().endswith(".csv")
+        and not info.filename.startswith("__MACOSX/")
+    ]
+
+
+class _KeepOpen(io.RawIOBase):
+    """
+    Vue en lecture d'un fichier, que sa fermeture ne ferme pas : PyArrow ferme le
+    flux qu'il décompresse, alors que le fichier reçu est relu (moteur de secours).
+    """
+
+    def __init__(self, raw):
+        self.raw = raw
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self.raw.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+
+def _open_source(contents, compression: str | None = None):
+    if isinstance(contents, str):
+        stream = io.BufferedReader(_Base64Reader(contents), buffer_size=1024**2)
+    else:
+        contents.seek(0)
+        stream = contents if compression is None else _KeepOpen(contents)
+    if compression is None:
+        return stream
+    # Décompression en flux : seuls quelques blocs décompressés sont en mémoire.
+    return pa.CompressedInputStream(stream, compression)
+
+
+def read_sample(contents, size: int = 64 * 1024, filename: str | None = None) -> bytes:
+    """
+    Lit les premiers octets d'un fichier importé, sans décoder le reste. Un CSV
+    compressé est décompressé en flux jusqu'à size octets ; pour une archive .zip,
+    c'est le début de son premier CSV qui est lu.
+    Parameters:
+    - contents (str | BinaryIO): Le contenu du fichier encodé en base64 (data URL de
+      dcc.Upload), ou le fichier reçu par la route d'envoi direct, ouvert en binaire.
+    - size (int): Le nombre d'octets à lire.
+    - filename (str | None): Le nom du fichier, qui indique sa compression.
+    Returns:
+    - bytes: Le début du fichier (décompressé).
+    Exemple d'utilisation:
+    >>> read_sample("data:text/csv;base64,YSxiCjEsMgo=")
+    b'a,b\\n1,2\\n'
+    """
+    name, compression = csv_compression(filename or "")
+    if name.lower().endswith(".zip"):
+        with open_archive(contents) as archive:
+            members = zip_csv_members(archive)
+            if not members:
+                return b""
+            with archive.open(members[0]) as f:
+                return f.read(size)
+    if isinstance(contents, str) and compression is None:
+        start = contents.index(",") + 1
+        end = start + -(-size // 3) * 4
+        return base64.b64decode(contents[start:end])[:size]
+    sample = _open_source(contents, compression).read(size)
+    if not isinstance(contents, str):
+        contents.seek(0)
+    return sample
+
+
+def _sniff_encoding(sample: bytes) -> str:
+    if sample.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    if sample.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return "utf-16"
+    # Décodage incrémental : un caractère coupé à la fin de l'échantillon n'est
+    # pas une erreur.
+    for encoding in ("utf-8", "cp1252"):
+        try:
+            codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    return "latin-1"
+
+
+def _looks_numeric(field: str, decimal: str) -> bool:
+    field = field.strip()
+    if decimal != ".":
+        field = field.replace(decimal, ".", 1)
+    try:
+        float(field)
+        return True
+    except ValueError:
+        return False
+
+
+def sniff_csv(sample: bytes, max_lines: int = 200) -> dict:
+    """
+    Devine les options de lecture d'un CSV à partir de ses premiers octets : encodage,
+    séparateur de colonnes, caractère décimal et ligne d'en-tête.
+    - Encodage : marque d'ordre des octets (BOM), sinon UTF-8 s'il est valide, sinon
+      Windows-1252 (fichiers enregistrés par Excel), sinon Latin-1.
+    - Séparateur : celui qui découpe le plus de lignes avec le même nombre de champs
+      (au moins deux), les guillemets étant respectés.
+    - Caractère décimal : la virgule si les nombres du type 3,14 sont plus nombreux que
+      les nombres du type 3.14 (jamais quand la virgule sépare les colonnes).
+    - En-tête : la première ligne qui a le nombre de champs habituel (les lignes de
+      titre au-dessus sont sautées), -1 si cette ligne est entièrement numérique comme
+      les suivantes.
+    Parameters:
+    - sample (bytes): Le début du fichier (voir read_sample).
+    - max_lines (int): Le nombre maximal de lignes examinées.
+    Returns:
+    - dict: {"sep", "decimal", "header", "encoding"}, les valeurs par défaut de la
+      fenêtre d'import pour ce qui n'a pas pu être deviné.
+    Exemple d'utilisation:
+    >>> sniff_csv(b"nom;prix\\npomme;1,5\\npoire;2,25\\n")
+    {'sep': ';', 'decimal': ',', 'header': 0, 'encoding': 'utf-8'}
+    """
+    encoding = _sniff_encoding(sample)
+    result = {"sep": ",", "decimal": ".", "header": 0, "encoding": encoding}
+    text = codecs.getincrementaldecoder(encoding)(errors="replace").decode(sample)
+    lines = text.splitlines()
+    if len(lines) > 1 and not text.endswith(("\n", "\r")):
+        # Dernière ligne probablement coupée par la taille de l'échantillon.
+        lines = lines[:-1]
+    lines = [line for line in lines[:max_lines] if line.strip()]
+    if not lines:
+        return result
+
+    best = None
+    for sep in CSV_SEPARATORS:
+        rows = list(csv.reader(lines, delimiter=sep))
+        counts = collections.Counter(len(r) for r in rows)
+        width, count = max(counts.items(), key=lambda item: (item[1], item[0]))
+        if width < 2:
+            continue
+        score = (count / len(rows), width)
+        if best is None or score > best[0]:
+            best = (score, sep, rows, width)
+    if best is None:
+        return result
+    _, sep, rows, width = best
+    result["sep"] = sep
+
+    header = next(i for i, r in enumerate(rows) if len(r) == width)
+    data = [r for r in rows[header + 1 :] if len(r) == width]
+    if sep != ",":
+        fields = [f.strip() for r in data for f in r]
+        comma = sum(1 for f in fields if re.fullmatch(r"[+-]?\d*,\d+", f))
+        point = sum(1 for f in fields if re.fullmatch(r"[+-]?\d*\.\d+", f))
+        if comma > point:
+            result["decimal"] = ","
+    decimal = result["decimal"]
+    if header == 0 and data and all(_looks_numeric(f, decimal) for f in rows[0]):
+        header = -1
+    result["header"] = header
+    return result
+
+
 def import_csv(
-    contents: str, filename: str, sep: str, decimal: str, header: int
+    contents: str,
+    filename: str,
+    sep: str,
+    decimal: str,
+    header: int,
+    engine: str = "c",
+    encoding: str = "utf-8",
 ) -> dict:
     """
     Importe un fichier CSV à partir d'une chaîne de caractères encodée en base64.
@@ -74,7 +528,10 @@ def import_csv(
     - filename (str): Le nom du fichier CSV.
     - sep (str): Le séparateur de colonnes utilisé dans le fichier CSV.
     - decimal (str): Le séparateur décimal utilisé dans le fichier CSV.
-    - header (int): La ligne d'en-tête à utiliser pour le DataFrame.
+    - header (int): La ligne d'en-tête à utiliser pour le DataFrame (-1 : pas d'en-tête).
+    - engine (str): Le moteur de lecture : "c" (pandas), "pyarrow" (multithread) ou
+      "auto". PyArrow revient au moteur C s'il ne sait pas lire le fichier.
+    - encoding (str): L'encodage du texte (voir sniff_csv).
     Returns:
     - dict: Un dictionnaire contenant le nom du fichier et le DataFrame pandas, ou une erreur.
     Exemple d'utilisation:
@@ -89,29 +546,381 @@ def import_csv(
     """
     try:
         _, content_string = contents.split(",", 1)
-        decoded = base64.b64decode(content_string).decode("utf-8")
+        decoded = base64.b64decode(content_string)
+        if header is not None and header < 0:
+            header = None
         if filename.endswith(".csv"):
+            if engine in ("auto", "pyarrow"):
+                try:
+                    df = pd.read_csv(
+                        io.BytesIO(decoded),
+                        sep=sep,
+                        decimal=decimal,
+                        header=header,
+                        encoding=encoding,
+                        engine="pyarrow",
+                    )
+                    return {"filename": filename, "panda_data": df}
+                except Exception:
+                    pass
             df = pd.read_csv(
-                io.StringIO(decoded), sep=sep, decimal=decimal, header=header
+                io.StringIO(decoded.decode(encoding)),
+                sep=sep,
+                decimal=decimal,
+                header=header,
             )
             return {"filename": filename, "panda_data": df}
     except Exception as e:
         return {"filename": filename, "panda_data": None, "error": str(e)}
 
 
+class _Base64Reader(io.RawIOBase):
+    """
+    Lecture en flux des octets d'une data URL base64 : le base64 est décodé par blocs
+    à mesure que pandas lit, sans construire ni le fichier décodé ni sa version texte.
+    """
+
+    def __init__(self, contents: str, block: int = 1024**2):
+        self.contents = contents
+        self.pos = contents.index(",") + 1
+        self.block = block - block % 4
+        self.pending = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if not self.pending:
+            if self.pos >= len(self.contents):
+                return 0
+            end = self.pos + self.block
+            self.pending = base64.b64decode(self.contents[self.pos : end])
+            self.pos = end
+        n = min(len(buffer), len(self.pending))
+        buffer[:n] = self.pending[:n]
+        self.pending = self.pending[n:]
+        return n
+
+
+def _arrow_csv_batches(
+    open_stream, sep: str, decimal: str, header: int, block: int, encoding="utf-8"
+):
+    """
+    Lit un CSV par blocs avec le lecteur multithread de PyArrow. Les dates ne sont pas
+    interprétées, pour garder le même texte qu'avec le moteur C de pandas.
+    Parameters:
+    - open_stream (callable): Renvoie le fichier à lire, ouvert depuis le début.
+    - sep (str): Le séparateur de colonnes (un seul caractère).
+    - decimal (str): Le séparateur décimal.
+    - header (int): La ligne d'en-tête (négative ou None : pas d'en-tête).
+    - block (int): La taille des blocs lus, en octets.
+    - encoding (str): L'encodage du texte, transcodé en UTF-8 au fil de la lecture.
+    Returns:
+    - generator: Des pa.RecordBatch.
+    Raises:
+    - ValueError, pa.ArrowInvalid: Si PyArrow ne sait pas lire le fichier (séparateur
+      de plusieurs caractères, colonnes en double, type qui change en cours de fichier).
+    """
+    has_header = header is not None and header >= 0
+    read_options = pa_csv.ReadOptions(
+        skip_rows=header if has_header else 0,
+        autogenerate_column_names=not has_header,
+        block_size=block,
+        use_threads=True,
+        encoding=encoding,
+    )
+    parse_options = pa_csv.ParseOptions(delimiter=sep)
+    column_types = {}
+    while True:
+        convert_options = pa_csv.ConvertOptions(
+            decimal_point=decimal,
+            strings_can_be_null=True,
+            column_types=column_types,
+        )
+        reader = pa_csv.open_csv(
+            open_stream(),
+            read_options=read_options,
+            parse_options=parse_options,
+            convert_options=convert_options,
+        )
+        names = reader.schema.names
+        if len(set(names)) != len(names):
+            raise ValueError("Colonnes en double : lues par le moteur C de pandas.")
+        temporal = {
+            f.name: pa.string()
+            for f in reader.schema
+            if pa.types.is_temporal(f.type) and f.name not in column_types
+        }
+        if not temporal:
+            break
+        column_types = {**column_types, **temporal}
+    yield from reader
+
+
+def select_rows(frames, start: int = 0, stop: int | None = None, step: int = 1):
+    """
+    Ne garde, dans un tableau lu par morceaux, que les lignes start, start + step,
+    start + 2 * step... situées avant stop (indices à partir de 0). La lecture du
+    fichier s'arrête dès que la ligne stop est atteinte.
+    Parameters:
+    - frames (iterable): Les morceaux du tableau (DataFrames ou pa.RecordBatch).
+    - start (int): L'indice de la première ligne gardée.
+    - stop (int | None): L'indice de fin (exclu), None pour aller jusqu'au bout.
+    - step (int): Une ligne gardée toutes les step lignes.
+    Returns:
+    - generator: Les morceaux réduits aux lignes gardées.
+    Exemple d'utilisation:
+    >>> reader = pd.read_csv("gros.csv", chunksize=100_000)
+    >>> store.write_stream("file_123", select_rows(reader, 1000, 2000, step=10))
+    """
+    offset = 0
+    for frame in frames:
+        if stop is not None and offset >= stop:
+            break
+        n = frame.num_rows if isinstance(frame, pa.RecordBatch) else len(frame)
+        first = max(start, offset)
+        first += -(first - start) % step
+        rows = range(first - offset, n if stop is None else min(stop - offset, n), step)
+        offset += n
+        if isinstance(frame, pa.RecordBatch):
+            yield frame.take(pa.array(rows, type=pa.int64()))
+        else:
+            yield frame.iloc[rows.start : rows.stop : step]
+
+
+def preview_csv(
+    contents,
+    filename: str,
+    sep: str,
+    decimal: str,
+    header: int,
+    encoding: str = "utf-8",
+    nrows: int = 10,
+) -> dict:
+    """
+    Lit seulement les premières lignes d'un CSV (compressé ou dans une archive .zip)
+    pour vérifier les options de lecture avant l'import complet : le reste du
+    fichier n'est ni décodé ni lu.
+    Parameters:
+    - contents (str | BinaryIO): Le contenu du fichier encodé en base64, ou le
+      fichier reçu par la route d'envoi direct, ouvert en binaire.
+    - filename (str): Le nom du fichier.
+    - sep (str): Le séparateur de colonnes.
+    - decimal (str): Le séparateur décimal.
+    - header (int): La ligne d'en-tête (-1 : pas d'en-tête).
+    - encoding (str): L'encodage du texte.
+    - nrows (int): Le nombre de lignes lues.
+    Returns:
+    - dict: Un dictionnaire contenant le nom du fichier et le DataFrame des premières
+      lignes, ou une erreur.
+    Exemple d'utilisation:
+    >>> preview_csv(contents, "gros.csv", ";", ",", 0)["panda_data"].shape
+    (10, 12)
+    """
+    name, compression = csv_compression(filename)
+    archive = None
+    try:
+        if name.lower().endswith(".zip"):
+            archive = open_archive(contents)
+            members = zip_csv_members(archive)
+            if not members:
+                raise ValueError("Aucun fichier CSV dans l'archive.")
+            stream = archive.open(members[0])
+        else:
+            stream = _open_source(contents, compression)
+        df = pd.read_csv(
+            stream,
+            sep=sep,
+            decimal=decimal,
+            header=None if header is not None and header < 0 else header,
+            encoding=encoding,
+            nrows=nrows,
+        )
+        return {"filename": filename, "panda_data": df}
+    except Exception as e:
+        return {"filename": filename, "panda_data": None, "error": str(e)}
+    finally:
+        if archive is not None:
+            archive.close()
+        if not isinstance(contents, str):
+            contents.seek(0)
+
+
+def import_csv_stream(
+    contents: str,
+    filename: str,
+    file_id: str,
+    sep: str,
+    decimal: str,
+    header: int,
+    session_id: str | None = None,
+    transform=None,
+    progress=None,
+    chunk_rows: int = 100_000,
+    engine: str = "auto",
+    encoding: str = "utf-8",
+    row_start: int = 0,
+    row_stop: int | None = None,
+    row_step: int = 1,
+) -> dict:
+    """
+    Importe un fichier CSV par morceaux, directement dans le stockage colonnaire.
+    Le base64 est décodé (et un fichier .csv.gz, .csv.zst ou .csv.bz2 décompressé)
+    au fil de la lecture et chaque morceau de chunk_rows lignes est écrit sur le
+    disque avant de lire le suivant : la mémoire reste bornée même pour des fichiers
+    de plusieurs Go (voir DatasetStore.write_stream).
+    Avec le moteur PyArrow, les blocs sont découpés et convertis sur plusieurs cœurs
+    et passent au stockage en Arrow, sans DataFrame intermédiaire. Si PyArrow ne sait
+    pas lire le fichier, l'import recommence avec le moteur C de pandas.
+    Parameters:
+    - contents (str | BinaryIO): Le contenu du fichier CSV encodé en base64, ou le
+      fichier reçu par la route d'envoi direct, ouvert en binaire.
+    - filename (str): Le nom du fichier CSV, éventuellement compressé (.csv.gz...).
+    - file_id (str): L'identifiant du jeu de données à écrire.
+    - sep (str): Le séparateur de colonnes utilisé dans le fichier CSV.
+    - decimal (str): Le séparateur décimal utilisé dans le fichier CSV.
+    - header (int): La ligne d'en-tête à utiliser pour le DataFrame (-1 : pas d'en-tête).
+    - session_id (str | None): La session à laquelle rattacher le fichier.
+    - transform (callable | None): Optimisation appliquée à chaque colonne complète.
+    - progress (callable | None): Appelée avec le nombre de lignes lues.
+    - chunk_rows (int): Le nombre de lignes lues à la fois (moteur C ; PyArrow lit
+      des blocs de même taille en octets, estimée à 100 octets par ligne).
+    - engine (str): "auto" ou "pyarrow" (PyArrow, puis pandas en secours) ou "c".
+    - encoding (str): L'encodage du texte (voir sniff_csv).
+    - row_start, row_stop, row_step (int): N'importe que les lignes de row_start à
+      row_stop (exclue), une sur row_step (voir select_rows). Par défaut, tout.
+    Returns:
+    - dict: Un dictionnaire contenant le nom du fichier, le nombre de lignes et le
+      moteur utilisé, ou une erreur.
+    Exemple d'utilisation:
+    >>> contents = "data:text/csv;base64,SGVsbG8sV29ybGQKMSwyLDMKNCw1LDY="
+    >>> import_csv_stream(contents, "example.csv", "file_123", ",", ".", 0)
+    {'filename': 'example.csv', 'nrows': 2, 'engine': 'pyarrow'}
+    """
+
+    name, compression = csv_compression(filename)
+
+    def open_stream():
+        return _open_source(contents, compression)
+
+    try:
+        if not name.lower().endswith(".csv"):
+            raise ValueError("Le fichier n'est pas un CSV.")
+        if engine not in CSV_ENGINES:
+            raise ValueError(f"Moteur de lecture inconnu : {engine!r}")
+        if engine != "c" and len(sep) == 1:
+            try:
+                batches = _arrow_csv_batches(
+                    open_stream,
+                    sep,
+                    decimal,
+                    header,
+                    block=chunk_rows * 100,
+                    encoding=encoding,
+                )
+                nrows = store.write_stream(
+                    file_id,
+                    select_rows(batches, row_start, row_stop, row_step),
+                    session_id,
+                    transform=transform,
+                    progress=progress,
+                )
+                return {"filename": filename, "nrows": nrows, "engine": "pyarrow"}
+            except QuotaError:
+                raise
+            except (ValueError, pa.ArrowException):
+                pass
+        with pd.read_csv(
+            open_stream(),
+            sep=sep,
+            decimal=decimal,
+            header=None if header is not None and header < 0 else header,
+            chunksize=chunk_rows,
+            encoding=encoding,
+        ) as reader:
+            nrows = store.write_stream(
+                file_id,
+                select_rows(reader, row_start, row_stop, row_step),
+                session_id,
+                transform=transform,
+                progress=progress,
+            )
+        return {"filename": filename, "nrows": nrows, "engine": "c"}
+    except Exception as e:
+        return {"filename": filename, "nrows": 0, "error": str(e)}
+
+
+def excel_engine() -> str | None:
+    """
+    Renvoie le moteur de lecture Excel le plus rapide disponible.
+    Le moteur calamine (paquet python-calamine, écrit en Rust) lit .xlsx et .xls
+    plusieurs fois plus vite qu'openpyxl. Sans lui, pandas choisit openpyxl pour les
+    .xlsx (en lecture seule, ligne par ligne) et xlrd pour les .xls.
+    Returns:
+    - str | None: "calamine", ou None pour le moteur par défaut de pandas.
+    """
+    return "calamine" if importlib.util.find_spec("python_calamine") else None
+
+
+def _excel_source(contents):
+    if isinstance(contents, str):
+        _, content_string = contents.split(",", 1)
+        return io.BytesIO(base64.b64decode(content_string))
+    contents.seek(0)
+    return contents
+
+
+def excel_sheet_names(contents, filename: str) -> list:
+    """
+    Liste les feuilles d'un classeur Excel sans lire leurs cellules.
+    Pour un .xlsx, seule la table des feuilles (xl/workbook.xml) est lue dans
+    l'archive ; un .xls est ouvert par le moteur de lecture.
+    Parameters:
+    - contents (str | BinaryIO): Le contenu du fichier Excel encodé en base64, ou le
+      fichier reçu par la route d'envoi direct, ouvert en binaire.
+    - filename (str): Le nom du fichier Excel.
+    Returns:
+    - list: Les noms des feuilles, dans l'ordre du classeur.
+    Exemple d'utilisation:
+    >>> excel_sheet_names(contents, "example.xlsx")
+    ['Ventes', 'Clients']
+    """
+    source = _excel_source(contents)
+    try:
+        if filename.lower().endswith(".xlsx"):
+            with zipfile.ZipFile(source) as archive:
+                with archive.open("xl/workbook.xml") as f:
+                    return [
+                        element.get("name")
+                        for _, element in ElementTree.iterparse(f)
+                        if element.tag.rpartition("}")[2] == "sheet"
+                    ]
+        with pd.ExcelFile(source, engine=excel_engine()) as book:
+            return list(book.sheet_names)
+    finally:
+        if source is contents:
+            contents.seek(0)
+
+
 def import_excel(
     contents: str, filename: str, sheet_name, header=0, decimal="."
 ) -> dict:
     """
-    Importe un fichier Excel à partir d'une chaîne de caractères encodée en base64.
+    Importe une ou plusieurs feuilles d'un fichier Excel. Le classeur n'est ouvert
+    qu'une fois pour toutes les feuilles demandées, avec le moteur le plus rapide
+    disponible (voir excel_engine), et une feuille absente est signalée avant toute
+    lecture de cellules.
     Parameters:
-    - contents (str): Le contenu du fichier Excel encodé en base64.
+    - contents (str | BinaryIO): Le contenu du fichier Excel encodé en base64, ou le
+      fichier reçu par la route d'envoi direct, ouvert en binaire.
     - filename (str): Le nom du fichier Excel.
-    - sheet_name (str): Le nom de la feuille à importer.
+    - sheet_name (str | int | list): Le nom ou l'index de la feuille à importer, ou
+      une liste de feuilles.
     - header (int): La ligne d'en-tête à utiliser pour le DataFrame.
     - decimal (str): Le séparateur décimal utilisé dans le fichier Excel.
     Returns:
-    - dict: Un dictionnaire contenant le nom du fichier et le DataFrame pandas, ou une erreur.
+    - dict: Un dictionnaire contenant le nom du fichier et le DataFrame pandas (un
+      dictionnaire {feuille: DataFrame} si sheet_name est une liste), ou une erreur.
     Exemple d'utilisation:
     >>> contents = "data:application/vnd.openxmlformats-officedocument.spreadsheetml.sheet;base64,..."
     >>> filename = "example.xlsx"
@@ -121,25 +930,31 @@ def import_excel(
     >>> result = import_excel(contents, filename, sheet_name, header, decimal)
     >>> print(result['filename'])  # Output: example.xlsx
     >>> print(result['panda_data'])  # Output: DataFrame with the Excel data
+    >>> import_excel(contents, filename, ["Ventes", "Clients"])["panda_data"].keys()
+    dict_keys(['Ventes', 'Clients'])
     """
     try:
-        _, content_string = contents.split(",", 1)
-        decoded = base64.b64decode(content_string)
-        if filename.endswith(".xlsx") or filename.endswith(".xls"):
-            df = pd.read_excel(
-                io.BytesIO(decoded),
-                sheet_name=sheet_name,
-                header=header,
-                decimal=decimal,
-            )
+        if filename.lower().endswith((".xlsx", ".xls")):
+            sheets = sheet_name if isinstance(sheet_name, list) else [sheet_name]
+            with pd.ExcelFile(_excel_source(contents), engine=excel_engine()) as book:
+                for sheet in sheets:
+                    if isinstance(sheet, int):
+                        found = -len(book.sheet_names) <= sheet < len(book.sheet_names)
+                    else:
+                        found = sheet in book.sheet_names
+                    if not found:
+                        return {
+                            "filename": filename,
+                            "panda_data": None,
+                            "error": f"Feuille Excel introuvable : '{sheet}'",
+                        }
+                frames = {
+                    sheet: book.parse(sheet, header=header, decimal=decimal)
+                    for sheet in sheets
+                }
+            df = frames if isinstance(sheet_name, list) else frames[sheet_name]
             return {"filename": filename, "panda_data": df}
     except ValueError as e:
-        if "Worksheet named" in str(e) and "not found" in str(e):
-            return {
-                "filename": filename,
-                "panda_data": None,
-                "error": f"Feuille Excel introuvable : '{sheet_name}'",
-            }
         return {
             "filename": filename,
             "panda_data": None,
@@ -147,8 +962,424 @@ def import_excel(
         }
     except Exception as e:
         return {"filename": filename, "panda_data": None, "error": str(e)}
+    return {
+        "filename": filename,
+        "panda_data": None,
+        "error": "Le fichier n'est pas un fichier Excel.",
+    }
+
+
+COLUMNAR_FORMATS = {
+    ".parquet": "parquet",
+    ".feather": "feather",
+    ".arrow": "feather",
+    ".ipc": "feather",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+}
+
+
+def columnar_format(filename: str) -> str | None:
+    """
+    Renvoie le format d'un fichier Parquet, Feather (Arrow IPC) ou JSON Lines.
+    Parameters:
+    - filename (str): Le nom du fichier.
+    Returns:
+    - str | None: "parquet", "feather" ou "jsonl", None pour un autre fichier.
+    """
+    name = (filename or "").lower()
+    for ext, fmt in COLUMNAR_FORMATS.items():
+        if name.endswith(ext):
+            return fmt
+    return None
+
+
+def import_kind(filename: str) -> str | None:
+    """
+    Renvoie le type d'import d'un fichier, qui choisit le panneau et la lecture.
+    Parameters:
+    - filename (str): Le nom du fichier.
+    Returns:
+    - str | None: "csv", "excel" ou "columnar", None pour un fichier non pris en
+      charge.
+    """
+    if is_csv_file(filename):
+        return "csv"
+    if (filename or "").lower().endswith((".xls", ".xlsx")):
+        return "excel"
+    if columnar_format(filename) is not None:
+        return "columnar"
+    return None
+
+
+def _columnar_source(contents, fmt: str):
+    if isinstance(contents, str):
+        if fmt == "jsonl":
+            return io.BufferedReader(_Base64Reader(contents), buffer_size=1024**2)
+        _, content_string = contents.split(",", 1)
+        return pa.BufferReader(base64.b64decode(content_string))
+    if fmt == "feather" and getattr(contents, "name", None):
+        # Fichier reçu par envoi direct : projeté en mémoire, seules les colonnes
+        # demandées sont lues sur le disque.
+        return pa.memory_map(contents.name)
+    contents.seek(0)
+    return contents
+
+
+def _ipc_reader(source):
+    try:
+        return pa.ipc.open_file(source)
+    except pa.ArrowInvalid:
+        # Format flux (stream) d'Arrow IPC, sans table des lots en fin de fichier.
+        source.seek(0)
+        return pa.ipc.open_stream(source)
+
+
+def _ipc_batches(reader):
+    if isinstance(reader, pa.ipc.RecordBatchFileReader):
+        return (reader.get_batch(i) for i in range(reader.num_record_batches))
+    return iter(reader)
+
+
+def _is_index_column(name: str) -> bool:
+    return re.fullmatch(r"__index_level_\d+__", name) is not None
+
+
+def columnar_columns(contents, filename: str) -> list:
+    """
+    Liste les colonnes d'un fichier Parquet, Feather ou JSON Lines sans lire ses
+    données : schéma du pied de fichier pour Parquet, de l'en-tête pour Feather, et
+    du premier bloc pour JSON Lines.
+    Parameters:
+    - contents (str | BinaryIO): Le contenu du fichier encodé en base64, ou le
+      fichier reçu par la route d'envoi direct, ouvert en binaire.
+    - filename (str): Le nom du fichier.
+    Returns:
+    - list: Les noms des colonnes (hors index enregistré par pandas).
+    Exemple d'utilisation:
+    >>> columnar_columns(contents, "ventes.parquet")
+    ['date', 'magasin', 'montant']
+    """
+    fmt = columnar_format(filename)
+    source = _columnar_source(contents, fmt)
+    if fmt == "parquet":
+        schema = pq.ParquetFile(source).schema_arrow
+    elif fmt == "feather":
+        schema = _ipc_reader(source).schema
+    else:
+        schema = pa_json.open_json(source).schema
+    return [name for name in schema.names if not _is_index_column(name)]
+
+
+def import_columnar_stream(
+    contents,
+    filename: str,
+    file_id: str,
+    columns: list | None = None,
+    session_id: str | None = None,
+    transform=None,
+    progress=None,
+    batch_rows: int = 100_000,
+) -> dict:
+    """
+    Importe un fichier Parquet, Feather (Arrow IPC) ou JSON Lines dans le stockage
+    colonnaire, par lots, en conservant les types du fichier (dates, entiers,
+    catégories...). Seules les colonnes demandées sont lues : les autres colonnes
+    d'un fichier Parquet ne sont pas décompressées, et celles d'un fichier Feather
+    envoyé directement ne sont pas lues sur le disque.
+    Parameters:
+    - contents (str | BinaryIO): Le contenu du fichier encodé en base64, ou le
+      fichier reçu par la route d'envoi direct, ouvert en binaire.
+    - filename (str): Le nom du fichier (.parquet, .feather, .arrow, .ipc, .jsonl, .ndjson).
+    - file_id (str): L'identifiant du jeu de données à écrire.
+    - columns (list | None): Les colonnes à importer, toutes par défaut.
+    - session_id (str | None): La session à laquelle rattacher le fichier.
+    - transform (callable | None): Optimisation appliquée à chaque colonne complète.
+    - progress (callable | None): Appelée avec le nombre de lignes lues.
+    - batch_rows (int): Le nombre de lignes lues à la fois (Parquet ; JSON Lines lit
+      des blocs de même taille en octets, estimée à 100 octets par ligne).
+    Returns:
+    - dict: Un dictionnaire contenant le nom du fichier, le nombre de lignes et le
+      format, ou une erreur.
+    Exemple d'utilisation:
+    >>> import_columnar_stream(contents, "ventes.parquet", "file_123", columns=["montant"])
+    {'filename': 'ventes.parquet', 'nrows': 1000000, 'format': 'parquet'}
+    """
+    try:
+        fmt = columnar_format(filename)
+        if fmt is None:
+            raise ValueError(
+                "Le fichier n'est pas au format Parquet, Feather ou JSON Lines."
+            )
+        available = columnar_columns(contents, filename)
+        missing = [c for c in columns or [] if c not in available]
+        if missing:
+            raise ValueError(f"Colonnes introuvables : {', '.join(map(str, missing))}")
+        columns = list(columns or available)
+
+        source = _columnar_source(contents, fmt)
+        if fmt == "parquet":
+            batches = pq.ParquetFile(source).iter_batches(
+                batch_size=batch_rows, columns=columns
+            )
+        elif fmt == "feather":
+            reader = _ipc_reader(source)
+            batches = (batch.select(columns) for batch in _ipc_batches(reader))
+        else:
+            reader = pa_json.open_json(
+                source, read_options=pa_json.ReadOptions(block_size=batch_rows * 100)
+            )
+            batches = (batch.select(columns) for batch in reader)
+        nrows = store.write_stream(
+            file_id, batches, session_id, transform=transform, progress=progress
+        )
+        return {"filename": filename, "nrows": nrows, "format": fmt}
+    except Exception as e:
+        return {"filename": filename, "nrows": 0, "error": str(e)}
+
+
+def encode_categoricals(
+    df: pd.DataFrame, max_ratio: float = 0.05, sample: int = 10_000
+) -> pd.DataFrame:
+    """
+    Convertit en type category les colonnes de texte qui ont peu de valeurs distinctes.
+    La cardinalité est d'abord estimée sur un échantillon de lignes : les colonnes
+    presque uniques (identifiants, texte libre) sont écartées sans parcours complet.
+    Une colonne est convertie si elle a au plus max_ratio valeurs distinctes par ligne :
+    au-delà, les codes et le dictionnaire des catégories ne sont plus beaucoup plus
+    petits que la colonne d'objets.
+    Parameters:
+    - df (pd.DataFrame): Le DataFrame importé.
+    - max_ratio (float): La part maximale de valeurs distinctes (0.05 = une sur vingt).
+    - sample (int): Le nombre de lignes utilisées pour l'estimation.
+    Returns:
+    - pd.DataFrame: Le DataFrame avec les colonnes converties.
+    Exemple d'utilisation:
+    >>> df = pd.DataFrame({'A': ['a', 'b'] * 50, 'B': [f'id{i}' for i in range(100)]})
+    >>> encode_categoricals(df).dtypes
+    A    category
+    B      object
+    dtype: object
+    """
+    n = len(df)
+    if n == 0:
+        return df
+    converted = {}
+    rng = np.random.default_rng(0)
+    for i, dtype in enumerate(df.dtypes):
+        if not (dtype == object or pd.api.types.is_string_dtype(dtype)):
+            continue
+        col = df.iloc[:, i]
+        if n > sample:
+            sampled = col.iloc[rng.integers(0, n, size=sample)]
+            if sampled.nunique() > max_ratio * sample:
+                continue
+        codes, uniques = pd.factorize(col)
+        if len(uniques) > max_ratio * n:
+            continue
+        if not all(isinstance(u, str) for u in uniques):
+            continue
+        converted[i] = pd.Series(
+            pd.Categorical.from_codes(codes, categories=uniques).reorder_categories(
+                sorted(uniques)
+            ),
+            index=df.index,
+        )
+    if not converted:
+        return df
+    df = df.copy(deep=False)
+    for i, col in converted.items():
+        df.isetitem(i, col)
+    return df
+
+
+class FilteredView:
+    """
+    Vue filtrée d'un DataFrame : positions des lignes gardées, colonnes gardées et
+    colonnes modifiées (valeurs manquantes remplacées, outliers...), sans copier la
+    table de base. Les filtres successifs ne font que réduire le tableau de positions ;
+    le DataFrame n'est construit (materialize) que quand un callback a besoin des lignes.
+    Exemple d'utilisation:
+    >>> view = FilteredView(pd.DataFrame({'A': [1, 2, 3]}))
+    >>> view = filter_comparaison(view, 'A', 1, 'plus grand que')
+    >>> len(view)
+    2
+    >>> view.materialize()
+       A
+    1  2
+    2  3
+    """
+
+    def __init__(
+        self,
+        base: pd.DataFrame,
+        rows: np.ndarray | None = None,
+        columns: list | None = None,
+        overrides: dict | None = None,
+    ):
+        self.base = base
+        self.rows = rows
+        self.columns = list(base.columns) if columns is None else list(columns)
+        self.overrides = overrides or {}
+
+    def __len__(self) -> int:
+        return len(self.base) if self.rows is None else len(self.rows)
+
+    @property
+    def nbytes(self) -> int:
+        """Mémoire propre à la vue (positions et colonnes modifiées), hors table de base."""
+        size = 0 if self.rows is None else self.rows.nbytes
+        return size + sum(
+            int(s.memory_usage(index=False)) for s in self.overrides.values()
+        )
+
+    def detach(self) -> "FilteredView":
+        """
+        Renvoie la vue sans sa table de base (positions et colonnes modifiées
+        seulement), pour la garder en cache sans retenir la table entière.
+        Returns:
+        - FilteredView: La vue détachée, à rattacher par attach avant usage.
+        """
+        return FilteredView(None, self.rows, self.columns, self.overrides)
+
+    def attach(self, base: pd.DataFrame) -> "FilteredView":
+        """
+        Rattache une vue détachée à sa table de base.
+        Parameters:
+        - base (pd.DataFrame): La table de base, dans la version de la vue.
+        Returns:
+        - FilteredView: La vue utilisable.
+        """
+        return FilteredView(base, self.rows, self.columns, self.overrides)
+
+    def column(self, col) -> pd.Series:
+        """
+        Renvoie les valeurs d'une colonne pour les lignes gardées.
+        Parameters:
+        - col (str): Le nom de la colonne.
+        Returns:
+        - pd.Series: La colonne, indexée comme dans la table de base.
+        """
+        if col in self.overrides:
+            return self.overrides[col]
+        if col not in self.columns:
+            raise KeyError(col)
+        series = self.base[col]
+        return series if self.rows is None else series.take(self.rows)
+
+    def select(self, mask) -> "FilteredView":
+        """
+        Garde les lignes pour lesquelles le masque est vrai (NA compte comme faux).
+        Parameters:
+        - mask (pd.Series | np.ndarray): Un booléen par ligne de la vue.
+        Returns:
+        - FilteredView: La nouvelle vue.
+        """
+        if isinstance(mask, pd.Series):
+            mask = mask.to_numpy(dtype=bool, na_value=False)
+        mask = np.asarray(mask, dtype=bool)
+        rows = np.flatnonzero(mask) if self.rows is None else self.rows[mask]
+        overrides = {c: s[mask] for c, s in self.overrides.items()}
+        return FilteredView(self.base, rows, self.columns, overrides)
+
+    def keep(self, columns: list) -> "FilteredView":
+        """
+        Garde uniquement certaines colonnes, dans l'ordre donné.
+        Parameters:
+        - columns (list): Les noms des colonnes.
+        Returns:
+        - FilteredView: La nouvelle vue.
+        Raises:
+        - KeyError: Si une colonne n'existe pas dans la vue.
+        """
+        missing = [c for c in columns if c not in self.columns]
+        if missing:
+            raise KeyError(f"Colonnes absentes : {missing}")
+        overrides = {c: s for c, s in self.overrides.items() if c in columns}
+        return FilteredView(self.base, self.rows, columns, overrides)
+
+    def assign(self, col, values: pd.Series) -> "FilteredView":
+        """
+        Remplace les valeurs d'une colonne pour les lignes gardées.
+        Parameters:
+        - col (str): Le nom de la colonne.
+        - values (pd.Series): Les nouvelles valeurs, une par ligne de la vue.
+        Returns:
+        - FilteredView: La nouvelle vue.
+        """
+        return FilteredView(
+            self.base, self.rows, self.columns, {**self.overrides, col: values}
+        )
+
+    def head(self, n: int) -> pd.DataFrame:
+        """
+        Construit le DataFrame des n premières lignes de la vue (types des colonnes,
+        aperçu).
+        Parameters:
+        - n (int): Le nombre de lignes.
+        Returns:
+        - pd.DataFrame: Le DataFrame des n premières lignes.
+        """
+        rows = np.arange(min(n, len(self.base))) if self.rows is None else self.rows[:n]
+        overrides = {c: s.iloc[:n] for c, s in self.overrides.items()}
+        return FilteredView(self.base, rows, self.columns, overrides).materialize()
+
+    def materialize(self) -> pd.DataFrame:
+        """
+        Construit le DataFrame correspondant à la vue. Seules les lignes et colonnes
+        gardées sont copiées.
+        Returns:
+        - pd.DataFrame: Le DataFrame filtré.
+        """
+        plain = [c for c in self.columns if c not in self.overrides]
+        if self.rows is None and not self.overrides and plain == list(self.base.columns):
+            return self.base.copy(deep=False)
+        df = self.base[plain]
+        if self.rows is not None:
+            df = df.take(self.rows)
+        for col in self.columns:
+            if col in self.overrides:
+                df[col] = self.overrides[col].array
+        if list(df.columns) != self.columns:
+            df = df[self.columns]
+        return df
+
+
+def _view_filter(func):
+    """
+    Permet d'appeler un filtre écrit pour FilteredView avec un DataFrame : la vue est
+    créée puis matérialisée automatiquement.
+    """
+
+    @functools.wraps(func)
+    def wrapper(df, *args, **kwargs):
+        if isinstance(df, FilteredView):
+            return func(df, *args, **kwargs)
+        return func(FilteredView(df), *args, **kwargs).materialize()
+
+    return wrapper
+
+
+def _is_native_text(dtype) -> bool:
+    return isinstance(dtype, pd.StringDtype) and dtype.storage == "pyarrow"
+
+
+def _as_text(values: pd.Series) -> pd.Series:
+    """
+    Renvoie la colonne sous forme de texte pour les filtres de recherche. Les colonnes
+    déjà en chaînes Arrow sont gardées telles quelles : les opérations .str s'exécutent
+    alors dans les noyaux natifs de pyarrow, sans conversion ni objets Python.
+    Parameters:
+    - values (pd.Series): La colonne à comparer.
+    Returns:
+    - pd.Series: La colonne en chaînes.
+    """
+    if _is_native_text(values.dtype):
+        return values
+    return values.astype(str)
 
 
+@_view_filter
 def filter_text(df: pd.DataFrame, col: str, val: str) -> pd.DataFrame:
     """
     Filtre les lignes d'un DataFrame en fonction d'une valeur de texte dans une colonne spécifique.
@@ -165,9 +1396,10 @@ def filter_text(df: pd.DataFrame, col: str, val: str) -> pd.DataFrame:
     1  banana  2
     """
     val = str(val).strip().lower()
-    return df[df[col].astype(str).str.strip().str.lower() == val]
+    return df.select(_as_text(df.column(col)).str.strip().str.lower() == val)
 
 
+@_view_filter
 def filter_in_text(df: pd.DataFrame, col: str, val: str) -> pd.DataFrame:
     """
     Filtre les lignes d'un DataFrame en fonction d'une valeur de texte dans une colonne spécifique.
@@ -184,9 +1416,12 @@ def filter_in_text(df: pd.DataFrame, col: str, val: str) -> pd.DataFrame:
     1  banana split  2
     """
     val = str(val).strip().lower()
-    return df[df[col].astype(str).str.strip().str.lower().str.contains(val)]
+    return df.select(
+        _as_text(df.column(col)).str.strip().str.lower().str.contains(val, regex=False)
+    )
 
 
+@_view_filter
 def filter_comparaison(df: pd.DataFrame, col: str, val: float, x: str) -> pd.DataFrame:
     """
     Filtre les lignes d'un DataFrame en fonction d'une comparaison sur une colonne spécifique.
@@ -205,20 +1440,23 @@ def filter_comparaison(df: pd.DataFrame, col: str, val: float, x: str) -> pd.Dat
     2  3  7
     3  4  8
     """
+    values = df.column(col)
     if x == "plus grand que":
-        return df[df[col] > val]
+        return df.select(values > val)
     elif x == "plus grand ou égal à":
-        return df[df[col] >= val]
+        return df.select(values >= val)
     elif x == "plus petit que":
-        return df[df[col] < val]
+        return df.select(values < val)
     elif x == "plus petit ou égal à":
-        return df[df[col] <= val]
+        return df.select(values <= val)
     elif x == "différent de":
-        return df[df[col] != val]
+        return df.select(values != val)
     elif x == "égal à":
-        return df[df[col] == val]
+        return df.select(values == val)
+    return df
 
 
+@_view_filter
 def filter_types_columns(df, col_type: Literal["text", "numeric", "boolean"]):
     """
     Filtre les colonnes d'un DataFrame en fonction de leur type.
@@ -243,14 +1481,17 @@ def filter_types_columns(df, col_type: Literal["text", "numeric", "boolean"]):
     0     True
     1    False
     """
-    if col_type == "text":
-        return df.select_dtypes(include=["object", "string"])
-    elif col_type == "numeric":
-        return df.select_dtypes(include=["number"])
-    elif col_type == "boolean":
-        return df.select_dtypes(include=["bool"])
+    include = {
+        "text": ["object", "string", "category"],
+        "numeric": ["number"],
+        "boolean": ["bool"],
+    }
+    if col_type not in include:
+        return df
+    return df.keep(list(df.head(0).select_dtypes(include=include[col_type]).columns))
 
 
+@_view_filter
 def filter_keep_columns(df, columns):
     """
     Filtre les colonnes d'un DataFrame pour ne conserver que celles spécifiées.
@@ -268,9 +1509,10 @@ def filter_keep_columns(df, columns):
     """
     if not columns:
         return df
-    return df[columns]
+    return df.keep(columns)
 
 
+@_view_filter
 def filter_na(
     df: pd.DataFrame, col: str, action: Literal["drop", "mean", "median", "zero"]
 ) -> pd.DataFrame:
@@ -295,61 +1537,58 @@ def filter_na(
     3  4.0  8.0
     """
 
-    fake_na_values = {
-        "na",
-        "n/a",
-        "nan",
-        "null",
-        "none",
-        "?",
-        "-",
-        "--",
-        "NA",
-        "N/A",
-        "NAN",
-        "NULL",
-        "None",
-        "",
-        " ",
-    }
-
-    if df[col].dtype == object or pd.api.types.is_string_dtype(df[col]):
-        df[col] = df[col].apply(
-            lambda x: (
-                np.nan
-                if isinstance(x, str) and x.strip().lower() in fake_na_values
-                else x
-            )
-        )
+    values = df.column(col)
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        categories = values.cat.categories
+        fakes = categories[_sentinels(categories)]
+        cleaned = len(fakes) > 0
+        if cleaned:
+            values = values.cat.remove_categories(fakes)
+    else:
+        cleaned = values.dtype == object or pd.api.types.is_string_dtype(values)
+        if cleaned:
+            # Valeurs « manquantes » ("n/a", "null", "?"...) cherchées parmi les
+            # valeurs distinctes, sans parcours Python des lignes. Les colonnes
+            # normalisées à l'import (normalize_columns) n'en contiennent plus.
+            codes, uniques = pd.factorize(values)
+            fake = _sentinels(uniques)
+            if fake.any():
+                values = values.mask(np.isin(codes, np.flatnonzero(fake)))
+    unchanged = df.assign(col, values) if cleaned else df
 
     if action == "drop":
-        return df.dropna(subset=[col])
+        return df.select(values.notna())
 
     elif action == "mean":
-        if pd.api.types.is_numeric_dtype(df[col]):
-            return df.assign(**{col: df[col].fillna(df[col].mean())})
+        if pd.api.types.is_numeric_dtype(values):
+            return df.assign(col, values.fillna(values.mean()))
         else:
-            return df
+            return unchanged
 
     elif action == "median":
-        if pd.api.types.is_numeric_dtype(df[col]):
-            return df.assign(**{col: df[col].fillna(df[col].median())})
+        if pd.api.types.is_numeric_dtype(values):
+            return df.assign(col, values.fillna(values.median()))
         else:
-            return df
+            return unchanged
 
     elif action == "zero":
-        if pd.api.types.is_numeric_dtype(df[col]):
-            return df.assign(**{col: df[col].fillna(0)})
-        elif pd.api.types.is_string_dtype(df[col]):
-            return df.assign(**{col: df[col].fillna("0")})
-        elif pd.api.types.is_bool_dtype(df[col]):
-            return df.assign(**{col: df[col].fillna(False)})
+        if pd.api.types.is_numeric_dtype(values):
+            return df.assign(col, values.fillna(0))
+        elif isinstance(values.dtype, pd.CategoricalDtype):
+            if "0" not in values.cat.categories:
+                values = values.cat.add_categories("0")
+            return df.assign(col, values.fillna("0"))
+        elif pd.api.types.is_string_dtype(values):
+            return df.assign(col, values.fillna("0"))
+        elif pd.api.types.is_bool_dtype(values):
+            return df.assign(col, values.fillna(False))
         else:
-            return df
+            return unchanged
 
-    return df
+    return unchanged
 
 
+@_view_filter
 def filter_outlier(df: pd.DataFrame, col: str, action: str) -> pd.DataFrame:
     """
     Filtre les outliers dans la colonne `col` selon l'action choisie,
@@ -378,35 +1617,32 @@ def filter_outlier(df: pd.DataFrame, col: str, action: str) -> pd.DataFrame:
     4  5  9
 
     """
-    df = df.copy()
-    Q1 = df[col].quantile(0.25)
-    Q3 = df[col].quantile(0.75)
+    values = df.column(col)
+    Q1 = values.quantile(0.25)
+    Q3 = values.quantile(0.75)
     IQR = Q3 - Q1
     lower_bound = Q1 - 1.5 * IQR
     upper_bound = Q3 + 1.5 * IQR
 
-    outliers = (df[col] < lower_bound) | (df[col] > upper_bound)
+    outliers = (values < lower_bound) | (values > upper_bound)
 
     if action == "drop":
-        df = df.loc[~outliers]
+        return df.select(~outliers)
     elif action == "median":
-        median_val = df[col].median()
-        df.loc[outliers, col] = median_val
+        return df.assign(col, values.mask(outliers, values.median()))
     elif action == "winsorize":
-        df.loc[df[col] < lower_bound, col] = lower_bound
-        df.loc[df[col] > upper_bound, col] = upper_bound
-
+        return df.assign(col, values.clip(lower_bound, upper_bound))
     return df
 
 
 def apply_filters(df: pd.DataFrame, filters: dict) -> pd.DataFrame:
     """
-    Applique une série de filtres à un DataFrame.
+    Applique une série de filtres à un DataFrame ou à une vue filtrée.
     Parameters:
-    - df (pd.DataFrame): Le DataFrame à filtrer.
+    - df (pd.DataFrame | FilteredView): Le DataFrame ou la vue à filtrer.
     - filters (dict): Dictionnaire des filtres à appliquer.
     Returns:
-    - pd.DataFrame: DataFrame filtré.
+    - pd.DataFrame | FilteredView: Le résultat filtré, du même type que df.
     Exemple d'utilisation:
     >>> df = pd.DataFrame({'A': ['apple', 'banana', 'cherry'], 'B': [1, 2, 3]})
     >>> filters = {
@@ -418,22 +1654,23 @@ def apply_filters(df: pd.DataFrame, filters: dict) -> pd.DataFrame:
          A     B
     2  cherry  3
     """
+    view = df if isinstance(df, FilteredView) else FilteredView(df)
     for f_id, f in filters.items():
         if f["type"] == "text":
-            df = filter_text(df, f["col"], f["value"])
+            view = filter_text(view, f["col"], f["value"])
         elif f["type"] == "in_text":
-            df = filter_in_text(df, f["col"], f["value"])
+            view = filter_in_text(view, f["col"], f["value"])
         elif f["type"] == "comparaison":
-            df = filter_comparaison(df, f["col"], f["value"], f["operator"])
+            view = filter_comparaison(view, f["col"], f["value"], f["operator"])
         elif f["type"] == "types_columns":
-            df = filter_types_columns(df, f["col_type"])
+            view = filter_types_columns(view, f["col_type"])
         elif f["type"] == "keep_columns":
-            df = filter_keep_columns(df, f["columns"])
+            view = filter_keep_columns(view, f["columns"])
         elif f["type"] == "na":
-            df = filter_na(df, f["col"], f["action"])
+            view = filter_na(view, f["col"], f["action"])
         elif f["type"] == "outlier":
-            df = filter_outlier(df, f["col"], f["action"])
-    return df
+            view = filter_outlier(view, f["col"], f["action"])
+    return view if isinstance(df, FilteredView) else view.materialize()
 
 
 def sort_abc(df: pd.DataFrame, col: str, order: Literal["asc", "desc"]) -> pd.DataFrame:
@@ -476,14 +1713,19 @@ def sort_123(df: pd.DataFrame, col: str, order: Literal["asc", "desc"]) -> pd.Da
     2  2  7
     0  3  5
     """
+    values = df[col]
+    if pd.api.types.is_numeric_dtype(values) or pd.api.types.is_datetime64_any_dtype(
+        values
+    ):
+        # Colonne déjà typée (voir normalize_columns) : triée directement, sans
+        # reconvertir le texte à chaque tri.
+        key = None
+    else:
+        key = lambda x: pd.to_numeric(x, errors="coerce")
     if order == "asc":
-        return df.sort_values(
-            by=col, ascending=True, key=lambda x: pd.to_numeric(x, errors="coerce")
-        )
+        return df.sort_values(by=col, ascending=True, key=key)
     elif order == "desc":
-        return df.sort_values(
-            by=col, ascending=False, key=lambda x: pd.to_numeric(x, errors="coerce")
-        )
+        return df.sort_values(by=col, ascending=False, key=key)
 
 
 def apply_sort(df: pd.DataFrame, sort_info: list) -> pd.DataFrame:
@@ -624,7 +1866,7 @@ def count_qualitative(df: pd.DataFrame) -> int:
     """
     if df.empty:
         return 0
-    return df.select_dtypes(include=["object", "string"]).shape[1]
+    return df.select_dtypes(include=["object", "string", "category"]).shape[1]
 
 
 def nrow(df: pd.DataFrame) -> int:
@@ -801,7 +2043,8 @@ def bar_chart(df: pd.DataFrame, col: str) -> px.bar:
     >>> fig = bar_chart(df, 'A')
     >>> fig.show()
     """
-    counts = df[col].value_counts().reset_index()
+    counts = df[col].value_counts()
+    counts = counts[counts > 0].reset_index()
     counts.columns = [col, "Effectif"]
     fig = px.bar(
         counts,
@@ -940,3 +2183,300 @@ def violin_2col(df: pd.DataFrame, col_x: str, col_y: str) -> px.violin:
         font_color="#FFFFFF",
     )
     return fig
+
+
+_INT_WIDTHS = ("int8", "int16", "int32", "int64")
+
+
+def _smallest_int(lo, hi) -> str:
+    for name in _INT_WIDTHS:
+        info = np.iinfo(name)
+        if info.min <= lo and hi <= info.max:
+            return name
+    return "int64"
+
+
+def _compact_column(col: pd.Series):
+    dtype = col.dtype
+    if pd.api.types.is_bool_dtype(dtype) or not pd.api.types.is_numeric_dtype(dtype):
+        return None
+    if isinstance(dtype, pd.CategoricalDtype):
+        return None
+    if pd.api.types.is_integer_dtype(dtype):
+        values = col.dropna()
+        if values.empty:
+            return None
+        target = _smallest_int(values.min(), values.max())
+        if col.hasnans:
+            target = target.capitalize()
+        return None if target == str(dtype) else col.astype(target)
+    if not pd.api.types.is_float_dtype(dtype):
+        return None
+    values = col.to_numpy(dtype="float64", na_value=np.nan)
+    present = values[~np.isnan(values)]
+    if present.size == 0:
+        return None
+    if (
+        np.isfinite(present).all()
+        and np.abs(present).max() <= 2**53
+        and (present == np.trunc(present)).all()
+    ):
+        # Flottants entiers (souvent des entiers avec valeurs manquantes) :
+        # type entier nullable pour garder les NA sans perdre de précision.
+        target = _smallest_int(present.min(), present.max())
+        if len(present) < len(values):
+            target = target.capitalize()
+        return col.astype(target)
+    if dtype != np.float32:
+        single = values.astype(np.float32)
+        if np.array_equal(single.astype(np.float64), values, equal_nan=True):
+            return pd.Series(single, index=col.index, name=col.name)
+    return None
+
+
+def downcast_numeric(df: pd.DataFrame) -> tuple[pd.DataFrame, list[dict]]:
+    """
+    Réduit les colonnes numériques au type le plus petit qui conserve toutes les valeurs.
+    Les entiers passent à int8/16/32, les flottants qui ne contiennent que des entiers
+    deviennent des entiers nullables (Int8 à Int64) pour garder les valeurs manquantes,
+    les autres flottants passent en float32 seulement si aucune valeur n'est modifiée.
+    Parameters:
+    - df (pd.DataFrame): Le DataFrame importé.
+    Returns:
+    - tuple[pd.DataFrame, list[dict]]: Le DataFrame compacté et, pour chaque colonne
+      convertie, un dictionnaire {"column", "before", "after", "saved"} (types et octets gagnés).
+    Exemple d'utilisation:
+    >>> df = pd.DataFrame({'A': [1, 2, 3], 'B': [1.0, None, 3.0]})
+    >>> compact, report = downcast_numeric(df)
+    >>> compact.dtypes
+    A    int8
+    B    Int8
+    dtype: object
+    """
+    converted = {}
+    report = []
+    for i, name in enumerate(df.columns):
+        col = df.iloc[:, i]
+        new = _compact_column(col)
+        if new is None:
+            continue
+        before = col.memory_usage(index=False, deep=True)
+        after = new.memory_usage(index=False, deep=True)
+        if after >= before:
+            continue
+        converted[i] = new
+        report.append(
+            {
+                "column": name,
+                "before": str(col.dtype),
+                "after": str(new.dtype),
+                "saved": int(before - after),
+            }
+        )
+    if not converted:
+        return df, report
+    df = df.copy(deep=False)
+    for i, col in converted.items():
+        df.isetitem(i, col)
+    return df, report
+
+
+def to_arrow_strings(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convertit les colonnes de texte au type string[pyarrow] (valeurs manquantes pd.NA).
+    Les chaînes sont alors stockées dans des tampons Arrow contigus plutôt qu'en objets
+    Python, et les recherches, tris et nettoyages s'exécutent en code natif. Les colonnes
+    d'objets mélangeant texte et autres types, ainsi que les catégories, sont laissées telles quelles.
+    Parameters:
+    - df (pd.DataFrame): Le DataFrame importé.
+    Returns:
+    - pd.DataFrame: Le DataFrame avec les colonnes de texte converties.
+    Exemple d'utilisation:
+    >>> df = pd.DataFrame({'A': ['a', None, 'c'], 'B': [1, 2, 3]})
+    >>> to_arrow_strings(df).dtypes
+    A    string
+    B     int64
+    dtype: object
+    """
+    converted = {}
+    for i, dtype in enumerate(df.dtypes):
+        if _is_native_text(dtype) and dtype.na_value is pd.NA:
+            continue
+        col = df.iloc[:, i]
+        if dtype == object:
+            if pd.api.types.infer_dtype(col, skipna=True) != "string":
+                continue
+        elif not isinstance(dtype, pd.StringDtype):
+            continue
+        converted[i] = col.astype("string[pyarrow]")
+    if not converted:
+        return df
+    df = df.copy(deep=False)
+    for i, col in converted.items():
+        df.isetitem(i, col)
+    return df
+
+
+NA_SENTINELS = frozenset(
+    {"na", "n/a", "nan", "null", "none", "?", "-", "--", ""}
+)
+DATE_FORMATS = {
+    r"\d{4}-\d{2}-\d{2}(?:[ T]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?)?": "ISO8601",
+    r"\d{2}/\d{2}/\d{4}": "%d/%m/%Y",
+    r"\d{2}/\d{2}/\d{4} \d{2}:\d{2}:\d{2}": "%d/%m/%Y %H:%M:%S",
+}
+
+
+def _sentinels(uniques) -> np.ndarray:
+    # Valeurs distinctes qui signifient « manquant » ("n/a", "null", "?"...), comparées
+    # sans casse ni espaces ; les valeurs qui ne sont pas du texte n'en sont jamais.
+    text = pd.Series(uniques, dtype=object).str.strip().str.lower()
+    return text.isin(NA_SENTINELS).to_numpy(dtype=bool)
+
+
+def _typed_values(values: pd.Series, decimal: str = ".") -> pd.Series | None:
+    # Cellules Excel de types mélangés (nombres, booléens, texte) : seules les
+    # valeurs en texte ont l'accesseur .str, les tests portent sur leur écriture.
+    kind = pd.api.types.infer_dtype(values, skipna=True)
+    if kind == "boolean":
+        return values.astype("boolean")
+    if kind in ("mixed", "mixed-integer") and values.map(type).eq(bool).any():
+        return None
+    numbers = pd.to_numeric(values, errors="coerce")
+    if numbers.notna().all():
+        # Des zéros en tête (codes postaux, identifiants) gardent la colonne en texte.
+        if values.astype(str).str.match(r"[+-]?0\d").any():
+            return None
+        return numbers
+    if kind != "string":
+        return None
+    text = values.str.strip()
+    # Virgule décimale seulement si c'est l'option choisie à l'import : avec la
+    # décimale ".", "1,250" est un séparateur de milliers et reste du texte.
+    if (
+        decimal == ","
+        and text.str.count(",").le(1).all()
+        and not text.str.contains(".", regex=False).any()
+    ):
+        numbers = pd.to_numeric(text.str.replace(",", ".", regex=False), errors="coerce")
+        if numbers.notna().all() and not text.str.match(r"[+-]?0\d", na=False).any():
+            return numbers
+    for pattern, date_format in DATE_FORMATS.items():
+        if text.str.fullmatch(pattern).all():
+            dates = pd.to_datetime(text, format=date_format, errors="coerce")
+            if dates.notna().all():
+                return dates
+    return None
+
+
+def normalize_column(col: pd.Series, decimal: str = ".") -> pd.Series:
+    """
+    Type une colonne de texte importée : les valeurs qui signifient « manquant »
+    ("n/a", "null", "?"...) deviennent NA, puis la colonne est convertie en nombres
+    (décimale "." ou, si c'est l'option d'import, ",") ou en dates (AAAA-MM-JJ, JJ/MM/AAAA) si toutes ses autres
+    valeurs le permettent. Les tests portent sur les valeurs distinctes (pd.factorize),
+    pas sur chaque ligne.
+    Parameters:
+    - col (pd.Series): La colonne à normaliser.
+    - decimal (str): Le séparateur décimal choisi à l'import ("." ou ",").
+    Returns:
+    - pd.Series: La colonne typée, ou la colonne d'origine avec les NA remplacés.
+    Exemple d'utilisation:
+    >>> normalize_column(pd.Series(['1,5', 'n/a', '3']), decimal=",")
+    0    1.5
+    1    NaN
+    2    3.0
+    dtype: float64
+    """
+    codes, uniques = pd.factorize(col)
+    sentinel = _sentinels(uniques)
+    values = pd.Series(uniques, dtype=object)[~sentinel]
+    typed = _typed_values(values, decimal) if len(values) else None
+    if typed is None:
+        if not sentinel.any():
+            return col
+        return col.mask(np.isin(codes, np.flatnonzero(sentinel)))
+    # Les valeurs distinctes typées sont redistribuées sur les lignes ; les NA
+    # (code -1) et les valeurs « manquantes » deviennent NaN ou NaT.
+    typed = typed.reindex(range(len(uniques)))
+    return pd.Series(
+        pd.api.extensions.take(typed.array, codes, allow_fill=True),
+        index=col.index,
+        name=col.name,
+    )
+
+
+def normalize_columns(df: pd.DataFrame, decimal: str = ".") -> pd.DataFrame:
+    """
+    Normalise une fois pour toutes, à l'import, les colonnes de texte d'un DataFrame
+    (voir normalize_column) : les colonnes stockées sont alors typées, et les filtres
+    et tris n'ont plus à reconvertir ni à nettoyer les valeurs à chaque appel.
+    Parameters:
+    - df (pd.DataFrame): Le DataFrame importé.
+    - decimal (str): Le séparateur décimal choisi à l'import ("." ou ",").
+    Returns:
+    - pd.DataFrame: Le DataFrame avec les colonnes de texte normalisées.
+    Exemple d'utilisation:
+    >>> df = pd.DataFrame({'A': ['1', '2', 'null'], 'B': ['2024-01-31', '-', 'x']})
+    >>> normalize_columns(df).dtypes
+    A    float64
+    B     object
+    dtype: object
+    """
+    converted = {}
+    for i, dtype in enumerate(df.dtypes):
+        if not (dtype == object or isinstance(dtype, pd.StringDtype)):
+            continue
+        col = df.iloc[:, i]
+        normalized = normalize_column(col, decimal)
+        if normalized is not col:
+            converted[i] = normalized
+    if not converted:
+        return df
+    df = df.copy(deep=False)
+    for i, col in converted.items():
+        df.isetitem(i, col)
+    return df
+
+
+def apply_schema(df: pd.DataFrame, schema: list) -> pd.DataFrame:
+    """
+    Redonne à un DataFrame reconstruit depuis les lignes JSON d'un tableau (sauvegarde
+    des modifications) les types enregistrés dans le stockage (voir
+    storage.frame_schema) : catégories, entiers et flottants réduits, chaînes Arrow,
+    dates. Les colonnes non modifiées retrouvent ainsi les mêmes chunks. Une colonne
+    dont une valeur modifiée ne se convertit pas garde le type lu.
+    Parameters:
+    - df (pd.DataFrame): Le DataFrame reconstruit.
+    - schema (list): Les colonnes {"name", "dtype", "kind"} de store.metadata.
+    Returns:
+    - pd.DataFrame: Le DataFrame avec les types d'origine.
+    Exemple d'utilisation:
+    >>> df = pd.DataFrame({'A': ['x', 'y'], 'B': [1, 2]})
+    >>> schema = [{'name': 'A', 'dtype': 'category', 'kind': 'category'},
+    ...           {'name': 'B', 'dtype': 'Int8', 'kind': 'numeric'}]
+    >>> apply_schema(df, schema).dtypes
+    A    category
+    B        Int8
+    dtype: object
+    """
+    dtypes = {c["name"]: c["dtype"] for c in schema}
+    converted = {}
+    for i, name in enumerate(df.columns):
+        dtype = dtypes.get(name)
+        col = df.iloc[:, i]
+        if dtype is None or str(col.dtype) == dtype:
+            continue
+        if dtype == "bool" and col.isna().any():
+            # Cellule vidée : un booléen NumPy la lirait comme False.
+            dtype = "boolean"
+        try:
+            converted[i] = col.astype(dtype)
+        except (ValueError, TypeError):
+            continue
+    if not converted:
+        return df
+    df = df.copy(deep=False)
+    for i, col in converted.items():
+        df.isetitem(i, col)
+    return df
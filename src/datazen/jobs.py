@@ -0,0 +1,142 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from datazen.storage import store as default_store
+
+
+class ImportCancelled(BaseException):
+    """
+    Levée dans un import en arrière-plan quand l'utilisateur l'annule. Elle dérive de
+    BaseException (comme asyncio.CancelledError) pour traverser les `except Exception`
+    des fonctions d'import, qui transforment les erreurs de lecture en message.
+    """
+
+
+class ImportJobs:
+    """
+    File d'attente des imports, exécutés en arrière-plan par un pool de threads.
+    Le callback qui reçoit le clic sur « Importer » soumet l'import et rend la main
+    aussitôt : la requête ne bloque plus le worker Gunicorn jusqu'à la fin de la
+    lecture, ni ne risque son délai d'expiration. La lecture (PyArrow, décompression,
+    écriture des colonnes) libère le GIL, et le worker continue de servir les autres
+    utilisateurs.
+    L'état de chaque import est publié dans le backend du stockage (disque ou Redis),
+    comme l'avancement de write_stream : n'importe quel worker peut l'afficher ou
+    demander son annulation.
+    États : "queued", "running" (avec "rows"), "done" (avec "result"), "error" (avec
+    "error") et "cancelled".
+    Le nombre d'imports simultanés par processus est IMPORT_WORKERS ; les suivants
+    attendent leur tour.
+    Exemple d'utilisation:
+    >>> jobs = ImportJobs()
+    >>> jobs.init_app(app.server, store)
+    >>> jobs.submit("a1b2c3", lambda progress: {"rows": 10})
+    >>> jobs.status("a1b2c3")
+    {'state': 'done', 'result': {'rows': 10}, 'updated': ...}
+    """
+
+    def __init__(self, app=None, store=None):
+        self.store = store or default_store
+        self._executor = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app, store)
+
+    def init_app(self, app, store=None):
+        """
+        Enregistre la file d'attente sur l'application Flask.
+        Parameters:
+        - app (Flask): L'application Flask (app.server pour Dash).
+        - store (DatasetStore | None): Le stockage où l'état des imports est publié.
+        Returns:
+        - None
+        """
+        if store is not None:
+            self.store = store
+        app.extensions["datazen_jobs"] = self
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        # Créé au premier import, dans le processus qui le reçoit (après le fork
+        # des workers Gunicorn).
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.store.config["IMPORT_WORKERS"],
+                    thread_name_prefix="datazen-import",
+                )
+            return self._executor
+
+    def _publish(self, job_id: str, state: str, **fields):
+        self.store.set_progress(
+            job_id, {"state": state, **fields, "updated": time.time()}
+        )
+
+    def submit(self, job_id: str, func):
+        """
+        Met un import en file d'attente.
+        Parameters:
+        - job_id (str): L'identifiant de l'import.
+        - func (callable): L'import, appelé avec une fonction progress(rows) à passer
+          à la lecture ; il renvoie un dictionnaire sérialisable en JSON.
+        Returns:
+        - concurrent.futures.Future: L'exécution de l'import.
+        """
+        self._publish(job_id, "queued")
+        return self.executor.submit(self._run, job_id, func)
+
+    def _run(self, job_id: str, func):
+        def progress(rows):
+            if self.cancelled(job_id):
+                raise ImportCancelled()
+            self._publish(job_id, "running", rows=rows)
+
+        try:
+            progress(0)
+            result = func(progress)
+        except ImportCancelled:
+            self._publish(job_id, "cancelled")
+        except Exception as e:
+            self._publish(job_id, "error", error=str(e))
+        else:
+            self._publish(job_id, "done", result=result)
+        finally:
+            self.store.set_progress(f"{job_id}_cancel", None)
+
+    def status(self, job_id: str) -> dict | None:
+        """
+        Renvoie l'état d'un import.
+        Parameters:
+        - job_id (str): L'identifiant de l'import.
+        Returns:
+        - dict | None: L'état ({"state", ...}), None si l'import est inconnu.
+        """
+        return self.store.progress(job_id)
+
+    def cancel(self, job_id: str):
+        """
+        Demande l'annulation d'un import : il s'arrête au prochain morceau lu, ou
+        avant de commencer s'il est encore en file d'attente.
+        Parameters:
+        - job_id (str): L'identifiant de l'import.
+        Returns:
+        - None
+        """
+        self.store.set_progress(f"{job_id}_cancel", {"cancel": True})
+
+    def cancelled(self, job_id: str) -> bool:
+        return self.store.progress(f"{job_id}_cancel") is not None
+
+    def forget(self, job_id: str):
+        """
+        Efface l'état d'un import terminé, une fois son résultat affiché.
+        Parameters:
+        - job_id (str): L'identifiant de l'import.
+        Returns:
+        - None
+        """
+        self.store.set_progress(job_id, None)
+
+
+jobs = ImportJobs()
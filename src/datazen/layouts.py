@@ -16,6 +16,7 @@ menudata = html.Div(
             id="left_menu_header",
         ),
         html.Div([], id="datastorage"),
+        html.Div([], id="import-report"),
         html.Div(
             children=[
                 html.I(className="fa-solid fa-arrow-up-from-bracket"),
@@ -24,6 +25,10 @@ menudata = html.Div(
             id="importbutton",
         ),
         dcc.Store(id="stored-data"),
+        dcc.Interval(id="session-heartbeat", interval=10 * 60_000, n_intervals=0),
+        dcc.Interval(
+            id="watch-interval", interval=30_000, n_intervals=0, disabled=True
+        ),
     ],
     id="menudata",
 )
@@ -39,10 +44,22 @@ importpopup = html.Div(
             children=html.Button("Sélectionner un fichier", id="importbutton_popup"),
             multiple=False,
         ),
+        html.Button(
+            "Gros fichier : envoi direct",
+            id="direct-upload-button",
+            title="Envoi par morceaux, repris en cas de coupure (assets/direct_upload.js)",
+        ),
+        dcc.Store(id="server-upload"),
         html.Div(children=[], id="import-error-feedback"),
         dcc.Interval(
             id="import-error-interval", interval=5000, n_intervals=0, disabled=True
         ),
+        html.Div(children=[], id="import-progress"),
+        html.Button("Annuler l'import", id="import-cancel-button"),
+        dcc.Interval(
+            id="import-progress-interval", interval=500, n_intervals=0, disabled=True
+        ),
+        dcc.Store(id="import-job"),
         html.Div(
             children=[
                 html.Div(children=[], id="title_importpopup"),
@@ -57,6 +74,7 @@ importpopup = html.Div(
                                         {"label": "Virgule (,)", "value": ","},
                                         {"label": "Point-virgule (;)", "value": ";"},
                                         {"label": "Tabulation (\\t)", "value": "\t"},
+                                        {"label": "Barre verticale (|)", "value": "|"},
                                     ],
                                     value=",",
                                     clearable=False,
@@ -71,6 +89,20 @@ importpopup = html.Div(
                                     value=".",
                                     clearable=False,
                                 ),
+                                html.Label("Moteur de lecture :"),
+                                dcc.Dropdown(
+                                    id="import-engine",
+                                    options=[
+                                        {"label": "Automatique", "value": "auto"},
+                                        {
+                                            "label": "PyArrow (multithread)",
+                                            "value": "pyarrow",
+                                        },
+                                        {"label": "Pandas (C)", "value": "c"},
+                                    ],
+                                    value="auto",
+                                    clearable=False,
+                                ),
                             ],
                             className="import-column",
                         ),
@@ -84,12 +116,79 @@ importpopup = html.Div(
                                     min=-1,
                                     step=1,
                                 ),
+                                html.Label("Encodage :"),
+                                dcc.Dropdown(
+                                    id="import-encoding",
+                                    options=[
+                                        {"label": "UTF-8", "value": "utf-8"},
+                                        {"label": "UTF-8 avec BOM", "value": "utf-8-sig"},
+                                        {"label": "UTF-16", "value": "utf-16"},
+                                        {"label": "Windows-1252", "value": "cp1252"},
+                                        {"label": "Latin-1", "value": "latin-1"},
+                                    ],
+                                    value="utf-8",
+                                    clearable=False,
+                                ),
+                                html.Label("Optimisation mémoire :"),
+                                dcc.Checklist(
+                                    id="import-optimize",
+                                    options=[
+                                        {
+                                            "label": "Types et NA détectés",
+                                            "value": "normalize",
+                                        },
+                                        {
+                                            "label": "Texte répétitif en catégories",
+                                            "value": "category",
+                                        },
+                                        {
+                                            "label": "Numérique compact",
+                                            "value": "compact",
+                                        },
+                                        {
+                                            "label": "Texte en chaînes Arrow",
+                                            "value": "arrow_strings",
+                                        },
+                                    ],
+                                    value=["normalize", "category"],
+                                    className="import-optimize",
+                                ),
                             ],
                             className="import-column",
                         ),
                     ],
                     className="import-options-container",
                 ),
+                html.Div(
+                    children=[
+                        html.Label("Lignes à importer : de"),
+                        dcc.Input(
+                            id="import-row-start",
+                            type="number",
+                            min=1,
+                            step=1,
+                            placeholder="1",
+                        ),
+                        html.Label("à"),
+                        dcc.Input(
+                            id="import-row-stop",
+                            type="number",
+                            min=1,
+                            step=1,
+                            placeholder="fin",
+                        ),
+                        html.Label("une ligne sur"),
+                        dcc.Input(
+                            id="import-row-step",
+                            type="number",
+                            min=1,
+                            step=1,
+                            value=1,
+                        ),
+                    ],
+                    className="import-rows",
+                ),
+                html.Div(id="import-preview"),
                 html.Button(
                     "Importer",
                     className="import-validate-button",
@@ -106,12 +205,13 @@ importpopup = html.Div(
                     children=[
                         html.Div(
                             children=[
-                                html.Label("Nom ou index de la feuille :"),
-                                dcc.Input(
+                                html.Label("Feuilles à importer :"),
+                                dcc.Dropdown(
                                     id="import-sheetname",
-                                    type="text",
-                                    placeholder='ex : "Feuille1" ou 0',
-                                    value="0",
+                                    options=[],
+                                    value=[],
+                                    multi=True,
+                                    placeholder="Première feuille",
                                 ),
                                 html.Label("Caractère décimal :"),
                                 dcc.Dropdown(
@@ -136,6 +236,30 @@ importpopup = html.Div(
                                     min=-1,
                                     step=1,
                                 ),
+                                html.Label("Optimisation mémoire :"),
+                                dcc.Checklist(
+                                    id="import-optimize-excel",
+                                    options=[
+                                        {
+                                            "label": "Types et NA détectés",
+                                            "value": "normalize",
+                                        },
+                                        {
+                                            "label": "Texte répétitif en catégories",
+                                            "value": "category",
+                                        },
+                                        {
+                                            "label": "Numérique compact",
+                                            "value": "compact",
+                                        },
+                                        {
+                                            "label": "Texte en chaînes Arrow",
+                                            "value": "arrow_strings",
+                                        },
+                                    ],
+                                    value=["normalize", "category"],
+                                    className="import-optimize",
+                                ),
                             ],
                             className="import-column",
                         ),
@@ -151,6 +275,65 @@ importpopup = html.Div(
             ],
             id="importpopup_content_excel",
         ),
+        html.Div(
+            children=[
+                html.Div(children=[], id="title_importpopup-columnar"),
+                html.Div(
+                    children=[
+                        html.Div(
+                            children=[
+                                html.Label("Colonnes à importer :"),
+                                dcc.Dropdown(
+                                    id="import-columns",
+                                    options=[],
+                                    value=[],
+                                    multi=True,
+                                    placeholder="Toutes les colonnes",
+                                ),
+                            ],
+                            className="import-column",
+                        ),
+                        html.Div(
+                            children=[
+                                html.Label("Optimisation mémoire :"),
+                                dcc.Checklist(
+                                    id="import-optimize-columnar",
+                                    options=[
+                                        {
+                                            "label": "Types et NA détectés",
+                                            "value": "normalize",
+                                        },
+                                        {
+                                            "label": "Texte répétitif en catégories",
+                                            "value": "category",
+                                        },
+                                        {
+                                            "label": "Numérique compact",
+                                            "value": "compact",
+                                        },
+                                        {
+                                            "label": "Texte en chaînes Arrow",
+                                            "value": "arrow_strings",
+                                        },
+                                    ],
+                                    value=["normalize", "category"],
+                                    className="import-optimize",
+                                ),
+                            ],
+                            className="import-column",
+                        ),
+                    ],
+                    className="import-options-container",
+                ),
+                html.Button(
+                    "Importer",
+                    className="import-validate-button",
+                    id="import-validate-button-columnar",
+                ),
+                html.Div(id="import-feedback-columnar"),
+            ],
+            id="importpopup_content_columnar",
+        ),
     ],
     id="importpopup",
 )
@@ -245,6 +428,9 @@ table_container = html.Div(
         html.Div(
             children=[html.I(className="fa-solid fa-file-export")], id="exportbutton"
         ),
+        html.Div(
+            children=[html.I(className="fa-solid fa-rotate-left")], id="undobutton"
+        ),
         html.Button(
             html.I(className="fa-solid fa-arrow-left"), id="rezize_table_button"
         ),
@@ -0,0 +1,1693 @@
+import hashlib
+import json
+import os
+import pickle
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+DEFAULT_CONFIG = {
+    "STORE_DIR": "flask_cache",
+    "FORMAT": "arrow",
+    "COMPRESSION": "none",
+    "COMPRESSION_LEVEL": None,
+    "MEMORY_CACHE_BYTES": 512 * 1024**2,
+    "FILTER_CACHE_BYTES": 256 * 1024**2,
+    "MAX_BYTES": 20 * 1024**3,
+    "SESSION_QUOTA_BYTES": 2 * 1024**3,
+    "SESSION_TTL": 24 * 3600,
+    "ORPHAN_GRACE": 3600,
+    "SWEEP_INTERVAL": 600,
+    "CHUNK_GRACE": 300,
+    "MAX_VERSIONS": 5,
+    "UPLOAD_HASH": "auto",
+    "UPLOAD_DIR": None,
+    "UPLOAD_MAX_BYTES": 20 * 1024**3,
+    "IMPORT_WORKERS": 2,
+    "WATCH_DIR": None,
+    "WATCH_INTERVAL": 60,
+    "WATCH_WORKERS": 2,
+    "BACKEND": "filesystem",
+    "REDIS_URL": "redis://localhost:6379/0",
+    "REDIS_PREFIX": "datazen:",
+    "REDIS_MAX_CONNECTIONS": 32,
+}
+
+CODECS = ("none", "lz4", "zstd")
+VALID_ID = re.compile(r"[A-Za-z0-9_-]+")
+
+
+class QuotaError(ValueError):
+    """Levée quand une écriture dépasserait le quota de stockage de la session."""
+
+
+def frame_nbytes(df: pd.DataFrame, sample: int = 1000) -> int:
+    """
+    Estime la mémoire occupée par un DataFrame sans parcourir toutes les chaînes Python.
+    Les colonnes de type object sont mesurées sur un échantillon puis extrapolées.
+    Parameters:
+    - df (pd.DataFrame): Le DataFrame à mesurer.
+    - sample (int): Le nombre de lignes mesurées pour les colonnes object.
+    Returns:
+    - int: La taille estimée en octets.
+    Exemple d'utilisation:
+    >>> frame_nbytes(pd.DataFrame({'A': [1, 2, 3]}))
+    156
+    """
+    total = int(df.memory_usage(index=True, deep=False).sum())
+    n = len(df)
+    if n == 0:
+        return total
+    for i in range(df.shape[1]):
+        col = df.iloc[:, i]
+        if col.dtype == object:
+            head = col.iloc[:sample]
+            extra = head.memory_usage(index=False, deep=True) - head.memory_usage(
+                index=False
+            )
+            total += int(extra * n / len(head))
+    return total
+
+
+class FrameCache:
+    """
+    Cache LRU en mémoire des DataFrames lus, propre à chaque processus, borné en octets.
+    Les entrées sont indexées par (file_id, version, ...) : une nouvelle version écrite
+    par un autre worker n'est donc jamais servie périmée.
+    Avec single_version=True, ajouter une entrée retire les autres entrées du même
+    fichier ; sinon plusieurs entrées par fichier coexistent (résultats de filtres).
+    Exemple d'utilisation:
+    >>> frames = FrameCache(max_bytes=256 * 1024**2)
+    >>> frames.put(("file_123", 1), df)
+    >>> frames.get(("file_123", 1))
+    """
+
+    def __init__(self, max_bytes: int, single_version: bool = True):
+        self.max_bytes = max_bytes
+        self.single_version = single_version
+        self.nbytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> tuple | None:
+        """
+        Renvoie l'entrée associée à la clé et la marque comme la plus récente.
+        Parameters:
+        - key (tuple): La clé (file_id, version).
+        Returns:
+        - tuple | None: Le couple (DataFrame, complet), ou None si la clé est absente.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0], entry[1]
+
+    def put(
+        self, key: tuple, df: pd.DataFrame, complete: bool = True, nbytes: int | None = None
+    ):
+        """
+        Ajoute un DataFrame au cache en évinçant les entrées les moins récentes
+        jusqu'à respecter le budget mémoire. Les versions précédentes du même
+        fichier sont retirées (single_version).
+        Parameters:
+        - key (tuple): La clé (file_id, version).
+        - df (pd.DataFrame): Le DataFrame à conserver.
+        - complete (bool): False si le DataFrame ne contient qu'une partie des colonnes.
+        - nbytes (int | None): La taille de l'entrée, estimée par frame_nbytes si None.
+        Returns:
+        - None
+        """
+        size = frame_nbytes(df) if nbytes is None else nbytes
+        with self._lock:
+            if self.single_version:
+                self._discard(key[0])
+            elif key in self._entries:
+                self.nbytes -= self._entries.pop(key)[2]
+            if size > self.max_bytes:
+                return
+            while self._entries and self.nbytes + size > self.max_bytes:
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self.nbytes -= evicted_size
+            self._entries[key] = (df, complete, size)
+            self.nbytes += size
+
+    def discard(self, file_id: str):
+        """
+        Retire toutes les versions d'un fichier du cache.
+        Parameters:
+        - file_id (str): L'identifiant du fichier.
+        Returns:
+        - None
+        """
+        with self._lock:
+            self._discard(file_id)
+
+    def _discard(self, file_id: str):
+        for key in [k for k in self._entries if k[0] == file_id]:
+            self.nbytes -= self._entries.pop(key)[2]
+
+    def clear(self):
+        """
+        Vide le cache.
+        Returns:
+        - None
+        """
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+
+def _project(df: pd.DataFrame, columns: list) -> pd.DataFrame:
+    wanted = set(columns)
+    return df[[c for c in df.columns if c in wanted]]
+
+
+def column_kind(dtype) -> str:
+    """
+    Classe un dtype pandas dans une des familles utilisées par les menus de l'interface.
+    Parameters:
+    - dtype: Le dtype de la colonne.
+    Returns:
+    - str: "bool", "numeric", "datetime", "category", "text" ou "other".
+    Exemple d'utilisation:
+    >>> column_kind(pd.Series([1.5]).dtype)
+    'numeric'
+    """
+    if pd.api.types.is_bool_dtype(dtype):
+        return "bool"
+    if pd.api.types.is_numeric_dtype(dtype):
+        return "numeric"
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return "datetime"
+    if isinstance(dtype, pd.CategoricalDtype):
+        return "category"
+    if pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype):
+        return "text"
+    return "other"
+
+
+def frame_schema(df: pd.DataFrame) -> list:
+    """
+    Décrit les colonnes d'un DataFrame : nom, dtype et famille (voir column_kind).
+    Parameters:
+    - df (pd.DataFrame): Le DataFrame à décrire.
+    Returns:
+    - list: Des dictionnaires {"name", "dtype", "kind"}, dans l'ordre des colonnes.
+    """
+    return [
+        {
+            "name": name.item() if hasattr(name, "item") else name,
+            "dtype": str(dtype),
+            "kind": column_kind(dtype),
+        }
+        for name, dtype in zip(df.columns, df.dtypes)
+    ]
+
+
+def _manifest_chunks(manifest: dict) -> dict:
+    chunks = {}
+    for v in manifest["versions"]:
+        if "pickle" in v:
+            chunks[v["pickle"]] = v["bytes"]
+        for c in v.get("columns", []):
+            chunks[c["chunk"]] = c["bytes"]
+    return chunks
+
+
+def _frame_table(frame) -> pa.Table:
+    if isinstance(frame, pa.RecordBatch):
+        return pa.Table.from_batches([frame])
+    if isinstance(frame, pa.Table):
+        return frame
+    try:
+        return pa.Table.from_pandas(frame, preserve_index=False)
+    except (ValueError, TypeError, pa.ArrowException):
+        # Colonne d'objets mixtes (texte et nombres) : conservée en texte.
+        mixed = {c: str for c, t in frame.dtypes.items() if t == object}
+        return pa.Table.from_pandas(frame.astype(mixed), preserve_index=False)
+
+
+class _ColumnSpool:
+    """
+    Colonnes d'un tableau reçu par morceaux, écrites au fil de l'eau dans des fichiers
+    Arrow temporaires (un par colonne et par type rencontré) pour borner la mémoire.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.segments = []
+        self.writers = []
+        self.nbytes = 0
+
+    def append(self, table: pa.Table):
+        if not self.segments:
+            self.segments = [[] for _ in range(table.num_columns)]
+            self.writers = [None] * table.num_columns
+        for i, column in enumerate(table.columns):
+            segments = self.segments[i]
+            if not segments or segments[-1][0] != column.type:
+                # Type différent de celui des morceaux précédents (entiers puis
+                # flottants...) : nouveau fichier, les types sont unifiés à la fin.
+                if self.writers[i] is not None:
+                    self.writers[i].close()
+                path = os.path.join(self.directory, f"{i}_{len(segments)}.arrow")
+                self.writers[i] = pa.ipc.new_file(
+                    path, pa.schema([("data", column.type)])
+                )
+                segments.append((column.type, path))
+            for chunk in column.chunks:
+                self.writers[i].write_batch(pa.record_batch([chunk], names=["data"]))
+            self.nbytes += column.nbytes
+
+    def close(self):
+        for writer in self.writers:
+            if writer is not None:
+                writer.close()
+        self.writers = [None] * len(self.writers)
+
+    def column(self, i: int) -> pa.ChunkedArray:
+        parts = [
+            pa.ipc.open_file(pa.memory_map(path)).read_all().column(0)
+            for _, path in self.segments[i]
+        ]
+        if len({p.type for p in parts}) > 1:
+            try:
+                target = pa.unify_schemas(
+                    [pa.schema([("data", p.type)]) for p in parts],
+                    promote_options="permissive",
+                ).field(0).type
+                parts = [p.cast(target) for p in parts]
+            except pa.ArrowException:
+                parts = [p.cast(pa.large_string()) for p in parts]
+        return pa.chunked_array(
+            [c for p in parts for c in p.chunks], type=parts[0].type
+        )
+
+
+class FileSystemBackend:
+    """
+    Conserve les manifestes, les chunks et les sessions dans un répertoire local
+    (STORE_DIR). Les chunks sont lus par projection en mémoire (mmap), sans copie.
+    Exemple d'utilisation:
+    >>> backend = FileSystemBackend({"STORE_DIR": "flask_cache"})
+    >>> backend.get_manifests(["file_123"])
+    """
+
+    def __init__(self, config: dict):
+        self.config = config
+        self._locks = {}
+        os.makedirs(config["STORE_DIR"], exist_ok=True)
+
+    def _manifest_path(self, file_id: str) -> str:
+        if not VALID_ID.fullmatch(file_id):
+            raise ValueError(f"Identifiant de fichier invalide : {file_id!r}")
+        return os.path.join(self.config["STORE_DIR"], f"{file_id}.json")
+
+    def _chunk_path(self, chunk: str) -> str:
+        return os.path.join(self.config["STORE_DIR"], "chunks", chunk)
+
+    def _session_path(self, session_id: str) -> str:
+        if not VALID_ID.fullmatch(session_id):
+            raise ValueError(f"Identifiant de session invalide : {session_id!r}")
+        return os.path.join(self.config["STORE_DIR"], "sessions", f"{session_id}.json")
+
+    def _progress_path(self, job_id: str) -> str:
+        if not VALID_ID.fullmatch(job_id):
+            raise ValueError(f"Identifiant d'import invalide : {job_id!r}")
+        return os.path.join(self.config["STORE_DIR"], "progress", f"{job_id}.json")
+
+    def _record_path(self, name: str) -> str:
+        if not VALID_ID.fullmatch(name):
+            raise ValueError(f"Nom d'enregistrement invalide : {name!r}")
+        return os.path.join(self.config["STORE_DIR"], "records", f"{name}.json")
+
+    def _lock_path(self, name: str) -> str:
+        if not VALID_ID.fullmatch(name):
+            raise ValueError(f"Nom de verrou invalide : {name!r}")
+        return os.path.join(self.config["STORE_DIR"], "locks", f"{name}.lock")
+
+    def _atomic_write(self, path: str, write):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        os.close(fd)
+        try:
+            write(tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _write_bytes(self, path: str, data):
+        def write(p):
+            with open(p, "wb") as f:
+                f.write(data)
+
+        self._atomic_write(path, write)
+
+    def _read_json(self, path: str) -> dict | None:
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def get_manifests(self, file_ids: list) -> list:
+        """
+        Lit les manifestes de plusieurs jeux de données.
+        Parameters:
+        - file_ids (list): Les identifiants des jeux de données.
+        Returns:
+        - list: Les manifestes, None pour les identifiants inconnus.
+        """
+        return [self._read_json(self._manifest_path(f)) for f in file_ids]
+
+    def put_chunks(self, chunks: dict):
+        """
+        Écrit les chunks absents. Les chunks déjà présents ne sont pas réécrits, seule
+        leur date est rafraîchie.
+        Parameters:
+        - chunks (dict): Le contenu des chunks, par nom.
+        Returns:
+        - None
+        """
+        for name, data in chunks.items():
+            chunk_path = self._chunk_path(name)
+            if os.path.exists(chunk_path):
+                os.utime(chunk_path)
+            else:
+                self._write_bytes(chunk_path, data)
+
+    def set_manifest(self, file_id: str, manifest: dict, chunks: dict):
+        """
+        Écrit les chunks absents puis le manifeste d'un jeu de données.
+        Parameters:
+        - file_id (str): L'identifiant du jeu de données.
+        - manifest (dict): Le manifeste à écrire.
+        - chunks (dict): Le contenu des chunks utilisés, par nom.
+        Returns:
+        - None
+        """
+        path = self._manifest_path(file_id)
+        self.put_chunks(chunks)
+        self._write_bytes(path, json.dumps(manifest).encode("utf-8"))
+
+    def delete_manifest(self, file_id: str):
+        """
+        Supprime le manifeste d'un jeu de données.
+        Parameters:
+        - file_id (str): L'identifiant du jeu de données.
+        Returns:
+        - None
+        """
+        path = self._manifest_path(file_id)
+        if os.path.exists(path):
+            os.remove(path)
+
+    def touch(self, file_id: str):
+        """
+        Enregistre la date de dernière lecture d'un jeu de données (atime du manifeste).
+        Parameters:
+        - file_id (str): L'identifiant du jeu de données.
+        Returns:
+        - None
+        """
+        path = self._manifest_path(file_id)
+        try:
+            os.utime(path, ns=(time.time_ns(), os.stat(path).st_mtime_ns))
+        except OSError:
+            pass
+
+    def manifests(self):
+        """
+        Parcourt les manifestes présents.
+        Returns:
+        - generator: Des tuples (file_id, manifeste, dernier accès, dernière écriture).
+        """
+        for entry in os.scandir(self.config["STORE_DIR"]):
+            file_id, _, ext = entry.name.rpartition(".")
+            if ext != "json" or not VALID_ID.fullmatch(file_id):
+                continue
+            manifest = self._read_json(entry.path)
+            if manifest is None:
+                continue
+            try:
+                st = entry.stat()
+            except FileNotFoundError:
+                continue
+            yield file_id, manifest, max(st.st_atime, st.st_mtime), st.st_mtime
+
+    def load_chunks(self, names: list) -> list:
+        """
+        Ouvre des chunks par projection en mémoire.
+        Parameters:
+        - names (list): Les noms des chunks.
+        Returns:
+        - list: Des pa.Buffer, None pour les chunks absents.
+        """
+        buffers = []
+        for name in names:
+            try:
+                buffers.append(pa.memory_map(self._chunk_path(name), "r").read_buffer())
+            except FileNotFoundError:
+                buffers.append(None)
+        return buffers
+
+    def usage(self) -> int:
+        """
+        Renvoie l'espace occupé par les chunks.
+        Returns:
+        - int: La taille totale en octets.
+        """
+        chunks_dir = self._chunk_path("")
+        if not os.path.isdir(chunks_dir):
+            return 0
+        total = 0
+        for entry in os.scandir(chunks_dir):
+            try:
+                total += entry.stat().st_size
+            except FileNotFoundError:
+                continue
+        return total
+
+    def collect_chunks(
+        self, referenced: set, grace: float, candidates: set | None = None
+    ) -> list:
+        """
+        Supprime les chunks non référencés écrits il y a plus de `grace` secondes.
+        Parameters:
+        - referenced (set): Les noms des chunks utilisés par un manifeste.
+        - grace (float): Le délai de grâce en secondes.
+        - candidates (set | None): Les seuls chunks à examiner (tous par défaut).
+        Returns:
+        - list: Les noms des chunks supprimés.
+        """
+        chunks_dir = self._chunk_path("")
+        if not os.path.isdir(chunks_dir):
+            return []
+        if candidates is None:
+            names = [entry.name for entry in os.scandir(chunks_dir)]
+        else:
+            names = sorted(candidates)
+        now = time.time()
+        removed = []
+        for name in names:
+            if name in referenced or name.endswith(".tmp"):
+                continue
+            path = self._chunk_path(name)
+            try:
+                if grace and now - os.stat(path).st_mtime < grace:
+                    continue
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            removed.append(name)
+        return removed
+
+    def get_session(self, session_id: str) -> list:
+        """
+        Renvoie les jeux de données référencés par une session.
+        Parameters:
+        - session_id (str): L'identifiant de la session.
+        Returns:
+        - list: Les identifiants des jeux de données.
+        """
+        session = self._read_json(self._session_path(session_id))
+        return session.get("files", []) if session else []
+
+    def set_session(self, session_id: str, file_ids: list):
+        """
+        Enregistre les jeux de données d'une session et prolonge sa durée de vie.
+        Parameters:
+        - session_id (str): L'identifiant de la session.
+        - file_ids (list): Les identifiants des jeux de données.
+        Returns:
+        - None
+        """
+        data = json.dumps({"files": list(file_ids)}).encode("utf-8")
+        self._write_bytes(self._session_path(session_id), data)
+
+    def touch_session(self, session_id: str):
+        """
+        Prolonge la durée de vie d'une session sans modifier ses jeux de données.
+        Parameters:
+        - session_id (str): L'identifiant de la session.
+        Returns:
+        - None
+        """
+        try:
+            os.utime(self._session_path(session_id))
+        except FileNotFoundError:
+            pass
+
+    def get_progress(self, job_id: str) -> dict | None:
+        """
+        Lit l'avancement d'un import en cours.
+        Parameters:
+        - job_id (str): L'identifiant de l'import.
+        Returns:
+        - dict | None: L'avancement, None si l'import est inconnu ou terminé.
+        """
+        return self._read_json(self._progress_path(job_id))
+
+    def set_progress(self, job_id: str, progress: dict | None):
+        """
+        Enregistre l'avancement d'un import, visible par tous les workers.
+        Parameters:
+        - job_id (str): L'identifiant de l'import.
+        - progress (dict | None): L'avancement, None pour l'effacer.
+        Returns:
+        - None
+        """
+        path = self._progress_path(job_id)
+        if progress is None:
+            if os.path.exists(path):
+                os.remove(path)
+            return
+        self._write_bytes(path, json.dumps(progress).encode("utf-8"))
+
+    def expire_progress(self) -> list:
+        """
+        Supprime les avancements d'import (et demandes d'annulation) plus vieux que
+        SESSION_TTL : ceux d'un onglet fermé avant la fin de l'import ne sont jamais
+        effacés par l'application. Redis les fait expirer seul.
+        Returns:
+        - list: Les identifiants supprimés.
+        """
+        progress_dir = os.path.join(self.config["STORE_DIR"], "progress")
+        ttl = self.config["SESSION_TTL"]
+        if ttl is None or not os.path.isdir(progress_dir):
+            return []
+        now = time.time()
+        removed = []
+        for entry in os.scandir(progress_dir):
+            job_id, _, ext = entry.name.rpartition(".")
+            if ext != "json":
+                continue
+            try:
+                if now - entry.stat().st_mtime > ttl:
+                    os.remove(entry.path)
+                    removed.append(job_id)
+            except FileNotFoundError:
+                continue
+        return removed
+
+    def get_record(self, name: str) -> dict | None:
+        """
+        Lit un enregistrement partagé, conservé sans limite de durée.
+        Parameters:
+        - name (str): Le nom de l'enregistrement.
+        Returns:
+        - dict | None: L'enregistrement, None s'il n'existe pas.
+        """
+        return self._read_json(self._record_path(name))
+
+    def set_record(self, name: str, value: dict | None):
+        """
+        Enregistre un enregistrement partagé, visible par tous les workers.
+        Parameters:
+        - name (str): Le nom de l'enregistrement.
+        - value (dict | None): La valeur, None pour l'effacer.
+        Returns:
+        - None
+        """
+        path = self._record_path(name)
+        if value is None:
+            if os.path.exists(path):
+                os.remove(path)
+            return
+        self._write_bytes(path, json.dumps(value).encode("utf-8"))
+
+    def acquire_lock(self, name: str, owner: str, ttl: float) -> bool:
+        """
+        Prend un verrou exclusif entre les processus de la machine (flock), gardé
+        jusqu'à la fin du processus : il est libéré par le système si le processus
+        s'arrête, sans délai d'expiration.
+        Parameters:
+        - name (str): Le nom du verrou.
+        - owner (str): Le détenteur (inutilisé : le verrou appartient au processus).
+        - ttl (float): Inutilisé (voir RedisBackend.acquire_lock).
+        Returns:
+        - bool: True si ce processus détient le verrou.
+        """
+        if name in self._locks:
+            return True
+        try:
+            import fcntl
+        except ImportError:
+            # Sans flock (Windows), un seul processus sert l'application.
+            return True
+        path = self._lock_path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd = os.open(path, os.O_CREAT | os.O_RDWR)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        self._locks[name] = fd
+        return True
+
+    def live_sessions(self) -> dict:
+        """
+        Supprime les sessions expirées (SESSION_TTL) et renvoie les autres.
+        Returns:
+        - dict: Les jeux de données référencés, par session.
+        """
+        sessions_dir = os.path.join(self.config["STORE_DIR"], "sessions")
+        if not os.path.isdir(sessions_dir):
+            return {}
+        ttl = self.config["SESSION_TTL"]
+        now = time.time()
+        sessions = {}
+        for entry in os.scandir(sessions_dir):
+            session_id, _, ext = entry.name.rpartition(".")
+            if ext != "json":
+                continue
+            try:
+                if ttl is not None and now - entry.stat().st_mtime > ttl:
+                    os.remove(entry.path)
+                    continue
+            except FileNotFoundError:
+                continue
+            sessions[session_id] = self.get_session(session_id)
+        return sessions
+
+
+class RedisBackend:
+    """
+    Conserve les manifestes, les chunks et les sessions dans un serveur Redis (ou
+    compatible : Valkey, KeyDB, Dragonfly), partagé entre plusieurs machines.
+    Les connexions viennent d'un pool (REDIS_MAX_CONNECTIONS) et les lectures de
+    plusieurs clés sont regroupées en pipeline : un merge lit les manifestes des deux
+    tables en un aller-retour, puis toutes leurs colonnes en un second.
+    Les sessions expirent côté serveur (EXPIRE). Pour borner la mémoire, configurer
+    maxmemory avec une politique LRU sur le serveur : un jeu dont un chunk a été
+    évincé est considéré comme absent.
+    Exemple d'utilisation:
+    >>> backend = RedisBackend({"REDIS_URL": "redis://localhost:6379/0", ...})
+    >>> backend.get_manifests(["file_123", "file_456"])
+    """
+
+    def __init__(self, config: dict):
+        try:
+            import redis
+        except ImportError as e:
+            raise ImportError(
+                "Le backend redis nécessite le paquet redis : pip install redis"
+            ) from e
+        self.config = config
+        self.prefix = config["REDIS_PREFIX"]
+        self.pool = redis.ConnectionPool.from_url(
+            config["REDIS_URL"], max_connections=config["REDIS_MAX_CONNECTIONS"]
+        )
+        self.client = redis.Redis(connection_pool=self.pool)
+
+    def _key(self, kind: str, name: str) -> str:
+        checked = ("manifest", "session", "progress", "record", "lock")
+        if kind in checked and not VALID_ID.fullmatch(name):
+            raise ValueError(f"Identifiant invalide : {name!r}")
+        return f"{self.prefix}{kind}:{name}"
+
+    def _scan(self, kind: str) -> list:
+        start = len(self.prefix) + len(kind) + 1
+        return [
+            key.decode()[start:]
+            for key in self.client.scan_iter(match=f"{self.prefix}{kind}:*", count=1000)
+        ]
+
+    def get_manifests(self, file_ids: list) -> list:
+        if not file_ids:
+            return []
+        values = self.client.mget([self._key("manifest", f) for f in file_ids])
+        return [json.loads(v) if v is not None else None for v in values]
+
+    def _queue_chunks(self, chunks: dict):
+        names = list(chunks)
+        pipe = self.client.pipeline(transaction=False)
+        for name in names:
+            pipe.exists(self._key("chunk", name))
+        present = pipe.execute()
+
+        now = time.time()
+        pipe = self.client.pipeline(transaction=False)
+        for name, exists in zip(names, present):
+            if not exists:
+                pipe.set(self._key("chunk", name), bytes(chunks[name]))
+        if names:
+            pipe.hset(
+                f"{self.prefix}chunks", mapping={name: now for name in names}
+            )
+        return pipe
+
+    def put_chunks(self, chunks: dict):
+        if chunks:
+            self._queue_chunks(chunks).execute()
+
+    def set_manifest(self, file_id: str, manifest: dict, chunks: dict):
+        pipe = self._queue_chunks(chunks)
+        pipe.set(self._key("manifest", file_id), json.dumps(manifest))
+        pipe.execute()
+
+    def delete_manifest(self, file_id: str):
+        pipe = self.client.pipeline(transaction=False)
+        pipe.delete(self._key("manifest", file_id))
+        pipe.hdel(f"{self.prefix}access", file_id)
+        pipe.execute()
+
+    def touch(self, file_id: str):
+        self.client.hset(f"{self.prefix}access", file_id, time.time())
+
+    def manifests(self):
+        file_ids = self._scan("manifest")
+        access = {
+            k.decode(): float(v)
+            for k, v in self.client.hgetall(f"{self.prefix}access").items()
+        }
+        for file_id, manifest in zip(file_ids, self.get_manifests(file_ids)):
+            if manifest is None:
+                continue
+            written = manifest.get("updated", 0)
+            yield file_id, manifest, max(access.get(file_id, 0), written), written
+
+    def load_chunks(self, names: list) -> list:
+        if not names:
+            return []
+        values = self.client.mget([self._key("chunk", n) for n in names])
+        return [pa.py_buffer(v) if v is not None else None for v in values]
+
+    def usage(self) -> int:
+        names = [k.decode() for k in self.client.hkeys(f"{self.prefix}chunks")]
+        pipe = self.client.pipeline(transaction=False)
+        for name in names:
+            pipe.strlen(self._key("chunk", name))
+        return sum(pipe.execute())
+
+    def collect_chunks(
+        self, referenced: set, grace: float, candidates: set | None = None
+    ) -> list:
+        now = time.time()
+        removed = [
+            name
+            for name, written in (
+                (k.decode(), float(v))
+                for k, v in self.client.hgetall(f"{self.prefix}chunks").items()
+            )
+            if name not in referenced
+            and (candidates is None or name in candidates)
+            and (not grace or now - written >= grace)
+        ]
+        if removed:
+            pipe = self.client.pipeline(transaction=False)
+            pipe.delete(*[self._key("chunk", n) for n in removed])
+            pipe.hdel(f"{self.prefix}chunks", *removed)
+            pipe.execute()
+        return removed
+
+    def get_session(self, session_id: str) -> list:
+        value = self.client.get(self._key("session", session_id))
+        return json.loads(value)["files"] if value is not None else []
+
+    def set_session(self, session_id: str, file_ids: list):
+        self.client.set(
+            self._key("session", session_id),
+            json.dumps({"files": list(file_ids)}),
+            ex=self.config["SESSION_TTL"],
+        )
+
+    def touch_session(self, session_id: str):
+        ttl = self.config["SESSION_TTL"]
+        if ttl is not None:
+            self.client.expire(self._key("session", session_id), ttl)
+
+    def expire_progress(self) -> list:
+        return []
+
+    def get_progress(self, job_id: str) -> dict | None:
+        value = self.client.get(self._key("progress", job_id))
+        return json.loads(value) if value is not None else None
+
+    def set_progress(self, job_id: str, progress: dict | None):
+        key = self._key("progress", job_id)
+        if progress is None:
+            self.client.delete(key)
+        else:
+            self.client.set(key, json.dumps(progress), ex=self.config["SESSION_TTL"])
+
+    def get_record(self, name: str) -> dict | None:
+        value = self.client.get(self._key("record", name))
+        return json.loads(value) if value is not None else None
+
+    def set_record(self, name: str, value: dict | None):
+        key = self._key("record", name)
+        if value is None:
+            self.client.delete(key)
+        else:
+            self.client.set(key, json.dumps(value))
+
+    def acquire_lock(self, name: str, owner: str, ttl: float) -> bool:
+        # Verrou partagé entre les machines : pris s'il est libre (SET NX), renouvelé
+        # par son détenteur, libéré par expiration si le détenteur s'arrête.
+        key = self._key("lock", name)
+        ttl = max(int(ttl), 1)
+        if self.client.set(key, owner, nx=True, ex=ttl):
+            return True
+        if self.client.get(key) == owner.encode():
+            self.client.set(key, owner, ex=ttl)
+            return True
+        return False
+
+    def live_sessions(self) -> dict:
+        session_ids = self._scan("session")
+        if not session_ids:
+            return {}
+        values = self.client.mget([self._key("session", s) for s in session_ids])
+        return {
+            s: json.loads(v)["files"]
+            for s, v in zip(session_ids, values)
+            if v is not None
+        }
+
+
+BACKENDS = {"filesystem": FileSystemBackend, "redis": RedisBackend}
+
+
+class DatasetStore:
+    """
+    Stockage colonnaire et versionné des DataFrames importés.
+    Chaque colonne est écrite dans son propre chunk nommé d'après le hash de son
+    contenu, au format Arrow IPC (FORMAT="arrow", par défaut) ou Parquet
+    (FORMAT="parquet"). Un manifeste JSON par jeu de données liste ses versions et les
+    chunks de chacune : une sauvegarde, une concaténation ou un merge ne réécrit que
+    les colonnes modifiées, les autres sont partagées, et une sauvegarde peut être
+    annulée (undo) sans copie.
+    Les manifestes et les chunks sont conservés par un backend (BACKEND) : un
+    répertoire local ("filesystem", par défaut) ou un serveur Redis ("redis") partagé
+    entre plusieurs machines.
+    La lecture peut se limiter à certaines colonnes, ce qui évite de charger tout le
+    tableau quand un callback n'a besoin que d'une colonne.
+    Les chunks Arrow locaux sont projetés en mémoire (mmap) et convertis sans copie
+    quand c'est possible : les workers gunicorn partagent alors les mêmes pages du
+    cache du système au lieu de garder chacun leur copie.
+    Les chunks peuvent être compressés (COMPRESSION = "none", "lz4" ou "zstd", avec
+    COMPRESSION_LEVEL) : moins d'entrées/sorties, mais la lecture décompresse
+    alors les colonnes au lieu de les partager sans copie.
+    Les DataFrames que Arrow ne sait pas représenter (colonnes en double, objets mixtes)
+    sont conservés au format pickle, dans un chunk unique.
+    Les lectures passent par un cache LRU en mémoire (MEMORY_CACHE_BYTES) : les
+    callbacks déclenchés ensemble par un changement de table ne relisent pas le disque.
+    Un second cache (filters, FILTER_CACHE_BYTES) garde les résultats intermédiaires
+    des chaînes de filtres (voir data_manager.get_filtered_df_from_cache).
+    L'espace est borné : taille totale (MAX_BYTES) avec éviction des jeux les moins
+    récemment lus, quota par session (SESSION_QUOTA_BYTES), et un nettoyage
+    périodique (SWEEP_INTERVAL) supprime les jeux qu'aucune session active ne
+    référence plus, puis les chunks qu'aucun manifeste n'utilise.
+    Exemple d'utilisation:
+    >>> store = DatasetStore()
+    >>> store.init_app(app.server, config={"STORE_DIR": "flask_cache"})
+    >>> store.write("file_123", df)
+    >>> store.read("file_123", columns=["A"])
+    >>> store.undo("file_123")
+    """
+
+    def __init__(self, app=None, config: dict | None = None):
+        self.config = dict(DEFAULT_CONFIG)
+        self.frames = FrameCache(self.config["MEMORY_CACHE_BYTES"])
+        self.filters = FrameCache(
+            self.config["FILTER_CACHE_BYTES"], single_version=False
+        )
+        self._backend = None
+        self._touched = {}
+        self._sweeper = None
+        self._stop = threading.Event()
+        if app is not None:
+            self.init_app(app, config)
+        elif config is not None:
+            self.configure(config)
+
+    def init_app(self, app, config: dict | None = None):
+        """
+        Configure le stockage et l'enregistre dans les extensions de l'application Flask.
+        Parameters:
+        - app (Flask): L'application Flask (app.server pour Dash).
+        - config (dict | None): Les options du stockage (STORE_DIR, ...).
+        Returns:
+        - None
+        """
+        self.configure(config)
+        app.extensions["datazen_store"] = self
+        self.start_sweeper()
+
+    def configure(self, config: dict | None = None):
+        """
+        Met à jour la configuration du stockage et ouvre son backend.
+        Parameters:
+        - config (dict | None): Les options à modifier.
+        Returns:
+        - None
+        """
+        if config:
+            self.config.update(config)
+        codec = self.config["COMPRESSION"]
+        if codec not in CODECS:
+            raise ValueError(f"Compression inconnue : {codec!r} (choix : {CODECS})")
+        if codec != "none" and not pa.Codec.is_available(codec):
+            raise ValueError(f"Compression {codec!r} indisponible dans pyarrow.")
+        backend = self.config["BACKEND"]
+        if backend not in BACKENDS:
+            raise ValueError(f"Backend inconnu : {backend!r} (choix : {tuple(BACKENDS)})")
+        self.frames.max_bytes = self.config["MEMORY_CACHE_BYTES"]
+        self.frames.clear()
+        self.filters.max_bytes = self.config["FILTER_CACHE_BYTES"]
+        self.filters.clear()
+        self._backend = BACKENDS[backend](self.config)
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            self.configure()
+        return self._backend
+
+    def _current(self, manifest: dict | None) -> dict | None:
+        if not manifest:
+            return None
+        for entry in manifest["versions"]:
+            if entry["version"] == manifest["current"]:
+                return entry
+        return None
+
+    def _encode(self, table: pa.Table, ext: str) -> pa.Buffer:
+        codec = self.config["COMPRESSION"]
+        level = self.config["COMPRESSION_LEVEL"]
+        sink = pa.BufferOutputStream()
+        if ext == "parquet":
+            pq.write_table(
+                table,
+                sink,
+                compression=codec,
+                compression_level=level if codec != "none" else None,
+            )
+        else:
+            options = pa.ipc.IpcWriteOptions(
+                compression=(
+                    None if codec == "none" else pa.Codec(codec, compression_level=level)
+                )
+            )
+            with pa.ipc.new_file(sink, table.schema, options=options) as writer:
+                writer.write_table(table)
+        return sink.getvalue()
+
+    def _add_chunk(self, chunks: dict, data, ext: str) -> dict:
+        digest = hashlib.blake2b(data, digest_size=20).hexdigest()
+        chunk = f"{digest}.{ext}"
+        chunks[chunk] = data
+        return {"chunk": chunk, "bytes": len(data)}
+
+    def _decode_chunk(self, chunk: str, buffer: pa.Buffer) -> pa.ChunkedArray:
+        if chunk.endswith(".parquet"):
+            return pq.read_table(pa.BufferReader(buffer)).column(0)
+        return pa.ipc.open_file(buffer).read_all().column(0)
+
+    def write(self, file_id: str, df: pd.DataFrame, session_id: str | None = None):
+        """
+        Enregistre un DataFrame comme nouvelle version du jeu de données. Seules les
+        colonnes dont le contenu n'existe pas déjà dans le stockage sont écrites.
+        Si une session est indiquée, le jeu lui est rattaché et son quota est vérifié.
+        Parameters:
+        - file_id (str): L'identifiant du jeu de données.
+        - df (pd.DataFrame): Le DataFrame à stocker.
+        - session_id (str | None): La session qui possède le jeu de données.
+        Returns:
+        - None
+        Raises:
+        - QuotaError: Si le quota de la session est dépassé.
+        """
+        try:
+            table = pa.Table.from_pandas(df)
+        except (ValueError, TypeError, pa.ArrowException):
+            table = None
+
+        chunks = {}
+        if table is None:
+            entry = self._add_chunk(chunks, pickle.dumps(df, protocol=5), "pkl")
+            entry = {"pickle": entry["chunk"], "bytes": entry["bytes"]}
+        else:
+            ext = "parquet" if self.config["FORMAT"] == "parquet" else "arrow"
+            columns = []
+            for i, name in enumerate(table.schema.names):
+                part = pa.table({"data": table.column(i).combine_chunks()})
+                columns.append(
+                    {"name": name, **self._add_chunk(chunks, self._encode(part, ext), ext)}
+                )
+            entry = {
+                "columns": columns,
+                "pandas": table.schema.pandas_metadata,
+                "bytes": sum(c["bytes"] for c in columns),
+            }
+        entry["nrows"] = len(df)
+        entry["schema"] = frame_schema(df)
+        entry["saved"] = time.time()
+        self._commit(file_id, entry, chunks, session_id)
+
+    def write_stream(
+        self,
+        file_id: str,
+        frames,
+        session_id: str | None = None,
+        transform=None,
+        progress=None,
+    ) -> int:
+        """
+        Enregistre un tableau reçu par morceaux (pd.read_csv(..., chunksize=...)) comme
+        nouvelle version du jeu de données, sans jamais le charger en entier : chaque
+        morceau est ajouté colonne par colonne à des fichiers Arrow temporaires, puis
+        les colonnes sont écrites une à une dans le stockage. Si le type d'une colonne
+        change d'un morceau à l'autre, les types sont unifiés (entiers en flottants,
+        sinon texte).
+        Parameters:
+        - file_id (str): L'identifiant du jeu de données.
+        - frames (iterable): Les morceaux du tableau, de mêmes colonnes (DataFrames,
+          ou tables et RecordBatch Arrow, écrits sans conversion).
+        - session_id (str | None): La session qui possède le jeu de données.
+        - transform (callable | None): Appliquée à chaque colonne complète, sous forme
+          de DataFrame à une colonne (encode_categoricals, downcast_numeric...).
+        - progress (callable | None): Appelée avec le nombre de lignes lues après chaque morceau.
+        Returns:
+        - int: Le nombre de lignes écrites.
+        Raises:
+        - QuotaError: Si le quota de la session est dépassé (vérifié au fil de la lecture).
+        Exemple d'utilisation:
+        >>> reader = pd.read_csv("gros.csv", chunksize=100_000)
+        >>> store.write_stream("file_123", reader, progress=print)
+        """
+        quota = self.config["SESSION_QUOTA_BYTES"]
+        used = None
+        if session_id is not None and quota is not None:
+            used = self._session_usage(session_id, file_id)
+        names = None
+        nrows = 0
+        with tempfile.TemporaryDirectory(prefix="datazen-") as directory:
+            spool = _ColumnSpool(directory)
+            try:
+                for frame in frames:
+                    table = _frame_table(frame)
+                    if names is None:
+                        names = (
+                            list(frame.columns)
+                            if isinstance(frame, pd.DataFrame)
+                            else table.schema.names
+                        )
+                    spool.append(table)
+                    nrows += table.num_rows
+                    if used is not None:
+                        self._check_quota(session_id, file_id, spool.nbytes, used)
+                    if progress is not None:
+                        progress(nrows)
+            finally:
+                spool.close()
+            if not names:
+                self.write(file_id, pd.DataFrame(), session_id)
+                return 0
+
+            ext = "parquet" if self.config["FORMAT"] == "parquet" else "arrow"
+            columns, metas, heads = [], [], []
+            for i, name in enumerate(names):
+                part = pa.table([spool.column(i)], names=["data"]).to_pandas()
+                part.columns = [name]
+                if transform is not None:
+                    part = transform(part)
+                table = pa.Table.from_pandas(part, preserve_index=False)
+                chunks = {}
+                data = pa.table({"data": table.column(0).combine_chunks()})
+                columns.append(
+                    {
+                        "name": table.schema.names[0],
+                        **self._add_chunk(chunks, self._encode(data, ext), ext),
+                    }
+                )
+                # Chaque colonne est écrite aussitôt : seuls les manifestes la
+                # référencent, le délai CHUNK_GRACE la protège du nettoyage d'ici là.
+                self.backend.put_chunks(chunks)
+                meta = table.schema.pandas_metadata
+                metas.append(meta["columns"][0])
+                heads.append(part.head(0))
+
+        meta = {
+            **meta,
+            "columns": metas,
+            "index_columns": [
+                {"kind": "range", "name": None, "start": 0, "stop": nrows, "step": 1}
+            ],
+        }
+        entry = {
+            "columns": columns,
+            "pandas": meta,
+            "bytes": sum(c["bytes"] for c in columns),
+            "nrows": nrows,
+            "schema": frame_schema(pd.concat(heads, axis=1)),
+            "saved": time.time(),
+        }
+        self._commit(file_id, entry, {}, session_id)
+        return nrows
+
+    def _commit(self, file_id: str, entry: dict, chunks: dict, session_id: str | None):
+        manifest = self.backend.get_manifests([file_id])[0] or {
+            "created": time.time_ns(),
+            "next": 1,
+            "current": None,
+            "versions": [],
+        }
+        if session_id is not None:
+            self._check_quota(session_id, file_id, entry["bytes"])
+
+        versions = [
+            v
+            for v in manifest["versions"]
+            if manifest["current"] is not None and v["version"] <= manifest["current"]
+        ]
+        entry["version"] = manifest["next"]
+        versions.append(entry)
+        manifest["versions"] = versions[-self.config["MAX_VERSIONS"] :]
+        manifest["current"] = entry["version"]
+        manifest["next"] += 1
+        manifest["updated"] = entry["saved"]
+        self.backend.set_manifest(file_id, manifest, chunks)
+        self.frames.discard(file_id)
+        self.filters.discard(file_id)
+
+        if session_id is not None:
+            refs = self.session_files(session_id)
+            if file_id not in refs:
+                self.track_session(session_id, refs + [file_id])
+        self.enforce_limits(keep={file_id})
+
+    def version(self, file_id: str) -> tuple | None:
+        """
+        Renvoie un jeton identifiant la version courante d'un jeu de données.
+        Le jeton change à chaque écriture ou annulation, y compris par un autre processus.
+        Parameters:
+        - file_id (str): L'identifiant du jeu de données.
+        Returns:
+        - tuple | None: Le jeton de version, ou None si l'identifiant n'existe pas.
+        """
+        manifest = self.backend.get_manifests([file_id])[0]
+        if self._current(manifest) is None:
+            return None
+        return (manifest["created"], manifest["current"])
+
+    def metadata(self, file_id: str) -> dict | None:
+        """
+        Renvoie la description de la version courante d'un jeu de données, enregistrée
+        à l'écriture : nombre de lignes et colonnes (nom, dtype, famille). Seul le
+        manifeste est lu, jamais les données.
+        Parameters:
+        - file_id (str): L'identifiant du jeu de données.
+        Returns:
+        - dict | None: {"nrows", "columns"}, ou None si l'identifiant n'existe pas.
+        """
+        current = self._current(self.backend.get_manifests([file_id])[0])
+        if current is None:
+            return None
+        if "schema" not in current:
+            df = self.read(file_id)
+            if df is None:
+                return None
+            return {"nrows": len(df), "columns": frame_schema(df)}
+        return {"nrows": current["nrows"], "columns": current["schema"]}
+
+    def versions(self, file_id: str) -> list:
+        """
+        Liste les versions conservées d'un jeu de données, de la plus ancienne à la
+        plus récente.
+        Parameters:
+        - file_id (str): L'identifiant du jeu de données.
+        Returns:
+        - list: Des dictionnaires (version, saved, nrows, bytes, current).
+        """
+        manifest = self.backend.get_manifests([file_id])[0]
+        if not manifest:
+            return []
+        return [
+            {
+                "version": v["version"],
+                "saved": v["saved"],
+                "nrows": v["nrows"],
+                "bytes": v["bytes"],
+                "current": v["version"] == manifest["current"],
+            }
+            for v in manifest["versions"]
+        ]
+
+    def undo(self, file_id: str) -> bool:
+        """
+        Revient à la version précédente d'un jeu de données. La version annulée est
+        abandonnée à la prochaine écriture.
+        Parameters:
+        - file_id (str): L'identifiant du jeu de données.
+        Returns:
+        - bool: True si une version précédente existait.
+        """
+        manifest = self.backend.get_manifests([file_id])[0]
+        if not manifest:
+            return False
+        previous = [
+            v["version"]
+            for v in manifest["versions"]
+            if manifest["current"] is not None and v["version"] < manifest["current"]
+        ]
+        if not previous:
+            return False
+        manifest["current"] = previous[-1]
+        manifest["updated"] = time.time()
+        self.backend.set_manifest(file_id, manifest, {})
+        self.frames.discard(file_id)
+        self.filters.discard(file_id)
+        return True
+
+    def read(self, file_id: str, columns: list | None = None) -> pd.DataFrame | None:
+        """
+        Lit la version courante d'un jeu de données, éventuellement limitée à
+        certaines colonnes.
+        Parameters:
+        - file_id (str): L'identifiant du jeu de données.
+        - columns (list | None): Les colonnes à lire (toutes si None). Les colonnes
+          inconnues sont ignorées.
+        Returns:
+        - pd.DataFrame | None: Le DataFrame lu, ou None si l'identifiant n'existe pas.
+        """
+        return self.read_many([file_id], columns)[0]
+
+    def read_many(self, file_ids: list, columns: list | None = None) -> list:
+        """
+        Lit plusieurs jeux de données en regroupant les accès au backend : les
+        manifestes sont lus ensemble, puis toutes les colonnes manquantes du cache
+        mémoire en une seule fois (un aller-retour chacun avec Redis).
+        Parameters:
+        - file_ids (list): Les identifiants des jeux de données.
+        - columns (list | None): Les colonnes à lire dans chaque jeu (toutes si None).
+        Returns:
+        - list: Les DataFrames lus, None pour les identifiants inconnus.
+        """
+        results = [None] * len(file_ids)
+        pending = []
+        for i, (file_id, manifest) in enumerate(
+            zip(file_ids, self.backend.get_manifests(file_ids))
+        ):
+            current = self._current(manifest)
+            if current is None:
+                continue
+            self._touch(file_id)
+
+            key = (file_id, (manifest["created"], manifest["current"]))
+            entry = self.frames.get(key)
+            if entry is not None:
+                df, complete = entry
+                if columns is None and complete:
+                    results[i] = df.copy(deep=False)
+                    continue
+                if columns is not None and (
+                    complete or all(c in df.columns for c in columns)
+                ):
+                    results[i] = _project(df, columns)
+                    continue
+
+            wanted = None
+            if columns is not None:
+                wanted = list(columns)
+                if entry is not None:
+                    wanted += [c for c in entry[0].columns if c not in wanted]
+            pending.append((i, key, current, self._select(current, wanted), wanted))
+
+        names = list(
+            dict.fromkeys(
+                name for _, _, current, selected, _ in pending
+                for name in (
+                    [current["pickle"]] if "pickle" in current
+                    else [c["chunk"] for c in selected]
+                )
+            )
+        )
+        buffers = dict(zip(names, self.backend.load_chunks(names))) if names else {}
+
+        for i, key, current, selected, wanted in pending:
+            df = self._decode(current, selected, wanted, buffers)
+            if df is None:
+                continue
+            self.frames.put(key, df, complete=wanted is None)
+            results[i] = df.copy(deep=False) if columns is None else _project(df, columns)
+        return results
+
+    def _select(self, current: dict, columns: list | None) -> list:
+        if "pickle" in current or columns is None:
+            return current.get("columns", [])
+        wanted = {str(c) for c in columns}
+        wanted.update(i for i in current["pandas"]["index_columns"] if isinstance(i, str))
+        return [c for c in current["columns"] if c["name"] in wanted]
+
+    def _decode(
+        self, current: dict, selected: list, columns: list | None, buffers: dict
+    ) -> pd.DataFrame | None:
+        if "pickle" in current:
+            buffer = buffers.get(current["pickle"])
+            if buffer is None:
+                return None
+            df = pickle.loads(buffer)
+            return df if columns is None else _project(df, columns)
+
+        names = [c["name"] for c in selected]
+        if not names:
+            return pd.DataFrame(index=pd.RangeIndex(current["nrows"]))
+        if any(buffers.get(c["chunk"]) is None for c in selected):
+            return None
+
+        table = pa.Table.from_arrays(
+            [self._decode_chunk(c["chunk"], buffers[c["chunk"]]) for c in selected],
+            names=names,
+        )
+        meta = current["pandas"]
+        meta = {
+            **meta,
+            "columns": [m for m in meta["columns"] if m["field_name"] in names],
+        }
+        table = table.replace_schema_metadata({"pandas": json.dumps(meta)})
+        return table.to_pandas(split_blocks=True)
+
+    def exists(self, file_id: str) -> bool:
+        """
+        Indique si un jeu de données est présent dans le stockage.
+        Parameters:
+        - file_id (str): L'identifiant du jeu de données.
+        Returns:
+        - bool: True si le jeu de données existe.
+        """
+        return self.version(file_id) is not None
+
+    def delete(self, file_id: str):
+        """
+        Supprime un jeu de données et toutes ses versions. Ses chunks sont libérés
+        au prochain nettoyage s'ils ne servent à aucun autre jeu.
+        Parameters:
+        - file_id (str): L'identifiant du jeu de données.
+        Returns:
+        - None
+        """
+        self.backend.delete_manifest(file_id)
+        self.frames.discard(file_id)
+        self.filters.discard(file_id)
+
+    def _touch(self, file_id: str):
+        now = time.time()
+        if now - self._touched.get(file_id, 0) < 60:
+            return
+        self._touched[file_id] = now
+        self.backend.touch(file_id)
+
+    def datasets(self) -> list:
+        """
+        Liste les jeux de données présents dans le stockage.
+        Returns:
+        - list: Des tuples (file_id, taille en octets de ses chunks, dernier accès,
+          dernière écriture).
+        """
+        return [
+            (file_id, sum(_manifest_chunks(manifest).values()), last_access, written)
+            for file_id, manifest, last_access, written in self.backend.manifests()
+        ]
+
+    def usage(self) -> int:
+        """
+        Renvoie l'espace occupé par les chunks (partagés comptés une fois).
+        Returns:
+        - int: La taille totale en octets.
+        """
+        return self.backend.usage()
+
+    def session_files(self, session_id: str) -> list:
+        """
+        Renvoie les jeux de données référencés par une session.
+        Parameters:
+        - session_id (str): L'identifiant de la session.
+        Returns:
+        - list: Les identifiants des jeux de données.
+        """
+        return self.backend.get_session(session_id)
+
+    def track_session(self, session_id: str, file_ids: list):
+        """
+        Enregistre la liste des jeux de données utilisés par une session et
+        prolonge sa durée de vie.
+        Parameters:
+        - session_id (str): L'identifiant de la session.
+        - file_ids (list): Les identifiants des jeux de données de la session.
+        Returns:
+        - None
+        """
+        self.backend.set_session(session_id, file_ids)
+
+    def touch_session(self, session_id: str):
+        """
+        Prolonge la durée de vie d'une session encore ouverte (voir
+        callbacks.renew_session), sans modifier ses jeux de données.
+        Parameters:
+        - session_id (str): L'identifiant de la session.
+        Returns:
+        - None
+        """
+        self.backend.touch_session(session_id)
+
+    def _session_usage(self, session_id: str, file_id: str) -> int:
+        refs = set(self.session_files(session_id)) - {file_id}
+        return sum(s for f, s, _, _ in self.datasets() if f in refs)
+
+    def _check_quota(
+        self, session_id: str, file_id: str, size: int, used: int | None = None
+    ):
+        quota = self.config["SESSION_QUOTA_BYTES"]
+        if quota is None:
+            return
+        if used is None:
+            used = self._session_usage(session_id, file_id)
+        if used + size > quota:
+            raise QuotaError(
+                f"Quota de stockage de la session dépassé "
+                f"({(used + size) / 1024**2:.0f} Mo sur {quota / 1024**2:.0f} Mo). "
+                "Supprimez des fichiers importés avant d'en ajouter."
+            )
+
+    def attach(self, file_id: str, session_id: str) -> bool:
+        """
+        Rattache un jeu de données déjà stocké à une session (import d'un fichier
+        identique), en vérifiant le quota de la session.
+        Parameters:
+        - file_id (str): L'identifiant du jeu de données.
+        - session_id (str): L'identifiant de la session.
+        Returns:
+        - bool: False si le jeu de données n'existe pas.
+        Raises:
+        - QuotaError: Si le quota de la session est dépassé.
+        """
+        manifest = self.backend.get_manifests([file_id])[0]
+        if self._current(manifest) is None:
+            return False
+        size = sum(_manifest_chunks(manifest).values())
+        refs = self.session_files(session_id)
+        if file_id not in refs:
+            self._check_quota(session_id, file_id, size)
+            self.track_session(session_id, refs + [file_id])
+        self._touch(file_id)
+        return True
+
+    def shared(self, file_id: str, session_id: str | None = None) -> bool:
+        """
+        Indique si un jeu de données est aussi utilisé par une autre session active
+        (import d'un fichier identique, voir attach) : il ne doit alors pas être
+        modifié en place.
+        Parameters:
+        - file_id (str): L'identifiant du jeu de données.
+        - session_id (str | None): La session qui veut le modifier.
+        Returns:
+        - bool: True si une autre session le référence.
+        """
+        return any(
+            file_id in refs
+            for other, refs in self.backend.live_sessions().items()
+            if other != session_id
+        )
+
+    def release(self, file_id: str):
+        """
+        Supprime un jeu de données si plus aucune session active ne le référence.
+        Parameters:
+        - file_id (str): L'identifiant du jeu de données.
+        Returns:
+        - bool: True si le jeu de données a été supprimé.
+        """
+        if any(file_id in refs for refs in self.backend.live_sessions().values()):
+            return False
+        self.delete(file_id)
+        return True
+
+    def progress(self, job_id: str) -> dict | None:
+        """
+        Renvoie l'avancement d'un import en cours (voir write_stream), quel que soit
+        le worker qui le traite.
+        Parameters:
+        - job_id (str): L'identifiant de l'import.
+        Returns:
+        - dict | None: L'avancement (par exemple {"rows": 200000}), None si inconnu.
+        """
+        return self.backend.get_progress(job_id)
+
+    def set_progress(self, job_id: str, progress: dict | None):
+        """
+        Enregistre l'avancement d'un import.
+        Parameters:
+        - job_id (str): L'identifiant de l'import.
+        - progress (dict | None): L'avancement, None pour l'effacer.
+        Returns:
+        - None
+        """
+        self.backend.set_progress(job_id, progress)
+
+    def record(self, name: str) -> dict | None:
+        """
+        Renvoie un enregistrement partagé entre les workers (catalogue du répertoire
+        surveillé...). Contrairement à l'avancement des imports, il n'expire pas.
+        Parameters:
+        - name (str): Le nom de l'enregistrement.
+        Returns:
+        - dict | None: L'enregistrement, None s'il n'existe pas.
+        """
+        return self.backend.get_record(name)
+
+    def set_record(self, name: str, value: dict | None):
+        """
+        Enregistre un enregistrement partagé entre les workers.
+        Parameters:
+        - name (str): Le nom de l'enregistrement.
+        - value (dict | None): La valeur, None pour l'effacer.
+        Returns:
+        - None
+        """
+        self.backend.set_record(name, value)
+
+    def acquire_lock(self, name: str, owner: str, ttl: float) -> bool:
+        """
+        Prend ou renouvelle un verrou partagé par tous les workers, pour qu'une tâche
+        de fond (surveillance d'un répertoire...) ne tourne que dans un processus.
+        Parameters:
+        - name (str): Le nom du verrou.
+        - owner (str): L'identifiant unique du demandeur.
+        - ttl (float): La durée de validité du verrou en secondes (backend redis), à
+          renouveler par un nouvel appel avant son expiration.
+        Returns:
+        - bool: True si le demandeur détient le verrou.
+        """
+        return self.backend.acquire_lock(name, owner, ttl)
+
+    def collect_chunks(
+        self, grace: float | None = None, candidates: set | None = None
+    ) -> list:
+        """
+        Supprime les chunks qu'aucun manifeste ne référence. Les chunks écrits depuis
+        moins de `grace` secondes sont conservés (écriture en cours du manifeste).
+        Parameters:
+        - grace (float | None): Le délai de grâce en secondes (CHUNK_GRACE par défaut).
+        - candidates (set | None): Les seuls chunks à examiner (tous par défaut).
+        Returns:
+        - list: Les noms des chunks supprimés.
+        """
+        if grace is None:
+            grace = self.config["CHUNK_GRACE"]
+        referenced = set()
+        for _, manifest, _, _ in self.backend.manifests():
+            referenced.update(_manifest_chunks(manifest))
+        return self.backend.collect_chunks(referenced, grace, candidates)
+
+    def enforce_limits(self, keep: set | None = None, reserve: int = 0):
+        """
+        Supprime les jeux de données les moins récemment lus jusqu'à repasser sous
+        la taille maximale du stockage.
+        Parameters:
+        - keep (set | None): Les identifiants à ne jamais supprimer.
+        - reserve (int): Les octets à garder libres en plus des chunks (envois
+          directs en cours, voir uploads.UploadArea).
+        Returns:
+        - list: Les identifiants supprimés.
+        """
+        max_bytes = self.config["MAX_BYTES"]
+        if max_bytes is None or self.usage() + reserve <= max_bytes:
+            return []
+        evicted = []
+        for file_id, manifest, _, _ in sorted(
+            self.backend.manifests(), key=lambda e: e[2]
+        ):
+            if keep and file_id in keep:
+                continue
+            self.delete(file_id)
+            evicted.append(file_id)
+            # Seuls les chunks du jeu supprimé sont libérés aussitôt : ceux d'un
+            # import en cours (write_stream), qu'aucun manifeste ne référence
+            # encore, restent protégés par CHUNK_GRACE.
+            self.collect_chunks(grace=0, candidates=set(_manifest_chunks(manifest)))
+            if self.usage() + reserve <= max_bytes:
+                break
+        return evicted
+
+    def sweep(self):
+        """
+        Expire les sessions inactives et les avancements d'import périmés, supprime
+        les jeux de données qu'aucune session ne référence (après ORPHAN_GRACE
+        secondes), applique la taille maximale puis libère les chunks inutilisés.
+        Returns:
+        - list: Les identifiants supprimés.
+        """
+        referenced = set()
+        for refs in self.backend.live_sessions().values():
+            referenced.update(refs)
+
+        grace = self.config["ORPHAN_GRACE"] or 0
+        now = time.time()
+        removed = []
+        for file_id, _, _, written in self.datasets():
+            if file_id not in referenced and now - written > grace:
+                self.delete(file_id)
+                removed.append(file_id)
+        removed += self.enforce_limits()
+        self.collect_chunks()
+        self.backend.expire_progress()
+        return removed
+
+    def start_sweeper(self):
+        """
+        Lance en arrière-plan le nettoyage périodique du stockage (SWEEP_INTERVAL).
+        Returns:
+        - None
+        """
+        interval = self.config["SWEEP_INTERVAL"]
+        if not interval or self._sweeper is not None:
+            return
+
+        def loop():
+            while not self._stop.wait(interval):
+                try:
+                    self.sweep()
+                except Exception as e:
+                    print(f"Erreur lors du nettoyage du stockage : {e}")
+
+        self._sweeper = threading.Thread(
+            target=loop, name="datazen-store-sweeper", daemon=True
+        )
+        self._sweeper.start()
+
+
+store = DatasetStore()
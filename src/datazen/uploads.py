@@ -0,0 +1,394 @@
+import hmac
+import json
+import os
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import Blueprint, has_request_context, jsonify, request
+
+from datazen.storage import VALID_ID, store as default_store
+
+try:
+    import fcntl
+except ImportError:
+    # Sans flock (Windows), un seul processus sert l'application.
+    fcntl = None
+
+
+BLOCK = 1024**2
+COOKIE = "datazen_upload"
+
+
+class UploadArea:
+    """
+    Réception directe des gros fichiers, sans passer par dcc.Upload.
+    dcc.Upload envoie le fichier en base64 (33 % de plus) dans le JSON d'un callback,
+    en une seule requête gardée en mémoire. Ici, le navigateur envoie le fichier brut
+    par morceaux (assets/direct_upload.js) vers une route Flask qui les écrit sur le
+    disque au fil de l'eau. Un envoi interrompu reprend à la dernière position reçue.
+    L'identifiant d'un envoi est tiré au hasard par le serveur, et l'envoi appartient
+    au navigateur qui l'a créé (cookie "datazen_upload") : seul ce navigateur peut
+    le compléter, le consulter ou l'importer (voir resolve).
+    Routes (préfixe /datazen/upload) :
+    - POST / : crée un envoi ({"filename", "total"} en JSON ou formulaire) et
+      renvoie son identifiant ({"id", "offset", "complete"}).
+    - GET /<upload_id> : position reçue et état de l'envoi ({"offset", "complete"}).
+    - PUT /<upload_id>?offset= : corps brut du morceau.
+    - POST /<upload_id> : même chose en multipart/form-data (champ "file" et champ
+      offset).
+    Les envois terminés sont ouverts côté serveur par open() et passés tels quels au
+    pipeline d'import. Les fichiers sont écrits dans UPLOAD_DIR (par défaut
+    STORE_DIR/uploads), la taille d'un envoi est limitée à UPLOAD_MAX_BYTES, les
+    envois en cours comptent dans la taille maximale du stockage (MAX_BYTES) et les
+    envois abandonnés sont supprimés après SESSION_TTL.
+    Exemple d'utilisation:
+    >>> uploads = UploadArea()
+    >>> uploads.init_app(app.server, store)
+    >>> upload_id = uploads.create("ventes.csv", 1024, owner="a1b2c3")
+    >>> with uploads.open(upload_id) as f:
+    ...     data = f.read()
+    """
+
+    def __init__(self, app=None, store=None):
+        self.store = store or default_store
+        self._mutex = threading.Lock()
+        if app is not None:
+            self.init_app(app, store)
+
+    def init_app(self, app, store=None):
+        """
+        Enregistre les routes d'envoi sur l'application Flask.
+        Parameters:
+        - app (Flask): L'application Flask (app.server pour Dash).
+        - store (DatasetStore | None): Le stockage dont la configuration est utilisée.
+        Returns:
+        - None
+        """
+        if store is not None:
+            self.store = store
+        blueprint = Blueprint("datazen_uploads", __name__)
+        blueprint.add_url_rule(
+            "/datazen/upload", view_func=self._create, methods=["POST"]
+        )
+        blueprint.add_url_rule(
+            "/datazen/upload/<upload_id>", view_func=self._status, methods=["GET"]
+        )
+        blueprint.add_url_rule(
+            "/datazen/upload/<upload_id>",
+            view_func=self._receive,
+            methods=["PUT", "POST"],
+        )
+        app.register_blueprint(blueprint)
+        app.extensions["datazen_uploads"] = self
+        self.sweep()
+
+    @property
+    def directory(self) -> str:
+        config = self.store.config
+        return config.get("UPLOAD_DIR") or os.path.join(config["STORE_DIR"], "uploads")
+
+    def _path(self, upload_id: str, ext: str) -> str:
+        if not VALID_ID.fullmatch(upload_id or ""):
+            raise ValueError(f"Identifiant d'envoi invalide : {upload_id!r}")
+        return os.path.join(self.directory, f"{upload_id}.{ext}")
+
+    def _meta(self, upload_id: str) -> dict | None:
+        try:
+            with open(self._path(upload_id, "json"), encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    @contextmanager
+    def _locked(self, upload_id: str):
+        # Morceaux d'un même envoi écrits un à un, y compris depuis plusieurs
+        # workers : deux requêtes à la même position ne s'entrelacent pas.
+        if fcntl is None:
+            with self._mutex:
+                yield
+            return
+        with open(self._path(upload_id, "lock"), "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def usage(self) -> int:
+        """
+        Renvoie l'espace réservé par les envois, terminés ou non (taille annoncée).
+        Returns:
+        - int: La taille totale en octets.
+        """
+        if not os.path.isdir(self.directory):
+            return 0
+        total = 0
+        for entry in os.scandir(self.directory):
+            upload_id, _, ext = entry.name.rpartition(".")
+            if ext != "json" or not VALID_ID.fullmatch(upload_id):
+                continue
+            meta = self._meta(upload_id)
+            if meta is not None:
+                total += meta["size"]
+        return total
+
+    def create(self, filename: str, total: int, owner: str) -> str:
+        """
+        Crée un envoi et réserve sa taille dans le stockage : les jeux de données
+        les moins récemment lus sont supprimés si besoin (voir
+        DatasetStore.enforce_limits).
+        Parameters:
+        - filename (str): Le nom du fichier envoyé.
+        - total (int): La taille totale du fichier.
+        - owner (str): Le jeton du navigateur qui envoie le fichier.
+        Returns:
+        - str: L'identifiant de l'envoi.
+        Raises:
+        - ValueError: Si la taille dépasse UPLOAD_MAX_BYTES ou l'espace libre du
+          stockage.
+        """
+        limit = self.store.config["UPLOAD_MAX_BYTES"]
+        if total < 0 or (limit is not None and total > limit):
+            raise ValueError(
+                f"Fichier trop volumineux ({total / 1024**2:.0f} Mo, "
+                f"maximum {limit / 1024**2:.0f} Mo)."
+            )
+        max_bytes = self.store.config["MAX_BYTES"]
+        if max_bytes is not None:
+            reserve = self.usage() + total
+            self.store.enforce_limits(reserve=reserve)
+            if self.store.usage() + reserve > max_bytes:
+                raise ValueError("Espace de stockage insuffisant pour cet envoi.")
+
+        os.makedirs(self.directory, exist_ok=True)
+        upload_id = secrets.token_hex(16)
+        with open(self._path(upload_id, "json"), "w", encoding="utf-8") as f:
+            json.dump({"filename": filename, "size": total, "owner": owner}, f)
+        return upload_id
+
+    def owns(self, upload_id: str, owner: str | None) -> bool:
+        """
+        Indique si un envoi appartient au navigateur dont on a le jeton.
+        Parameters:
+        - upload_id (str): L'identifiant de l'envoi.
+        - owner (str | None): Le jeton du navigateur (cookie "datazen_upload").
+        Returns:
+        - bool: True si l'envoi existe et a été créé avec ce jeton.
+        """
+        try:
+            meta = self._meta(upload_id)
+        except ValueError:
+            return False
+        return meta is not None and hmac.compare_digest(meta["owner"], owner or "")
+
+    def resolve(self, server_upload: dict | None, filename: str | None) -> str | None:
+        """
+        Renvoie l'envoi terminé désigné par le navigateur (store "server-upload")
+        pour le fichier choisi, s'il a été créé par le navigateur de la requête en
+        cours : une autre session ne peut pas importer un envoi dont elle aurait
+        l'identifiant.
+        Parameters:
+        - server_upload (dict | None): {"id", "filename"} envoyé par le navigateur.
+        - filename (str | None): Le nom du fichier choisi dans le popup d'import.
+        Returns:
+        - str | None: L'identifiant de l'envoi, None s'il ne convient pas.
+        """
+        if not server_upload or not filename or server_upload.get("filename") != filename:
+            return None
+        upload_id = server_upload.get("id")
+        if not has_request_context() or not self.owns(
+            upload_id, request.cookies.get(COOKIE)
+        ):
+            return None
+        return upload_id if self.info(upload_id) is not None else None
+
+    def status(self, upload_id: str) -> dict:
+        """
+        Renvoie l'état d'un envoi.
+        Parameters:
+        - upload_id (str): L'identifiant de l'envoi.
+        Returns:
+        - dict: {"offset": octets reçus, "complete": bool, "filename": nom ou None}.
+        """
+        info = self.info(upload_id)
+        if info is not None:
+            return {
+                "offset": info["size"],
+                "complete": True,
+                "filename": info["filename"],
+            }
+        try:
+            offset = os.path.getsize(self._path(upload_id, "part"))
+        except FileNotFoundError:
+            offset = 0
+        return {"offset": offset, "complete": False, "filename": None}
+
+    def info(self, upload_id: str) -> dict | None:
+        """
+        Renvoie la description d'un envoi terminé.
+        Parameters:
+        - upload_id (str): L'identifiant de l'envoi.
+        Returns:
+        - dict | None: {"filename", "size"}, None si l'envoi n'est pas terminé.
+        """
+        meta = self._meta(upload_id)
+        if meta is None or not os.path.exists(self._path(upload_id, "data")):
+            return None
+        return {"filename": meta["filename"], "size": meta["size"]}
+
+    def append(self, upload_id: str, stream, offset: int) -> dict:
+        """
+        Écrit un morceau d'envoi à la suite des octets déjà reçus, par blocs.
+        Parameters:
+        - upload_id (str): L'identifiant de l'envoi (voir create).
+        - stream: Le flux binaire du morceau (corps de la requête).
+        - offset (int): La position du morceau dans le fichier.
+        Returns:
+        - dict: L'état de l'envoi après écriture (voir status).
+        Raises:
+        - FileNotFoundError: Si l'envoi n'existe pas.
+        - ValueError: Si le morceau dépasse la taille annoncée.
+        - LookupError: Si offset ne correspond pas aux octets déjà reçus.
+        """
+        meta = self._meta(upload_id)
+        if meta is None:
+            raise FileNotFoundError(f"Envoi inconnu : {upload_id!r}")
+        total = meta["size"]
+        with self._locked(upload_id):
+            current = self.status(upload_id)
+            if current["complete"]:
+                return current
+            if offset != current["offset"]:
+                raise LookupError(current["offset"])
+
+            path = self._path(upload_id, "part")
+            with open(path, "ab") as f:
+                f.truncate(offset)
+                while True:
+                    block = stream.read(BLOCK)
+                    if not block:
+                        break
+                    if f.tell() + len(block) > total:
+                        f.truncate(offset)
+                        raise ValueError("Le morceau dépasse la taille annoncée.")
+                    f.write(block)
+                size = f.tell()
+
+            if size == total:
+                os.replace(path, self._path(upload_id, "data"))
+                return {"offset": size, "complete": True, "filename": meta["filename"]}
+        return {"offset": size, "complete": False, "filename": None}
+
+    def open(self, upload_id: str):
+        """
+        Ouvre en lecture binaire un envoi terminé.
+        Parameters:
+        - upload_id (str): L'identifiant de l'envoi.
+        Returns:
+        - BinaryIO: Le fichier reçu.
+        Raises:
+        - FileNotFoundError: Si l'envoi n'existe pas ou n'est pas terminé.
+        """
+        if self.info(upload_id) is None:
+            raise FileNotFoundError(f"Envoi inconnu ou incomplet : {upload_id!r}")
+        return open(self._path(upload_id, "data"), "rb")
+
+    def delete(self, upload_id: str):
+        """
+        Supprime un envoi, terminé ou non.
+        Parameters:
+        - upload_id (str): L'identifiant de l'envoi.
+        Returns:
+        - None
+        """
+        for ext in ("part", "data", "json", "lock"):
+            try:
+                os.remove(self._path(upload_id, ext))
+            except FileNotFoundError:
+                pass
+
+    def sweep(self) -> list:
+        """
+        Supprime les envois dont le dernier morceau date de plus de SESSION_TTL.
+        Returns:
+        - list: Les identifiants supprimés.
+        """
+        ttl = self.store.config["SESSION_TTL"]
+        if not ttl or not os.path.isdir(self.directory):
+            return []
+        now = time.time()
+        latest = {}
+        for entry in os.scandir(self.directory):
+            upload_id, _, ext = entry.name.rpartition(".")
+            if ext not in ("part", "data", "json") or not VALID_ID.fullmatch(upload_id):
+                continue
+            try:
+                mtime = entry.stat().st_mtime
+            except FileNotFoundError:
+                continue
+            latest[upload_id] = max(latest.get(upload_id, 0), mtime)
+        removed = []
+        for upload_id, mtime in latest.items():
+            if now - mtime > ttl:
+                self.delete(upload_id)
+                removed.append(upload_id)
+        return removed
+
+    def _owned(self, upload_id):
+        # Envoi inconnu et envoi d'un autre navigateur donnent la même réponse :
+        # l'existence d'un identifiant ne se devine pas.
+        if not self.owns(upload_id, request.cookies.get(COOKIE)):
+            return jsonify({"error": "Envoi inconnu."}), 404
+        return None
+
+    def _create(self):
+        params = request.get_json(silent=True) or request.form
+        try:
+            total = int(params["total"])
+        except (KeyError, TypeError, ValueError):
+            return jsonify({"error": "Paramètre 'total' invalide."}), 400
+        owner = request.cookies.get(COOKIE) or secrets.token_urlsafe(32)
+        try:
+            self.sweep()
+            upload_id = self.create(params.get("filename") or "fichier", total, owner)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        response = jsonify({"id": upload_id, **self.status(upload_id)})
+        if request.cookies.get(COOKIE) != owner:
+            response.set_cookie(COOKIE, owner, httponly=True, samesite="Strict")
+        return response
+
+    def _status(self, upload_id):
+        denied = self._owned(upload_id)
+        if denied is not None:
+            return denied
+        return jsonify(self.status(upload_id))
+
+    def _receive(self, upload_id):
+        denied = self._owned(upload_id)
+        if denied is not None:
+            return denied
+        if request.method == "POST":
+            upload = request.files.get("file")
+            if upload is None:
+                return jsonify({"error": "Champ 'file' manquant."}), 400
+            params, stream = request.form, upload.stream
+        else:
+            params, stream = request.args, request.stream
+        try:
+            offset = int(params.get("offset", 0))
+        except ValueError:
+            return jsonify({"error": "Paramètre 'offset' invalide."}), 400
+        try:
+            return jsonify(self.append(upload_id, stream, offset))
+        except LookupError as e:
+            # Position inattendue (morceau rejoué, envoi repris) : le client
+            # reprend à la position renvoyée.
+            return jsonify({"error": "Position inattendue.", "offset": e.args[0]}), 409
+        except (FileNotFoundError, ValueError) as e:
+            return jsonify({"error": str(e)}), 400
+
+
+uploads = UploadArea()
@@ -0,0 +1,310 @@
+import multiprocessing
+import os
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor, wait
+from functools import partial
+
+from datazen.data_manager import (
+    id_hash,
+    import_columnar_stream,
+    import_csv_stream,
+    import_excel,
+    import_kind,
+    normalize_columns,
+    open_archive,
+    read_sample,
+    set_df_to_cache,
+    sniff_csv,
+    zip_csv_members,
+)
+from datazen.storage import store as default_store
+
+
+SESSION = "watch"
+CATALOG = "watch_catalog"
+LOCK = "watch"
+
+
+def ingest_file(config: dict, path: str, file_id: str) -> list:
+    """
+    Importe un fichier du répertoire surveillé dans le stockage. Exécutée dans un
+    processus du pool de WatchFolder, qui configure son propre stockage.
+    Les options d'un CSV (séparateur, décimale, en-tête, encodage) sont détectées
+    sur son début ; un classeur Excel est lu sur sa première feuille et une archive
+    .zip donne un jeu de données par CSV. Les colonnes sont typées à l'import (voir
+    data_manager.normalize_columns).
+    Parameters:
+    - config (dict): La configuration du stockage.
+    - path (str): Le chemin du fichier.
+    - file_id (str): L'identifiant du jeu de données.
+    Returns:
+    - list: Les jeux de données importés, en couples [file_id, nom].
+    Raises:
+    - ValueError: Si le fichier ne peut pas être importé.
+    """
+    default_store.configure(config)
+    name = os.path.basename(path)
+    kind = import_kind(name)
+    datasets = [[file_id, name]]
+    with open(path, "rb") as f:
+        if kind == "csv" and name.lower().endswith(".zip"):
+            with open_archive(f) as archive:
+                datasets = []
+                for member in zip_csv_members(archive):
+                    member_id = id_hash(f"{file_id}:{member}")
+                    with archive.open(member) as sample:
+                        options = sniff_csv(sample.read(64 * 1024))
+                    with archive.open(member) as stream:
+                        result = import_csv_stream(
+                            stream,
+                            member,
+                            member_id,
+                            sep=options["sep"],
+                            decimal=options["decimal"],
+                            header=options["header"],
+                            encoding=options["encoding"],
+                            transform=partial(
+                                normalize_columns, decimal=options["decimal"]
+                            ),
+                        )
+                    if result.get("error") is not None:
+                        # Archive refusée en entier : les CSV déjà importés ne
+                        # resteraient référencés par aucun catalogue.
+                        for imported_id, _ in datasets + [[member_id, member]]:
+                            default_store.delete(imported_id)
+                        break
+                    datasets.append([member_id, f"{name} [{member.rpartition('/')[2]}]"])
+                else:
+                    result = {} if datasets else {"error": "Aucun fichier CSV."}
+        elif kind == "csv":
+            options = sniff_csv(read_sample(f, filename=name))
+            result = import_csv_stream(
+                f,
+                name,
+                file_id,
+                sep=options["sep"],
+                decimal=options["decimal"],
+                header=options["header"],
+                encoding=options["encoding"],
+                transform=partial(normalize_columns, decimal=options["decimal"]),
+            )
+        elif kind == "excel":
+            result = import_excel(f, name, sheet_name=0)
+            if result.get("error") is None:
+                set_df_to_cache(file_id, normalize_columns(result.pop("panda_data")))
+        else:
+            result = import_columnar_stream(
+                f, name, file_id, transform=normalize_columns
+            )
+    if result.get("error") is not None:
+        raise ValueError(result["error"])
+    return datasets
+
+
+class WatchFolder:
+    """
+    Import côté serveur des fichiers déposés dans un répertoire (WATCH_DIR), sans
+    envoi par le navigateur.
+    Le répertoire est parcouru au démarrage, puis toutes les WATCH_INTERVAL secondes.
+    Un fichier nouveau ou modifié (taille ou date différente) est importé dans le
+    stockage par un pool de WATCH_WORKERS processus : les lectures de plusieurs
+    fichiers avancent en parallèle sans occuper les workers qui servent l'application.
+    Après le premier parcours, un fichier n'est importé qu'une fois sa taille et sa
+    date stables d'un parcours à l'autre, pour ne pas lire une copie en cours.
+    Les jeux de données importés sont listés dans un catalogue publié dans le
+    stockage (disque ou Redis) et apparaissent dans la liste des données de chaque
+    utilisateur (voir callbacks.sync_watched_files). Ils sont rattachés à la session
+    "watch", renouvelée à chaque parcours : le nettoyage du stockage ne les supprime
+    qu'une fois le fichier retiré du répertoire.
+    Avec plusieurs workers Gunicorn (ou plusieurs machines sur Redis), un seul
+    processus surveille le répertoire : celui qui détient le verrou "watch" du
+    stockage (voir DatasetStore.acquire_lock). Les autres reprennent la surveillance
+    s'il s'arrête.
+    Exemple d'utilisation:
+    >>> watch_folder = WatchFolder()
+    >>> watch_folder.init_app(app.server, store)
+    >>> watch_folder.scan()
+    [{'source': 'ventes.csv', 'signature': '9f2c...', 'datasets': [['9f2c...', 'ventes.csv']]}]
+    """
+
+    def __init__(self, app=None, store=None):
+        self.store = store or default_store
+        self._executor = None
+        self._pending = {}
+        self._failed = {}
+        self._scanned = False
+        self._lock = threading.Lock()
+        self._watcher = None
+        self._owner = uuid.uuid4().hex
+        self._stop = threading.Event()
+        if app is not None:
+            self.init_app(app, store)
+
+    def init_app(self, app, store=None):
+        """
+        Enregistre la surveillance sur l'application Flask et la démarre si
+        WATCH_DIR est configuré.
+        Parameters:
+        - app (Flask): L'application Flask (app.server pour Dash).
+        - store (DatasetStore | None): Le stockage où les fichiers sont importés.
+        Returns:
+        - None
+        """
+        if store is not None:
+            self.store = store
+        app.extensions["datazen_watch"] = self
+        self.start()
+
+    @property
+    def directory(self) -> str | None:
+        return self.store.config["WATCH_DIR"]
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        # Processus lancés par spawn : un fork depuis un processus qui a déjà des
+        # threads (nettoyage du stockage, imports) peut hériter de verrous pris.
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.store.config["WATCH_WORKERS"],
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    @property
+    def lock_ttl(self) -> float:
+        return max(3 * self.store.config["WATCH_INTERVAL"], 60)
+
+    def elect(self) -> bool:
+        """
+        Prend ou renouvelle le verrou de surveillance du répertoire.
+        Returns:
+        - bool: True si ce processus surveille le répertoire.
+        """
+        return self.store.acquire_lock(LOCK, self._owner, self.lock_ttl)
+
+    def catalog(self) -> list:
+        """
+        Renvoie les fichiers du répertoire surveillé déjà importés.
+        Returns:
+        - list: Un dictionnaire {"source", "signature", "datasets"} par fichier.
+        """
+        catalog = self.store.record(CATALOG)
+        return catalog["files"] if catalog else []
+
+    def is_shared(self, file_id: str) -> bool:
+        """
+        Indique si un jeu de données vient du répertoire surveillé : il est partagé
+        par tous les utilisateurs et ne doit pas être modifié en place.
+        Parameters:
+        - file_id (str): L'identifiant du jeu de données.
+        Returns:
+        - bool: True pour un fichier du répertoire surveillé.
+        """
+        return file_id in self.store.session_files(SESSION)
+
+    def _files(self) -> dict:
+        files = {}
+        for entry in os.scandir(self.directory):
+            if not entry.is_file() or import_kind(entry.name) is None:
+                continue
+            stat = entry.stat()
+            files[entry.name] = id_hash(
+                f"watch:{entry.name}:{stat.st_size}:{stat.st_mtime_ns}"
+            )
+        return files
+
+    def scan(self) -> list:
+        """
+        Parcourt le répertoire surveillé et importe les fichiers nouveaux ou modifiés.
+        Returns:
+        - list: Le catalogue mis à jour (voir catalog).
+        """
+        if not self.directory or not os.path.isdir(self.directory):
+            return []
+        with self._lock:
+            previous = {entry["source"]: entry for entry in self.catalog()}
+            current, todo = {}, {}
+            for name, signature in self._files().items():
+                entry = previous.get(name)
+                if entry is not None and entry["signature"] == signature:
+                    current[name] = entry
+                    continue
+                if entry is not None:
+                    # Ancienne version gardée jusqu'à l'import de la nouvelle.
+                    current[name] = entry
+                if self._failed.get(name) == signature:
+                    continue
+                if not self._scanned or self._pending.get(name) == signature:
+                    todo[name] = signature
+                self._pending[name] = signature
+
+            futures = {
+                name: self.executor.submit(
+                    ingest_file,
+                    self.store.config,
+                    os.path.join(self.directory, name),
+                    signature,
+                )
+                for name, signature in todo.items()
+            }
+            pending = set(futures.values())
+            while pending:
+                # Verrou renouvelé pendant les imports longs : aucun autre
+                # processus ne reprend la surveillance entre-temps.
+                _, pending = wait(pending, timeout=self.lock_ttl / 3)
+                if self._watcher is not None:
+                    self.elect()
+            for name, future in futures.items():
+                try:
+                    datasets = future.result()
+                except Exception as e:
+                    print(f"Erreur lors de l'import de {name} : {e}")
+                    self._failed[name] = todo[name]
+                    continue
+                current[name] = {
+                    "source": name,
+                    "signature": todo[name],
+                    "datasets": datasets,
+                }
+            self._scanned = True
+
+            catalog = sorted(current.values(), key=lambda entry: entry["source"])
+            self.store.set_record(CATALOG, {"files": catalog})
+            self.store.track_session(
+                SESSION,
+                [file_id for entry in catalog for file_id, _ in entry["datasets"]],
+            )
+            return catalog
+
+    def start(self):
+        """
+        Lance en arrière-plan le premier parcours du répertoire puis sa surveillance
+        (WATCH_INTERVAL). Sans WATCH_DIR, ne fait rien.
+        Returns:
+        - None
+        """
+        if not self.directory or self._watcher is not None:
+            return
+        if multiprocessing.parent_process() is not None:
+            # Processus du pool : il réimporte le module principal (app.py) sans
+            # surveiller le répertoire à son tour.
+            return
+
+        def loop():
+            while True:
+                try:
+                    if self.elect():
+                        self.scan()
+                except Exception as e:
+                    print(f"Erreur lors de la surveillance de {self.directory} : {e}")
+                if self._stop.wait(self.store.config["WATCH_INTERVAL"]):
+                    return
+
+        self._watcher = threading.Thread(
+            target=loop, name="datazen-watch-folder", daemon=True
+        )
+        self._watcher.start()
+
+
+watch_folder = WatchFolder()
@@ -1,9 +1,11 @@
 
 import pandas as pd
 import pickle
-from datazen.data_manager import set_df_to_cache, get_df_from_cache, id_hash
+from datazen.data_manager import set_df_to_cache, get_df_from_cache, id_hash, content_id
+import base64
 from unittest.mock import MagicMock
 import hashlib
+import os
 
 cache = MagicMock()
 
@@ -47,4 +49,88 @@ def test_id_hash_sha256():
 
     assert result == expected
     assert len(result) == 64
-    assert all(c in "0123456789abcdef" for c in result.lower())
\ No newline at end of file
+    assert all(c in "0123456789abcdef" for c in result.lower())
+
+def test_content_id_hashes_decoded_bytes_and_options():
+    raw = b"A,B\n1,2\n" * 1000
+    contents = "data:text/csv;base64," + base64.b64encode(raw).decode()
+
+    small_blocks = content_id(contents, "csv", ",", algorithm="sha256", block=10)
+    expected = hashlib.sha256(raw + b'["csv", ","]').hexdigest()
+
+    assert small_blocks == expected
+    assert content_id(contents, "csv", ",", algorithm="blake2b") != content_id(
+        contents, "csv", ";", algorithm="blake2b"
+    )
+    assert content_id(contents, "csv", ",") == content_id(contents, "csv", ",")
+
+
+def test_save_table_keeps_stored_dtypes(tmp_path, monkeypatch):
+    import datazen.callbacks as callbacks
+    import datazen.data_manager as data_manager
+    from datazen.storage import DatasetStore
+
+    store = DatasetStore(config={"STORE_DIR": str(tmp_path)})
+    monkeypatch.setattr(data_manager, "store", store)
+    monkeypatch.setattr(callbacks, "store", store)
+    df = pd.DataFrame(
+        {
+            "cat": pd.Series(["a", "b", "a"], dtype="category"),
+            "petit": pd.Series([1, None, 3], dtype="Int8"),
+            "f32": pd.Series([0.5, 1.5, 2.5], dtype="float32"),
+            "texte": pd.Series(["x", None, "z"], dtype="string[pyarrow]"),
+            "date": pd.to_datetime(["2024-01-31", "2024-02-29", "2024-03-31"]),
+        }
+    )
+    store.write("file_1", df, session_id="s1")
+    chunks = len(os.listdir(store.backend._chunk_path("")))
+    # Lignes telles que renvoyées par le DataTable (JSON).
+    rows = [
+        {
+            **row,
+            "date": row["date"].isoformat(),
+            "petit": None if pd.isna(row["petit"]) else row["petit"],
+        }
+        for row in df.astype(object).to_dict("records")
+    ]
+    rows[0]["f32"] = 9.5
+
+    callbacks.save_table_data(
+        1, [rows], [{"index": "file_1"}], {"files": [], "session": "s1"}, None
+    )
+    saved = store.read("file_1")
+    assert saved.dtypes.astype(str).tolist() == df.dtypes.astype(str).tolist()
+    assert saved["f32"].tolist() == [9.5, 1.5, 2.5]
+    # Seule la colonne modifiée est réécrite.
+    assert len(os.listdir(store.backend._chunk_path(""))) == chunks + 1
+
+
+def test_save_copies_a_dataset_shared_with_another_session(tmp_path, monkeypatch):
+    import datazen.callbacks as callbacks
+    import datazen.data_manager as data_manager
+    from datazen.storage import DatasetStore
+
+    store = DatasetStore(config={"STORE_DIR": str(tmp_path)})
+    monkeypatch.setattr(data_manager, "store", store)
+    monkeypatch.setattr(callbacks, "store", store)
+    store.write("file_1", pd.DataFrame({"a": [1, 2]}), session_id="s1")
+    store.write("file_1", pd.DataFrame({"a": [1, 2, 3]}), session_id="s1")
+    assert store.attach("file_1", "s2")
+    stored = {"files": [{"name": "a.csv", "id": "file_1"}], "session": "s2"}
+
+    stored, active = callbacks.save_table_data(
+        1, [[{"a": 9}]], [{"index": "file_1"}], stored, {"id": "file_1"}
+    )
+    copy = stored["files"][0]["id"]
+    assert copy != "file_1" and active == {"id": copy}
+    assert store.read(copy)["a"].tolist() == [9]
+    assert store.read("file_1")["a"].tolist() == [1, 2, 3]
+    assert callbacks.undo_table_save(1, {"id": "file_1"}, stored) is callbacks.no_update
+    assert store.read("file_1")["a"].tolist() == [1, 2, 3]
+
+    # Jeu de données propre à la session : modifié en place.
+    stored, _ = callbacks.save_table_data(
+        1, [[{"a": 7}]], [{"index": copy}], stored, {"id": copy}
+    )
+    assert stored["files"][0]["id"] == copy
+    assert store.read(copy)["a"].tolist() == [7]
@@ -10,8 +10,15 @@ from datazen.data_manager import (
     apply_filters,
     sort_abc,
     sort_123,
-    apply_sort
+    apply_sort,
+    FilteredView,
+    get_filtered_df_from_cache,
+    get_filtered_view_from_cache,
+    set_df_to_cache,
+    to_arrow_strings,
 )
+import datazen.data_manager as data_manager
+from datazen.storage import store
 
 @pytest.fixture
 def df():
@@ -99,3 +106,85 @@ def test_apply_sort():
 
     assert result.reset_index(drop=True).equals(expected.reset_index(drop=True))
 
+
+
+def test_filter_chain_prefix_is_memoized(df, tmp_path, monkeypatch):
+    store.configure({"STORE_DIR": str(tmp_path)})
+    set_df_to_cache("file_1", df)
+    filters = {
+        "f1": {"type": "comparaison", "col": "B", "value": 1, "operator": "plus grand que"},
+        "f2": {"type": "in_text", "col": "A", "value": "an"},
+    }
+    first = get_filtered_df_from_cache("file_1", filters)
+
+    calls = []
+    real_apply = data_manager.apply_filters
+    monkeypatch.setattr(
+        data_manager, "apply_filters", lambda d, f: calls.append(f) or real_apply(d, f)
+    )
+    filters["f3"] = {"type": "keep_columns", "columns": ["A"]}
+    result = get_filtered_df_from_cache("file_1", filters)
+    assert len(calls) == 1
+    assert list(result.columns) == ["A"]
+
+    del filters["f3"]
+    assert get_filtered_df_from_cache("file_1", filters).equals(first)
+    assert len(calls) == 1
+
+    set_df_to_cache("file_1", df.head(1))
+    assert len(get_filtered_df_from_cache("file_1", filters)) == 0
+
+
+def test_filter_cache_does_not_hold_the_base_table(df, tmp_path):
+    store.configure({"STORE_DIR": str(tmp_path)})
+    set_df_to_cache("file_1", df)
+    filters = {"f1": {"type": "na", "col": "B", "action": "drop"}}
+    view = get_filtered_view_from_cache("file_1", filters)
+    assert view.base is not None and len(view) == 3
+
+    cached = [entry[0] for entry in store.filters._entries.values()]
+    assert cached and all(v.base is None for v in cached)
+    store.frames.clear()
+    again = get_filtered_df_from_cache("file_1", filters)
+    pd.testing.assert_frame_equal(again, view.materialize())
+
+
+def test_filtered_view_keeps_positions_only(df):
+    filters = {
+        "f1": {"type": "na", "col": "B", "action": "drop"},
+        "f2": {"type": "comparaison", "col": "B", "value": 1, "operator": "plus grand que"},
+        "f3": {"type": "na", "col": "C", "action": "zero"},
+    }
+    view = apply_filters(FilteredView(df), filters)
+    assert isinstance(view, FilteredView)
+    assert view.base is df
+    assert len(view) == 2
+    assert list(view.rows) == [1, 2]
+    pd.testing.assert_frame_equal(view.materialize(), apply_filters(df, filters))
+
+
+def test_filter_na_on_categorical():
+    df_cat = pd.DataFrame({"A": pd.Categorical(["x", "n/a", None, "y"])})
+    assert filter_na(df_cat, "A", "drop")["A"].tolist() == ["x", "y"]
+    assert filter_na(df_cat, "A", "zero")["A"].tolist() == ["x", "0", "0", "y"]
+
+
+def test_arrow_strings_filters_and_sort():
+    df_txt = to_arrow_strings(
+        pd.DataFrame({"A": [" Pomme", "poire", "n/a", None, "a.b"], "B": range(5)})
+    )
+    assert df_txt["A"].dtype == "string[pyarrow]"
+    assert filter_in_text(df_txt, "A", "pomme")["B"].tolist() == [0]
+    assert filter_in_text(df_txt, "A", ".")["B"].tolist() == [4]
+    cleaned = filter_na(df_txt, "A", "drop")
+    assert cleaned["B"].tolist() == [0, 1, 4]
+    assert cleaned["A"].dtype == "string[pyarrow]"
+    assert sort_abc(df_txt, "A", "asc")["B"].tolist() == [0, 4, 2, 1, 3]
+
+
+def test_filter_na_and_sort_123_on_text_columns():
+    df_txt = pd.DataFrame({"A": ["10", "N/A ", "9", 2], "B": range(4)})
+    assert filter_na(df_txt, "A", "drop")["B"].tolist() == [0, 2, 3]
+    assert sort_123(df_txt, "A", "asc")["B"].tolist() == [3, 2, 0, 1]
+    typed = pd.DataFrame({"A": [10.0, np.nan, 9.0, 2.0], "B": range(4)})
+    assert sort_123(typed, "A", "desc")["B"].tolist() == [0, 2, 3, 1]
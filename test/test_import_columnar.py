@@ -0,0 +1,68 @@
+import base64
+import io
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import datazen.data_manager as data_manager
+from datazen.data_manager import columnar_columns, import_columnar_stream
+from datazen.storage import DatasetStore
+
+
+def encode(data: bytes) -> str:
+    return "data:application/octet-stream;base64," + base64.b64encode(data).decode()
+
+
+def sample_df():
+    return pd.DataFrame(
+        {
+            "jour": pd.date_range("2024-01-01", periods=5),
+            "magasin": pd.Categorical(["nord", "sud", "nord", "est", "sud"]),
+            "montant": [1.5, 2.0, 3.25, 4.0, 5.5],
+        },
+        index=pd.Index([10, 11, 12, 13, 14], name="ligne"),
+    )
+
+
+def test_columnar_formats_keep_types_and_project(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        data_manager, "store", DatasetStore(config={"STORE_DIR": str(tmp_path)})
+    )
+    df = sample_df()
+    parquet, arrow = io.BytesIO(), io.BytesIO()
+    df.to_parquet(parquet)
+    feather.write_feather(df.reset_index(drop=True), arrow)
+    jsonl = df.to_json(orient="records", lines=True, date_format="iso").encode()
+
+    for name, data in [
+        ("ventes.parquet", parquet.getvalue()),
+        ("ventes.feather", arrow.getvalue()),
+        ("ventes.jsonl", jsonl),
+    ]:
+        contents = encode(data)
+        assert columnar_columns(contents, name)[:3] == ["jour", "magasin", "montant"]
+        result = import_columnar_stream(
+            contents, name, "file_1", columns=["montant", "magasin"], batch_rows=2
+        )
+        assert result["nrows"] == 5 and "error" not in result
+        stored = data_manager.store.read("file_1")
+        assert list(stored.columns) == ["montant", "magasin"]
+        assert stored["montant"].tolist() == df["montant"].tolist()
+
+    stored = data_manager.store.read("file_1")
+    assert stored["magasin"].tolist() == list(df["magasin"])
+    import_columnar_stream(encode(parquet.getvalue()), "ventes.parquet", "file_2")
+    assert data_manager.store.read("file_2")["magasin"].dtype == "category"
+    assert data_manager.store.read("file_2")["jour"].dtype.kind == "M"
+
+
+def test_columnar_import_errors():
+    stream = io.BytesIO()
+    table = pa.table({"a": [1, 2]})
+    with pa.ipc.new_stream(stream, table.schema) as writer:
+        writer.write_table(table)
+    contents = encode(stream.getvalue())
+
+    assert columnar_columns(contents, "flux.arrow") == ["a"]
+    result = import_columnar_stream(contents, "flux.arrow", "file_1", columns=["b"])
+    assert result["nrows"] == 0
+    assert result["error"] == "Colonnes introuvables : b"
@@ -1,5 +1,6 @@
+from functools import partial
 import pandas as pd
-from datazen.data_manager import import_csv
+from datazen.data_manager import import_csv, encode_categoricals, downcast_numeric
 
 def encode_csv_to_base64(csv_str):
     import base64
@@ -32,3 +33,308 @@ def test_import_csv_wrong_extension():
     result = import_csv(encoded, "data.txt", sep=";", decimal=",", header=0)
 
     assert result is None or result.get("panda_data") is None
+
+
+def test_encode_categoricals_low_cardinality_only():
+    csv_content = "ville,code\n" + "\n".join(
+        f"{['Tours', 'Paris', 'Lyon'][i % 3]},id{i}" for i in range(90)
+    )
+    df = import_csv(
+        encode_csv_to_base64(csv_content), "data.csv", sep=",", decimal=".", header=0
+    )["panda_data"]
+
+    result = encode_categoricals(df)
+
+    assert isinstance(result["ville"].dtype, pd.CategoricalDtype)
+    assert list(result["ville"].cat.categories) == ["Lyon", "Paris", "Tours"]
+    assert result["code"].dtype == df["code"].dtype
+    assert result["ville"].astype(str).tolist() == df["ville"].tolist()
+
+
+def test_encode_categoricals_keeps_high_cardinality_text():
+    df = pd.DataFrame({"nom": [f"client_{i // 2}" for i in range(2000)]})
+    result = encode_categoricals(df)
+    assert result["nom"].dtype == df["nom"].dtype
+    assert not isinstance(result["nom"].dtype, pd.CategoricalDtype)
+
+
+def test_downcast_numeric_is_lossless():
+    csv_content = "petit,manquant,decimal,precis,grand\n" + "\n".join(
+        f"{i},{'' if i % 4 == 0 else i},{i / 2},{i / 3},{i * 100_000}"
+        for i in range(40)
+    )
+    df = import_csv(
+        encode_csv_to_base64(csv_content), "data.csv", sep=",", decimal=".", header=0
+    )["panda_data"]
+
+    result, report = downcast_numeric(df)
+
+    assert str(result["petit"].dtype) == "int8"
+    assert str(result["manquant"].dtype) == "Int8"
+    assert result["manquant"].isna().sum() == df["manquant"].isna().sum()
+    assert str(result["decimal"].dtype) == "float32"
+    assert result["precis"].dtype == df["precis"].dtype
+    assert str(result["grand"].dtype) == "int32"
+    for col in df.columns:
+        assert result[col].astype("float64").equals(df[col].astype("float64"))
+    assert {r["column"] for r in report} == {"petit", "manquant", "decimal", "grand"}
+    assert all(r["saved"] > 0 for r in report)
+
+
+def test_import_csv_stream_writes_to_store(tmp_path, monkeypatch):
+    from datazen.data_manager import import_csv_stream
+    from datazen.storage import DatasetStore
+    import datazen.data_manager as data_manager
+
+    monkeypatch.setattr(
+        data_manager, "store", DatasetStore(config={"STORE_DIR": str(tmp_path)})
+    )
+    csv_content = "a;b\n" + "\n".join(f"{i};{i},5" for i in range(250))
+    seen = []
+    result = import_csv_stream(
+        encode_csv_to_base64(csv_content),
+        "data.csv",
+        "file_1",
+        sep=";",
+        decimal=",",
+        header=0,
+        progress=seen.append,
+        chunk_rows=100,
+        engine="c",
+    )
+
+    assert result == {"filename": "data.csv", "nrows": 250, "engine": "c"}
+    assert seen == [100, 200, 250]
+    df = data_manager.store.read("file_1")
+    assert df["b"].tolist() == [i + 0.5 for i in range(250)]
+
+
+def test_import_csv_stream_accepts_uppercase_extension(tmp_path, monkeypatch):
+    from datazen.data_manager import import_csv_stream, is_csv_file
+    from datazen.storage import DatasetStore
+    import datazen.data_manager as data_manager
+
+    monkeypatch.setattr(
+        data_manager, "store", DatasetStore(config={"STORE_DIR": str(tmp_path)})
+    )
+    assert is_csv_file("VENTES.CSV")
+    result = import_csv_stream(
+        encode_csv_to_base64("a;b\n1;2\n"),
+        "VENTES.CSV",
+        "file_1",
+        sep=";",
+        decimal=".",
+        header=0,
+    )
+    assert result.get("error") is None
+    assert data_manager.store.read("file_1")["b"].tolist() == [2]
+
+
+def test_import_csv_stream_pyarrow_engine_and_fallback(tmp_path, monkeypatch):
+    from datazen.data_manager import import_csv_stream
+    from datazen.storage import DatasetStore
+    import datazen.data_manager as data_manager
+
+    monkeypatch.setattr(
+        data_manager, "store", DatasetStore(config={"STORE_DIR": str(tmp_path)})
+    )
+    csv_content = "n;x;jour;texte\n" + "\n".join(
+        f"{i};{i},25;2024-01-{i % 28 + 1:02d};{'' if i == 3 else 'v' + str(i)}"
+        for i in range(300)
+    )
+    encoded = encode_csv_to_base64(csv_content)
+    expected = import_csv(encoded, "data.csv", sep=";", decimal=",", header=0)[
+        "panda_data"
+    ]
+
+    arrow = import_csv_stream(
+        encoded, "data.csv", "arrow", sep=";", decimal=",", header=0, engine="pyarrow"
+    )
+    # Colonnes en double : PyArrow ne sait pas les nommer, pandas si (n, n.1).
+    fallback = import_csv_stream(
+        encode_csv_to_base64(csv_content.replace("x;", "n;", 1)),
+        "data.csv",
+        "fallback",
+        sep=";",
+        decimal=",",
+        header=0,
+        engine="pyarrow",
+    )
+
+    assert arrow["engine"] == "pyarrow" and fallback["engine"] == "c"
+    pd.testing.assert_frame_equal(data_manager.store.read("arrow"), expected)
+    assert list(data_manager.store.read("fallback").columns) == [
+        "n",
+        "n.1",
+        "jour",
+        "texte",
+    ]
+
+
+def test_sniff_csv_options_then_import():
+    import base64
+    from datazen.data_manager import read_sample, sniff_csv
+
+    raw = "Export caisse\nville;prix;qte\nSèvres;1,5;3\nÉvry;2,25;4\n".encode("cp1252")
+    encoded = "data:text/csv;base64," + base64.b64encode(raw).decode()
+    options = sniff_csv(read_sample(encoded, size=45))
+
+    assert options == {"sep": ";", "decimal": ",", "header": 1, "encoding": "cp1252"}
+    assert sniff_csv(b"1|2.5\n3|4\n")["header"] == -1
+    assert sniff_csv("a\tb\n1\t2\n".encode("utf-8-sig"))["encoding"] == "utf-8-sig"
+
+    options = sniff_csv(read_sample(encoded))
+    df = import_csv(encoded, "data.csv", **options)["panda_data"]
+    assert df["ville"].tolist() == ["Sèvres", "Évry"]
+    assert df["prix"].tolist() == [1.5, 2.25]
+
+
+def test_import_compressed_csv_and_zip_members(tmp_path, monkeypatch):
+    import base64
+    import gzip
+    import io
+    import zipfile
+    import datazen.data_manager as data_manager
+    from datazen.data_manager import (
+        import_csv_stream,
+        open_archive,
+        read_sample,
+        zip_csv_members,
+    )
+    from datazen.storage import DatasetStore
+
+    monkeypatch.setattr(
+        data_manager, "store", DatasetStore(config={"STORE_DIR": str(tmp_path)})
+    )
+    raw = ("a;b\n" + "\n".join(f"{i};{i},5" for i in range(500))).encode()
+    packed = base64.b64encode(gzip.compress(raw)).decode()
+    encoded = "data:application/gzip;base64," + packed
+
+    assert read_sample(encoded, size=8, filename="data.csv.gz") == b"a;b\n0;0,"
+    for engine in ("pyarrow", "c"):
+        result = import_csv_stream(
+            encoded, "data.csv.gz", engine, ";", ",", 0, engine=engine, chunk_rows=100
+        )
+        assert result["nrows"] == 500
+        assert data_manager.store.read(engine)["b"].sum() == sum(range(500)) + 250
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("export/", "")
+        archive.writestr("export/ventes.csv", raw)
+        archive.writestr("clients.csv", b"nom\nAda\n")
+        archive.writestr("lisez-moi.txt", b"...")
+    with open_archive(io.BytesIO(buffer.getvalue())) as archive:
+        members = zip_csv_members(archive)
+        assert members == ["export/ventes.csv", "clients.csv"]
+        with archive.open(members[0]) as f:
+            assert import_csv_stream(f, members[0], "zip_1", ";", ",", 0)["nrows"] == 500
+
+
+def test_preview_and_row_selection(tmp_path, monkeypatch):
+    import datazen.data_manager as data_manager
+    from datazen.data_manager import import_csv_stream, preview_csv
+    from datazen.storage import DatasetStore
+
+    monkeypatch.setattr(
+        data_manager, "store", DatasetStore(config={"STORE_DIR": str(tmp_path)})
+    )
+    encoded = encode_csv_to_base64("n;t\n" + "\n".join(f"{i};x{i}" for i in range(1000)))
+
+    preview = preview_csv(encoded, "data.csv", ";", ".", 0, nrows=5)["panda_data"]
+    assert preview["n"].tolist() == [0, 1, 2, 3, 4]
+    assert "error" in preview_csv(encoded, "data.csv", ";", ".", 0, encoding="utf-16")
+
+    for engine in ("pyarrow", "c"):
+        result = import_csv_stream(
+            encoded,
+            "data.csv",
+            engine,
+            ";",
+            ".",
+            0,
+            chunk_rows=64,
+            engine=engine,
+            row_start=95,
+            row_stop=305,
+            row_step=10,
+        )
+        assert result["nrows"] == 21
+        assert data_manager.store.read(engine)["n"].tolist() == list(range(95, 305, 10))
+
+
+def test_normalize_columns_types_text_once_at_import(tmp_path, monkeypatch):
+    from datazen.data_manager import import_csv_stream, normalize_columns
+    from datazen.storage import DatasetStore
+    import datazen.data_manager as data_manager
+
+    monkeypatch.setattr(
+        data_manager, "store", DatasetStore(config={"STORE_DIR": str(tmp_path)})
+    )
+    csv_content = (
+        "montant;date;nom\n"
+        "1,5;2024-01-31;a\n"
+        "n/a;2024-02-29;NULL\n"
+        "3;?;b\n"
+    )
+    result = import_csv_stream(
+        encode_csv_to_base64(csv_content),
+        "data.csv",
+        "file_1",
+        sep=";",
+        decimal=",",
+        header=0,
+        transform=partial(normalize_columns, decimal=","),
+    )
+
+    assert result["nrows"] == 3
+    df = data_manager.store.read("file_1")
+    assert df["montant"].dtype == "float64"
+    assert df["montant"].isna().tolist() == [False, True, False]
+    assert df["montant"].sum() == 4.5
+    assert pd.api.types.is_datetime64_any_dtype(df["date"])
+    assert df["date"].isna().tolist() == [False, False, True]
+    assert df["nom"].isna().tolist() == [False, True, False]
+    codes = normalize_columns(pd.DataFrame({"code": ["01000", "75001"]}))
+    assert codes["code"].tolist() == ["01000", "75001"]
+
+    from datazen.callbacks import update_dropdowns
+
+    quanti, quali = update_dropdowns({"id": "file_1"})
+    assert [o["value"] for o in quanti] == ["montant"]
+    assert [o["value"] for o in quali] == ["date", "nom"]
+
+
+def test_normalize_keeps_thousands_separators_as_text():
+    from datazen.data_manager import normalize_column, normalize_columns
+
+    values = pd.Series(["1,000", "2,500", "12,000"])
+    assert normalize_column(values).tolist() == ["1,000", "2,500", "12,000"]
+    assert normalize_column(values, decimal=",").tolist() == [1.0, 2.5, 12.0]
+    df = normalize_columns(pd.DataFrame({"m": ["1,250", "n/a"]}), decimal=".")
+    assert df["m"].tolist()[0] == "1,250"
+
+
+def test_arrow_string_columns_stay_in_chart_dropdowns(tmp_path, monkeypatch):
+    from datazen.data_manager import import_csv_stream, to_arrow_strings
+    from datazen.storage import DatasetStore
+    from datazen.callbacks import update_dropdowns
+    import datazen.data_manager as data_manager
+
+    monkeypatch.setattr(
+        data_manager, "store", DatasetStore(config={"STORE_DIR": str(tmp_path)})
+    )
+    import_csv_stream(
+        encode_csv_to_base64("ville,population\nLyon,500\nNice,340\n"),
+        "data.csv",
+        "file_1",
+        sep=",",
+        decimal=".",
+        header=0,
+        transform=to_arrow_strings,
+    )
+
+    assert data_manager.store.read("file_1")["ville"].dtype == "string[pyarrow]"
+    quanti, quali = update_dropdowns({"id": "file_1"})
+    assert [o["value"] for o in quanti] == ["population"]
+    assert [o["value"] for o in quali] == ["ville"]
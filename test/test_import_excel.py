@@ -1,7 +1,7 @@
 import base64
 import io
 import pandas as pd
-from datazen.data_manager import import_excel
+from datazen.data_manager import excel_sheet_names, import_excel, normalize_columns
 
 
 def test_import_excel_success():
@@ -40,4 +40,54 @@ def test_import_excel_invalid_contents_format():
     result = import_excel(contents, "test.xlsx", "Sheet1")
     assert result["filename"] == "test.xlsx"
     assert result["panda_data"] is None
-    assert "Erreur" in result["error"]
\ No newline at end of file
+    assert "Erreur" in result["error"]
+
+
+def test_import_excel_extension_case_and_unsupported_name():
+    buffer = io.BytesIO()
+    pd.DataFrame({"A": [1]}).to_excel(buffer, index=False, sheet_name="Sheet1")
+    result = import_excel(buffer, "A.XLSX", 0)
+    assert result["panda_data"]["A"].tolist() == [1]
+    result = import_excel(buffer, "a.txt", 0)
+    assert result["panda_data"] is None
+    assert result["error"] == "Le fichier n'est pas un fichier Excel."
+
+
+def test_excel_sheet_names_and_multi_sheet_import():
+    buffer = io.BytesIO()
+    with pd.ExcelWriter(buffer) as writer:
+        pd.DataFrame({"A": [1, 2]}).to_excel(writer, index=False, sheet_name="Ventes")
+        pd.DataFrame({"B": ["x"]}).to_excel(writer, index=False, sheet_name="Clients")
+    encoded = base64.b64encode(buffer.getvalue()).decode()
+    contents = f"data:application/vnd.openxmlformats-officedocument.spreadsheetml.sheet;base64,{encoded}"
+
+    assert excel_sheet_names(contents, "test.xlsx") == ["Ventes", "Clients"]
+    result = import_excel(contents, "test.xlsx", ["Clients", "Ventes"])
+    assert list(result["panda_data"]) == ["Clients", "Ventes"]
+    assert result["panda_data"]["Ventes"]["A"].tolist() == [1, 2]
+    result = import_excel(contents, "test.xlsx", ["Ventes", "Feuil3"])
+    assert result["error"] == "Feuille Excel introuvable : 'Feuil3'"
+
+
+def test_normalize_mixed_type_excel_cells():
+    df = pd.DataFrame(
+        {
+            "nombre": [1, 2, "?"],
+            "oui_non": [True, False, "?"],
+            "mixte": [1.5, "x", "-"],
+        }
+    )
+    buffer = io.BytesIO()
+    df.to_excel(buffer, index=False, sheet_name="Sheet1")
+    encoded = base64.b64encode(buffer.getvalue()).decode()
+    contents = f"data:application/vnd.openxmlformats-officedocument.spreadsheetml.sheet;base64,{encoded}"
+    result = import_excel(contents, "test.xlsx", "Sheet1")
+    assert result["panda_data"]["nombre"].dtype == object
+
+    normalized = normalize_columns(result["panda_data"])
+    assert normalized["nombre"].tolist()[:2] == [1, 2]
+    assert normalized["nombre"].isna().tolist() == [False, False, True]
+    assert normalized["oui_non"].dtype == "boolean"
+    assert normalized["oui_non"].isna().tolist() == [False, False, True]
+    assert normalized["mixte"].tolist()[:2] == [1.5, "x"]
+    assert normalized["mixte"].isna().tolist() == [False, False, True]
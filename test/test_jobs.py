@@ -0,0 +1,47 @@
+import threading
+import pytest
+from datazen.jobs import ImportJobs
+from datazen.storage import DatasetStore
+
+
+@pytest.fixture
+def jobs(tmp_path):
+    return ImportJobs(store=DatasetStore(config={"STORE_DIR": str(tmp_path)}))
+
+
+def test_job_reports_result_and_errors(jobs):
+    def run(progress):
+        progress(10)
+        return {"rows": 10}
+
+    jobs.submit("ok", run).result()
+    status = jobs.status("ok")
+    assert status["state"] == "done" and status["result"] == {"rows": 10}
+    jobs.forget("ok")
+    assert jobs.status("ok") is None
+
+    def fail(progress):
+        raise ValueError("Fichier illisible")
+
+    jobs.submit("ko", fail).result()
+    assert jobs.status("ko")["state"] == "error"
+    assert jobs.status("ko")["error"] == "Fichier illisible"
+
+
+def test_job_cancel_stops_at_next_chunk(jobs):
+    started, chunks = threading.Event(), []
+
+    def run(progress):
+        for rows in range(0, 10_000, 100):
+            progress(rows)
+            chunks.append(rows)
+            started.set()
+            if rows == 100:
+                jobs.cancel("job")
+        return {"rows": rows}
+
+    jobs.submit("job", run).result()
+    assert started.is_set()
+    assert jobs.status("job")["state"] == "cancelled"
+    assert chunks == [0, 100]
+    assert not jobs.cancelled("job")
@@ -0,0 +1,219 @@
+import fnmatch
+import socketserver
+import threading
+import time
+import pytest
+import pandas as pd
+from datazen.storage import DatasetStore
+
+pytest.importorskip("redis")
+
+
+class RespHandler(socketserver.StreamRequestHandler):
+    """Serveur Redis minimal (protocole RESP2) pour les tests, sans dépendance."""
+
+    def read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        count = int(line[1:])
+        args = []
+        for _ in range(count):
+            size = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(size + 2)[:-2])
+        return args
+
+    def reply(self, value):
+        if value is None:
+            out = b"$-1\r\n"
+        elif isinstance(value, bool) or isinstance(value, int):
+            out = b":%d\r\n" % int(value)
+        elif isinstance(value, bytes):
+            out = b"$%d\r\n%s\r\n" % (len(value), value)
+        elif isinstance(value, str):
+            out = value.encode() + b"\r\n"
+        else:
+            self.wfile.write(b"*%d\r\n" % len(value))
+            for item in value:
+                self.reply(item)
+            return
+        self.wfile.write(out)
+
+    def handle(self):
+        server = self.server
+        while True:
+            args = self.read_command()
+            if args is None:
+                return
+            name = args[0].decode().upper()
+            server.commands.append(name)
+            with server.lock:
+                self.reply(server.execute(name, args[1:]))
+            self.wfile.flush()
+
+
+class StandInRedis(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), RespHandler)
+        self.data = {}
+        self.expires = {}
+        self.commands = []
+        self.lock = threading.Lock()
+
+    def live(self, key):
+        if key in self.expires and self.expires[key] < time.time():
+            self.data.pop(key, None)
+            self.expires.pop(key)
+        return key in self.data
+
+    def execute(self, name, args):
+        data = self.data
+        if name == "PING":
+            return "+PONG"
+        if name == "GET":
+            return data[args[0]] if self.live(args[0]) else None
+        if name == "MGET":
+            return [data[k] if self.live(k) else None for k in args]
+        if name == "SET":
+            options = [a.upper() for a in args[2:]]
+            if b"NX" in options and self.live(args[0]):
+                return None
+            data[args[0]] = args[1]
+            self.expires.pop(args[0], None)
+            if b"EX" in options:
+                ttl = args[2 + options.index(b"EX") + 1]
+                self.expires[args[0]] = time.time() + int(ttl)
+            return "+OK"
+        if name == "EXPIRE":
+            if not self.live(args[0]):
+                return 0
+            self.expires[args[0]] = time.time() + int(args[1])
+            return 1
+        if name == "EXISTS":
+            return sum(self.live(k) for k in args)
+        if name == "DEL":
+            return sum(data.pop(k, None) is not None for k in args)
+        if name == "STRLEN":
+            return len(data[args[0]]) if self.live(args[0]) else 0
+        if name == "HSET":
+            h = data.setdefault(args[0], {})
+            new = sum(k not in h for k in args[1::2])
+            h.update(zip(args[1::2], args[2::2]))
+            return new
+        if name == "HGETALL":
+            return [x for kv in data.get(args[0], {}).items() for x in kv]
+        if name == "HKEYS":
+            return list(data.get(args[0], {}))
+        if name == "HDEL":
+            h = data.get(args[0], {})
+            return sum(h.pop(k, None) is not None for k in args[1:])
+        if name == "SCAN":
+            pattern = args[args.index(b"MATCH") + 1].decode() if b"MATCH" in args else "*"
+            keys = [k for k in list(data) if self.live(k)]
+            return [b"0", [k for k in keys if fnmatch.fnmatchcase(k.decode(), pattern)]]
+        return f"-ERR unknown command '{name}'"
+
+
+@pytest.fixture
+def server():
+    srv = StandInRedis()
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+@pytest.fixture
+def store(server):
+    host, port = server.server_address
+    return DatasetStore(
+        config={
+            "BACKEND": "redis",
+            "REDIS_URL": f"redis://{host}:{port}/0?protocol=2",
+            "MEMORY_CACHE_BYTES": 0,
+        }
+    )
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({"A": [1, 2, 3], "B": ["x", "y", "z"], "C": [0.5, 1.5, 2.5]})
+
+
+def test_redis_roundtrip(store, df):
+    store.write("file_1", df)
+    pd.testing.assert_frame_equal(store.read("file_1"), df)
+    assert list(store.read("file_1", columns=["C"]).columns) == ["C"]
+    assert store.read("missing") is None
+
+
+def test_redis_read_many_is_pipelined(store, server, df):
+    store.write("left", df)
+    store.write("right", df * 2)
+    server.commands.clear()
+    left, right = store.read_many(["left", "right"])
+    pd.testing.assert_frame_equal(left, df)
+    pd.testing.assert_frame_equal(right, df * 2)
+    assert server.commands.count("MGET") == 2
+    assert "GET" not in server.commands
+
+
+def test_redis_versions_and_undo(store, df):
+    store.write("file_1", df)
+    store.write("file_1", df.head(1))
+    assert store.undo("file_1")
+    pd.testing.assert_frame_equal(store.read("file_1"), df)
+
+
+def test_redis_sessions_and_sweep(store, df):
+    store.configure({"ORPHAN_GRACE": 0, "CHUNK_GRACE": 0})
+    store.write("kept", df, session_id="s1")
+    store.write("orphan", df[["A"]] * 10)
+    assert store.session_files("s1") == ["kept"]
+    assert store.sweep() == ["orphan"]
+    assert store.exists("kept")
+    assert store.usage() == sum(s for _, s, _, _ in store.datasets())
+
+
+def test_redis_evicted_chunk_reads_as_missing(store, server, df):
+    store.write("file_1", df)
+    for key in [k for k in server.data if k.startswith(b"datazen:chunk:")]:
+        del server.data[key]
+    assert store.read("file_1") is None
+
+
+def test_redis_write_stream_and_progress(store, df):
+    store.set_progress("job1", {"rows": 3})
+    assert store.progress("job1") == {"rows": 3}
+    store.write_stream("file_1", (df.iloc[i : i + 1] for i in range(3)))
+    pd.testing.assert_frame_equal(store.read("file_1"), df)
+    store.set_progress("job1", None)
+    assert store.progress("job1") is None
+
+
+def test_redis_records_do_not_expire(store, server):
+    store.set_record("watch_catalog", {"files": []})
+    assert store.record("watch_catalog") == {"files": []}
+    assert b"datazen:record:watch_catalog" not in server.expires
+    store.set_record("watch_catalog", None)
+    assert store.record("watch_catalog") is None
+
+
+def test_redis_lock_has_a_single_owner(store, server):
+    assert store.acquire_lock("watch", "a", 60)
+    assert not store.acquire_lock("watch", "b", 60)
+    assert store.acquire_lock("watch", "a", 60)
+    server.expires[b"datazen:lock:watch"] = 0
+    assert store.acquire_lock("watch", "b", 60)
+
+
+def test_redis_touch_session_renews_ttl(store, server, df):
+    store.write("file_1", df, session_id="s1")
+    key = b"datazen:session:s1"
+    server.expires[key] = time.time() + 5
+    store.touch_session("s1")
+    assert server.expires[key] > time.time() + 3600
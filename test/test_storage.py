@@ -0,0 +1,305 @@
+import io
+import os
+import pytest
+import pandas as pd
+from datazen.storage import DatasetStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return DatasetStore(config={"STORE_DIR": str(tmp_path)})
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({"A": [1, 2, 3], "B": ["x", "y", "z"], "C": [0.5, 1.5, 2.5]})
+
+
+def test_write_read_roundtrip(store, df):
+    store.write("file_1", df)
+    pd.testing.assert_frame_equal(store.read("file_1"), df)
+
+
+def test_read_only_requested_columns(store, df):
+    store.write("file_1", df)
+    result = store.read("file_1", columns=["C", "A", "inconnue"])
+    assert list(result.columns) == ["A", "C"]
+    assert result["C"].tolist() == [0.5, 1.5, 2.5]
+
+
+def test_read_missing_returns_none(store):
+    assert store.read("absent") is None
+    assert not store.exists("absent")
+
+
+def test_duplicate_columns_fallback(store):
+    df_dup = pd.DataFrame([[1, 2], [3, 4]], columns=["A", "A"])
+    store.write("file_dup", df_dup)
+    pd.testing.assert_frame_equal(store.read("file_dup"), df_dup)
+
+
+def test_integer_column_names(store):
+    df_int = pd.DataFrame({0: [1, 2], 1: ["a", "b"]})
+    store.write("file_int", df_int)
+    assert list(store.read("file_int", columns=[1]).columns) == [1]
+
+
+def test_categorical_roundtrip(store):
+    df_cat = pd.DataFrame({"A": pd.Categorical(["x", "y", "x"]), "B": [1, 2, 3]})
+    store.write("file_cat", df_cat)
+    pd.testing.assert_frame_equal(store.read("file_cat"), df_cat)
+    assert store.metadata("file_cat")["columns"][0]["kind"] == "category"
+
+
+def test_delete(store, df):
+    store.write("file_1", df)
+    store.delete("file_1")
+    assert store.read("file_1") is None
+
+
+def test_repeated_reads_served_from_memory(store, df, monkeypatch):
+    store.write("file_1", df)
+    store.read("file_1")
+    monkeypatch.setattr(store.backend, "load_chunks", None)
+    pd.testing.assert_frame_equal(store.read("file_1"), df)
+    assert list(store.read("file_1", columns=["B"]).columns) == ["B"]
+
+
+def test_cached_frame_not_modified_by_caller(store, df):
+    store.write("file_1", df)
+    result = store.read("file_1")
+    result["A"] = 0
+    assert store.read("file_1")["A"].tolist() == [1, 2, 3]
+
+
+def test_new_version_invalidates_memory_cache(store, df):
+    store.write("file_1", df)
+    store.read("file_1")
+    store.write("file_1", df.head(1))
+    assert len(store.read("file_1")) == 1
+
+
+def test_memory_budget_evicts_least_recent(tmp_path, df):
+    small = DatasetStore(
+        config={"STORE_DIR": str(tmp_path), "MEMORY_CACHE_BYTES": 500}
+    )
+    for i in range(3):
+        small.write(f"file_{i}", df)
+        small.read(f"file_{i}")
+    assert small.frames.nbytes <= 500
+    assert small.frames.get(("file_0", small.version("file_0"))) is None
+    assert small.frames.get(("file_2", small.version("file_2"))) is not None
+
+
+def test_arrow_read_is_zero_copy(store):
+    df_num = pd.DataFrame({"A": range(1000), "B": [0.5] * 1000})
+    store.write("file_num", df_num)
+    assert os.listdir(store.backend._chunk_path(""))[0].endswith(".arrow")
+    result = store.read("file_num")
+    pd.testing.assert_frame_equal(result, df_num)
+    assert not result["A"].to_numpy().flags.writeable
+
+
+def test_parquet_format(tmp_path, df):
+    parquet_store = DatasetStore(
+        config={"STORE_DIR": str(tmp_path), "FORMAT": "parquet"}
+    )
+    parquet_store.write("file_1", df)
+    assert all(
+        name.endswith(".parquet") for name in os.listdir(parquet_store.backend._chunk_path(""))
+    )
+    assert list(parquet_store.read("file_1", columns=["B"]).columns) == ["B"]
+
+
+def test_max_bytes_evicts_least_recently_read(tmp_path, df):
+    capped = DatasetStore(config={"STORE_DIR": str(tmp_path), "MAX_BYTES": None})
+    capped.write("file_0", df)
+    capped.write("file_1", df * 2)
+    os.utime(capped.backend._manifest_path("file_0"), (1, 1))
+    capped.configure({"MAX_BYTES": capped.usage() - 1})
+    assert capped.enforce_limits() == ["file_0"]
+    assert capped.exists("file_1")
+
+
+def test_eviction_keeps_chunks_of_a_streaming_import(tmp_path, df):
+    capped = DatasetStore(config={"STORE_DIR": str(tmp_path), "MAX_BYTES": None})
+    capped.write("old", df * 3)
+    os.utime(capped.backend._manifest_path("old"), (1, 1))
+    streamed = pd.DataFrame({"X": range(1000), "Y": range(1000, 2000)})
+
+    def evict_mid_flight(part):
+        # La colonne X est déjà écrite quand Y est transformée : une écriture
+        # d'une autre session dépasse alors la taille maximale.
+        if part.columns[0] == "Y":
+            capped.configure({"MAX_BYTES": 1})
+            capped.write("other", df, session_id="s2")
+        return part
+
+    capped.write_stream("streamed", [streamed], transform=evict_mid_flight)
+    assert not capped.exists("old")
+    pd.testing.assert_frame_equal(capped.read("streamed"), streamed)
+
+
+def test_save_shares_unchanged_columns(store, df):
+    store.write("file_1", df)
+    size = store.usage()
+    edited = df.copy()
+    edited["A"] = edited["A"] * 10
+    store.write("file_1", edited)
+    assert len(os.listdir(store.backend._chunk_path(""))) == len(df.columns) + 1
+    assert store.usage() < 2 * size
+    pd.testing.assert_frame_equal(store.read("file_1"), edited)
+
+
+def test_undo_restores_previous_version(store, df):
+    store.write("file_1", df)
+    store.write("file_1", df.head(1))
+    assert store.undo("file_1")
+    pd.testing.assert_frame_equal(store.read("file_1"), df)
+    assert not store.undo("file_1")
+    store.write("file_1", df.tail(1))
+    assert [v["version"] for v in store.versions("file_1")] == [1, 3]
+
+
+def test_max_versions(tmp_path, df):
+    small = DatasetStore(config={"STORE_DIR": str(tmp_path), "MAX_VERSIONS": 2})
+    for i in range(4):
+        small.write("file_1", df.head(i + 1))
+    assert [v["version"] for v in small.versions("file_1")] == [3, 4]
+
+
+def test_concat_shares_columns_between_datasets(store, df):
+    store.write("left", df[["A"]])
+    store.write("right", df[["B"]])
+    store.write("both", pd.concat([df[["A"]], df[["B"]]], axis=1))
+    assert len(os.listdir(store.backend._chunk_path(""))) == 2
+
+
+def test_collect_chunks_after_delete(store, df):
+    store.write("file_1", df)
+    store.write("file_2", df[["A"]])
+    store.delete("file_1")
+    assert len(store.collect_chunks(grace=0)) == len(df.columns) - 1
+    assert len(os.listdir(store.backend._chunk_path(""))) == 1
+    pd.testing.assert_frame_equal(store.read("file_2"), df[["A"]])
+
+
+def test_metadata_without_reading_data(store, df, monkeypatch):
+    store.write("file_1", df.assign(D=[True, False, True]))
+    monkeypatch.setattr(store.backend, "load_chunks", None)
+    meta = store.metadata("file_1")
+    assert meta["nrows"] == 3
+    assert [(c["name"], c["kind"]) for c in meta["columns"]] == [
+        ("A", "numeric"),
+        ("B", "text"),
+        ("C", "numeric"),
+        ("D", "bool"),
+    ]
+    assert store.metadata("missing") is None
+
+
+def test_session_quota(tmp_path, df):
+    quota_store = DatasetStore(config={"STORE_DIR": str(tmp_path)})
+    quota_store.write("file_0", df, session_id="s1")
+    quota_store.configure({"SESSION_QUOTA_BYTES": quota_store.usage() + 10})
+    with pytest.raises(ValueError):
+        quota_store.write("file_1", df, session_id="s1")
+    assert not quota_store.exists("file_1")
+    quota_store.write("file_0", df, session_id="s1")
+    quota_store.write("file_2", df, session_id="s2")
+    assert quota_store.session_files("s1") == ["file_0"]
+
+
+def test_attach_existing_dataset_to_session(store, df):
+    store.write("file_1", df, session_id="s1")
+    assert store.attach("file_1", "s2")
+    assert store.session_files("s2") == ["file_1"]
+    assert not store.attach("missing", "s2")
+
+
+def test_sweep_removes_orphans(tmp_path, df):
+    gc_store = DatasetStore(config={"STORE_DIR": str(tmp_path), "ORPHAN_GRACE": 0})
+    gc_store.write("kept", df, session_id="s1")
+    gc_store.write("orphan", df)
+    assert gc_store.sweep() == ["orphan"]
+    assert gc_store.exists("kept")
+    gc_store.track_session("s1", [])
+    assert gc_store.release("kept")
+    assert not gc_store.exists("kept")
+
+
+def test_touch_session_and_sweep_stale_progress(tmp_path, df):
+    gc_store = DatasetStore(
+        config={"STORE_DIR": str(tmp_path), "ORPHAN_GRACE": 0, "SESSION_TTL": 60}
+    )
+    gc_store.write("kept", df, session_id="s1")
+    session = os.path.join(str(tmp_path), "sessions", "s1.json")
+    os.utime(session, (0, 0))
+    gc_store.touch_session("s1")
+    assert gc_store.sweep() == []
+    assert gc_store.exists("kept")
+
+    gc_store.set_progress("job1", {"state": "done"})
+    gc_store.set_progress("job1_cancel", {"cancel": True})
+    gc_store.set_progress("job2", {"state": "running"})
+    for name in ("job1", "job1_cancel"):
+        os.utime(os.path.join(str(tmp_path), "progress", f"{name}.json"), (0, 0))
+    gc_store.sweep()
+    assert gc_store.progress("job1") is None
+    assert gc_store.progress("job1_cancel") is None
+    assert gc_store.progress("job2") == {"state": "running"}
+
+
+def test_invalid_identifier_rejected(store, df):
+    with pytest.raises(ValueError):
+        store.write("../escape", df)
+
+
+@pytest.mark.parametrize("fmt", ["arrow", "parquet"])
+@pytest.mark.parametrize("codec, level", [("lz4", None), ("zstd", 1), ("zstd", 9)])
+def test_compression_codecs(tmp_path, df, fmt, codec, level):
+    codec_store = DatasetStore(
+        config={
+            "STORE_DIR": str(tmp_path),
+            "FORMAT": fmt,
+            "COMPRESSION": codec,
+            "COMPRESSION_LEVEL": level,
+        }
+    )
+    codec_store.write("file_1", df)
+    codec_store.frames.clear()
+    pd.testing.assert_frame_equal(codec_store.read("file_1"), df)
+
+
+def test_unknown_codec_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        DatasetStore(config={"STORE_DIR": str(tmp_path), "COMPRESSION": "rar"})
+
+
+def test_write_stream_matches_full_write(store):
+    csv = "n,x,t\n" + "\n".join(
+        f"{i},{'' if i == 7 else i / 2},{'a' if i < 5 else i}" for i in range(12)
+    )
+    full = pd.read_csv(io.StringIO(csv))
+    seen = []
+    nrows = store.write_stream(
+        "stream", pd.read_csv(io.StringIO(csv), chunksize=5), progress=seen.append
+    )
+    assert nrows == 12 and seen == [5, 10, 12]
+    pd.testing.assert_frame_equal(store.read("stream"), full)
+    store.write("full", full)
+    stream_chunks = store.backend.get_manifests(["stream"])[0]["versions"][0]["columns"]
+    full_chunks = store.backend.get_manifests(["full"])[0]["versions"][0]["columns"]
+    assert stream_chunks == full_chunks
+
+
+def test_write_stream_checks_quota_while_reading(tmp_path, df):
+    quota_store = DatasetStore(
+        config={"STORE_DIR": str(tmp_path), "SESSION_QUOTA_BYTES": 1000}
+    )
+    seen = []
+    chunks = (df.assign(A=df["A"] + i) for i in range(100))
+    with pytest.raises(ValueError):
+        quota_store.write_stream("big", chunks, session_id="s1", progress=seen.append)
+    assert len(seen) < 100
+    assert not quota_store.exists("big")
@@ -0,0 +1,134 @@
+import base64
+import io
+import pytest
+import threading
+from flask import Flask
+from datazen.data_manager import content_id
+from datazen.storage import DatasetStore
+from datazen.uploads import COOKIE, UploadArea
+
+
+@pytest.fixture
+def area(tmp_path):
+    return UploadArea(store=DatasetStore(config={"STORE_DIR": str(tmp_path)}))
+
+
+@pytest.fixture
+def client(area):
+    app = Flask(__name__)
+    area.init_app(app)
+    return app.test_client()
+
+
+DATA = b"a,b\n" + b"".join(b"%d,%d\n" % (i, i * 2) for i in range(1000))
+
+
+def create(client, total=len(DATA)):
+    response = client.post("/datazen/upload", json={"filename": "d.csv", "total": total})
+    return response.json["id"]
+
+
+def test_chunked_upload_resumes_after_interruption(client, area):
+    upload_id = create(client)
+    url = f"/datazen/upload/{upload_id}"
+    total = len(DATA)
+    assert len(upload_id) == 32
+    assert client.get(url).json == {"offset": 0, "complete": False, "filename": None}
+
+    first = client.put(f"{url}?offset=0", data=DATA[:100])
+    assert first.json["offset"] == 100
+
+    # Morceau rejoué après une coupure : le serveur indique où reprendre.
+    replay = client.put(f"{url}?offset=0", data=DATA[:100])
+    assert replay.status_code == 409 and replay.json["offset"] == 100
+
+    last = client.put(f"{url}?offset={client.get(url).json['offset']}", data=DATA[100:])
+    assert last.json == {"offset": total, "complete": True, "filename": "d.csv"}
+    with area.open(upload_id) as f:
+        assert f.read() == DATA
+
+
+def test_multipart_upload(client, area):
+    upload_id = create(client)
+    response = client.post(
+        f"/datazen/upload/{upload_id}",
+        data={"file": (io.BytesIO(DATA), "d.csv"), "offset": "0"},
+        content_type="multipart/form-data",
+    )
+    assert response.json["complete"]
+    assert area.info(upload_id) == {"filename": "d.csv", "size": len(DATA)}
+
+
+def test_upload_rejects_oversize_and_bad_ids(client, area):
+    area.store.configure({"UPLOAD_MAX_BYTES": 10})
+    response = client.post("/datazen/upload", json={"filename": "d.csv", "total": 11})
+    assert response.status_code == 400
+    assert client.get("/datazen/upload/..%2Fetc").status_code in (400, 404)
+    assert client.put("/datazen/upload/up_3?offset=0", data=b"x").status_code == 404
+    with pytest.raises(FileNotFoundError):
+        area.open("up_3")
+
+
+def test_upload_belongs_to_the_browser_that_created_it(area):
+    app = Flask(__name__)
+    area.init_app(app)
+    owner, other = app.test_client(), app.test_client()
+    upload_id = create(owner)
+    url = f"/datazen/upload/{upload_id}"
+    assert other.get(url).status_code == 404
+    assert other.put(f"{url}?offset=0", data=DATA).status_code == 404
+    assert owner.put(f"{url}?offset=0", data=DATA).json["complete"]
+
+    server_upload = {"id": upload_id, "filename": "d.csv"}
+    cookie = owner.get_cookie(COOKIE).value
+    with app.test_request_context(headers={"Cookie": f"{COOKIE}={cookie}"}):
+        assert area.resolve(server_upload, "d.csv") == upload_id
+        assert area.resolve(server_upload, "autre.csv") is None
+    with app.test_request_context(headers={"Cookie": f"{COOKIE}=intrus"}):
+        assert area.resolve(server_upload, "d.csv") is None
+
+
+def test_concurrent_chunks_at_the_same_offset_are_serialized(area):
+    upload_id = area.create("d.csv", len(DATA), owner="o")
+    results = []
+
+    def put():
+        try:
+            results.append(area.append(upload_id, io.BytesIO(DATA), 0)["complete"])
+        except LookupError:
+            results.append("409")
+
+    threads = [threading.Thread(target=put) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    # Le premier morceau complète l'envoi ; les suivants le trouvent terminé.
+    assert results == [True] * 8
+    with area.open(upload_id) as f:
+        assert f.read() == DATA
+
+
+def test_uploads_count_in_store_size_limit(area):
+    import pandas as pd
+
+    area.store.write("old", pd.DataFrame({"a": range(1000)}))
+    area.store.configure({"MAX_BYTES": area.store.usage() + len(DATA)})
+    first = area.create("d.csv", len(DATA), owner="o")
+    assert area.usage() == len(DATA)
+    # Le nouvel envoi ne tient qu'en supprimant le jeu de données le plus ancien.
+    area.create("e.csv", len(DATA), owner="o")
+    assert not area.store.exists("old")
+    with pytest.raises(ValueError):
+        area.create("f.csv", area.store.config["MAX_BYTES"], owner="o")
+    area.delete(first)
+    assert area.usage() == len(DATA)
+
+
+def test_uploaded_file_hashes_like_data_url(area):
+    upload_id = area.create("d.csv", len(DATA), owner="o")
+    area.append(upload_id, io.BytesIO(DATA), 0)
+    data_url = "data:text/csv;base64," + base64.b64encode(DATA).decode()
+    with area.open(upload_id) as f:
+        assert content_id(f, "csv", ",") == content_id(data_url, "csv", ",")
+        assert f.read() == DATA
@@ -0,0 +1,149 @@
+import os
+import pandas as pd
+import pytest
+from dash._callback_context import context_value
+from dash._utils import AttributeDict
+from datazen.storage import DatasetStore
+from datazen.watch import SESSION, WatchFolder
+
+
+@pytest.fixture
+def folder(tmp_path):
+    source = tmp_path / "source"
+    source.mkdir()
+    store = DatasetStore(
+        config={
+            "STORE_DIR": str(tmp_path / "store"),
+            "WATCH_DIR": str(source),
+            "WATCH_WORKERS": 2,
+        }
+    )
+    watch = WatchFolder(store=store)
+    yield watch
+    if watch._executor is not None:
+        watch._executor.shutdown()
+
+
+def test_scan_ingests_folder_in_parallel(folder):
+    source = folder.directory
+    with open(os.path.join(source, "ventes.csv"), "w", encoding="utf-8") as f:
+        f.write("region;montant\nnord;1,5\nsud;2,5\n")
+    pd.DataFrame({"a": [1, 2, 3]}).to_parquet(os.path.join(source, "mesures.parquet"))
+    with open(os.path.join(source, "notes.txt"), "w") as f:
+        f.write("ignoré")
+
+    catalog = folder.scan()
+    assert [entry["source"] for entry in catalog] == ["mesures.parquet", "ventes.csv"]
+    ids = {entry["source"]: entry["datasets"][0][0] for entry in catalog}
+    df = folder.store.read(ids["ventes.csv"])
+    assert list(df.columns) == ["region", "montant"]
+    assert df["montant"].tolist() == [1.5, 2.5]
+    assert folder.store.read(ids["mesures.parquet"])["a"].tolist() == [1, 2, 3]
+    assert sorted(folder.store.session_files(SESSION)) == sorted(ids.values())
+    assert folder.catalog() == catalog
+    assert folder.store.record("watch_catalog") == {"files": catalog}
+
+
+def test_scan_reimports_changed_file_once_stable(folder):
+    path = os.path.join(folder.directory, "ventes.csv")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("a,b\n1,2\n")
+    first = folder.scan()[0]
+
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("3,4\n")
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 10**9))
+    # Taille ou date différente : attend un second parcours identique.
+    assert folder.scan()[0] == first
+    second = folder.scan()[0]
+    assert second["signature"] != first["signature"]
+    assert len(folder.store.read(second["datasets"][0][0])) == 2
+    assert folder.store.session_files(SESSION) == [second["datasets"][0][0]]
+
+
+def test_saving_a_watched_dataset_copies_it_per_session(folder, monkeypatch):
+    import datazen.callbacks as callbacks
+    import datazen.data_manager as data_manager
+
+    monkeypatch.setattr(data_manager, "store", folder.store)
+    monkeypatch.setattr(callbacks, "store", folder.store)
+    monkeypatch.setattr(callbacks, "watch_folder", folder)
+    with open(os.path.join(folder.directory, "ventes.csv"), "w", encoding="utf-8") as f:
+        f.write("a,b\n1,2\n")
+    shared = folder.scan()[0]["datasets"][0][0]
+    stored = {
+        "files": [{"name": "ventes.csv", "id": shared, "watch": "ventes.csv"}],
+        "session": "s1",
+    }
+
+    stored, active = callbacks.save_table_data(
+        1, [[{"a": 5, "b": 6}]], [{"index": shared}], stored, {"id": shared}
+    )
+    copy = stored["files"][0]["id"]
+    assert copy != shared and "watch" not in stored["files"][0]
+    assert active == {"id": copy}
+    assert folder.store.read(copy)["a"].tolist() == [5]
+    assert folder.store.read(shared)["a"].tolist() == [1]
+    assert callbacks.undo_table_save(1, {"id": shared}, stored) is callbacks.no_update
+
+
+def test_watched_datasets_do_not_count_in_user_quota(folder, monkeypatch):
+    import datazen.callbacks as callbacks
+
+    monkeypatch.setattr(callbacks, "store", folder.store)
+    with open(os.path.join(folder.directory, "ventes.csv"), "w", encoding="utf-8") as f:
+        f.write("a,b\n1,2\n")
+    shared = folder.scan()[0]["datasets"][0][0]
+    stored = {
+        "files": [
+            {"name": "ventes.csv", "id": shared, "watch": "ventes.csv"},
+            {"name": "perso.csv", "id": "perso"},
+        ],
+        "session": "s1",
+    }
+
+    token = context_value.set(
+        AttributeDict(triggered_inputs=[{"prop_id": "stored-data.data", "value": stored}])
+    )
+    try:
+        callbacks.manage_files([], stored, stored, None)
+    finally:
+        context_value.reset(token)
+    assert folder.store.session_files("s1") == ["perso"]
+
+
+def test_single_watcher_is_elected(folder):
+    other = WatchFolder(store=DatasetStore(config=dict(folder.store.config)))
+    assert folder.elect()
+    assert folder.elect()
+    assert not other.elect()
+
+
+def test_watch_interval_disabled_without_watch_dir(folder, tmp_path, monkeypatch):
+    import datazen.callbacks as callbacks
+
+    unset = WatchFolder(store=DatasetStore(config={"STORE_DIR": str(tmp_path / "s")}))
+    monkeypatch.setattr(callbacks, "watch_folder", unset)
+    assert callbacks.sync_watched_files(0, None) == (callbacks.no_update, True)
+
+    monkeypatch.setattr(callbacks, "watch_folder", folder)
+    with open(os.path.join(folder.directory, "ventes.csv"), "w", encoding="utf-8") as f:
+        f.write("a,b\n1,2\n")
+    folder.scan()
+    stored, disabled = callbacks.sync_watched_files(0, None)
+    assert not disabled
+    assert [f["watch"] for f in stored["files"]] == ["ventes.csv"]
+
+
+def test_failed_zip_member_removes_imported_members(folder):
+    import zipfile
+    from datazen.watch import ingest_file
+
+    path = os.path.join(folder.directory, "extraits.zip")
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("a.csv", "a,b\n1,2\n")
+        archive.writestr("b.csv", "a,b\n1,2\n1,2,3,4\n")
+    before = {file_id for file_id, _, _, _ in folder.store.datasets()}
+    with pytest.raises(ValueError):
+        ingest_file(dict(folder.store.config), path, "zip_1")
+    assert {file_id for file_id, _, _, _ in folder.store.datasets()} == before